@@ -0,0 +1,626 @@
+# audio_engine.py
+# محرك صوت بزمن بدء منخفض: الأصوات تُفك مرة واحدة في الذاكرة (PCM)
+# وعامل واحد طويل العمر يكتبها كتلة بكتلة في مخرج صوت مفتوح دائماً
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+import wave
+from array import array
+from collections import namedtuple
+
+try:
+    import sounddevice
+except ImportError:  # اختياري: بدونه يُستعمل playsound أو المخرج الصامت
+    sounddevice = None
+
+from audio_stream import open_streamed, COMPRESSED_EXTENSIONS
+from clock import get_clock
+from config import (AUDIO_BLOCK_FRAMES, AUDIO_PRIORITIES, AUDIO_DROP_WHEN_BUSY, AUDIO_PREEMPT_FADE_MS,
+                    AUDIO_PREROLL_S, AUDIO_PLAY_AT_MAX_LATE_S, AUDIO_STREAM_MIN_BYTES)
+from loudness import apply_gain
+
+# أحداث الصوت المرسلة إلى خيط الواجهة عبر queue.Queue
+AUDIO_STARTED = "started"
+AUDIO_FINISHED = "finished"
+
+# أسباب انتهاء الصوت
+REASON_DONE = "done"
+REASON_STOPPED = "stopped"
+REASON_FADED = "faded"
+REASON_PREEMPTED = "preempted"
+REASON_DROPPED = "dropped"
+REASON_MISSED = "missed"        # فات وقت play_at (سكون الجهاز مثلاً)
+
+# حدث صوت: النوع، رقم الطلب، اسم الصوت، الفئة، سبب الانتهاء،
+# والفرق (ms) بين أول عينة مسموعة والوقت المطلوب في play_at، ومنطقة الإخراج
+AudioEvent = namedtuple("AudioEvent", ["kind", "request_id", "name", "category", "reason", "offset_ms", "zone"],
+                        defaults=(None, None))
+
+
+class PcmSound:
+    """صوت مفكوك في الذاكرة (عينات صحيحة متداخلة القنوات)"""
+
+    def __init__(self, name, data, samplerate, channels, sampwidth):
+        self.name = name
+        self.data = data
+        self.view = memoryview(data)
+        self.samplerate = samplerate
+        self.channels = channels
+        self.sampwidth = sampwidth
+        self.gain = 1.0  # توحيد المستوى (loudness.py)، مطبق على العينات نفسها
+
+    @property
+    def frame_bytes(self):
+        return self.channels * self.sampwidth
+
+    @property
+    def frames(self):
+        return len(self.data) // self.frame_bytes
+
+    @property
+    def duration(self):
+        return self.frames / self.samplerate
+
+    @property
+    def format(self):
+        return (self.samplerate, self.channels, self.sampwidth)
+
+    @property
+    def resident_bytes(self):
+        return len(self.data)
+
+    def set_gain(self, gain):
+        """ضرب العينات في الذاكرة بالتضخيم مرة واحدة (ما يُشغل الآن يكمل بالنسخة السابقة)"""
+        if gain == self.gain:
+            return
+        data = apply_gain(self.data, gain / self.gain, self.sampwidth)
+        self.view = memoryview(data)
+        self.data = data
+        self.gain = gain
+
+    def chunks(self, start_frame=0):
+        """أجزاء PCM (نفس واجهة StreamedSound)"""
+        yield self.view[start_frame * self.frame_bytes:]
+
+    def reader(self):
+        return PcmReader(self)
+
+    def readers(self, count):
+        """قراء لنفس التشغيل في count منطقة (كلها على نفس العينات بدون نسخ)"""
+        return [PcmReader(self) for _ in range(count)]
+
+
+class PcmReader:
+    """قراءة صوت مفكوك في الذاكرة بدون نسخ"""
+
+    def __init__(self, sound):
+        self.sound = sound
+        self.view = sound.view
+        self.position = 0
+        self.done = False
+
+    def read(self, frames):
+        block = self.view[self.position:self.position + frames * self.sound.frame_bytes]
+        self.position += len(block)
+        self.done = self.position >= len(self.view)
+        return block
+
+    def close(self):
+        pass
+
+
+def decode_wav(name, path):
+    """قراءة ملف WAV كاملاً إلى الذاكرة"""
+    with wave.open(path, "rb") as wav:
+        if wav.getcomptype() != "NONE":
+            raise ValueError(f"WAV مضغوط غير مدعوم: {path}")
+        return PcmSound(name, wav.readframes(wav.getnframes()),
+                        wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+
+
+def open_sound(name, path, target_format=None):
+    """ملف WAV صغير يُفك كاملاً (أسرع بدء)، والملفات المضغوطة أو الطويلة تُفك أثناء التشغيل"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COMPRESSED_EXTENSIONS or os.path.getsize(path) > AUDIO_STREAM_MIN_BYTES:
+        return open_streamed(name, path, target_format)
+    return decode_wav(name, path)
+
+
+class SoundBank:
+    """الأصوات المفكوكة مرة واحدة (أو المفتوحة للفك أثناء التشغيل)، مشتركة بين كل مناطق الإخراج"""
+
+    def __init__(self, paths):
+        self.paths = dict(paths)
+        self.sounds = {}
+        self.format = None
+        self.loaded = False
+
+    def load(self):
+        """فك كل الأصوات (كلها بنفس الصيغة: التردد، القنوات، حجم العينة)"""
+        for name, path in self.paths.items():
+            if not os.path.exists(path):
+                print(f"⚠️ ملف الصوت غير موجود: {path}")
+                continue
+            started = time.perf_counter()
+            sound = open_sound(name, path, self.format)
+            if sound is None or not self.add(sound):
+                continue
+            mode = "في الذاكرة" if isinstance(sound, PcmSound) else "فك أثناء التشغيل"
+            print(f"🔊 {name}: {sound.duration:.1f} ثانية، {sound.resident_bytes / 1e6:.2f} MB {mode} "
+                  f"في {(time.perf_counter() - started) * 1000:.0f} ms")
+        self.loaded = True
+
+    def add(self, sound):
+        """إضافة صوت مفتوح؛ False إذا كانت صيغته مختلفة عن باقي الأصوات"""
+        if self.format is None:
+            self.format = sound.format
+        elif sound.format != self.format:
+            print(f"⚠️ صيغة {sound.name} مختلفة عن باقي الأصوات {sound.format} ≠ {self.format}")
+            return False
+        self.sounds[sound.name] = sound
+        return True
+
+
+class NullSink:
+    """مخرج صامت: يستهلك الكتل بسرعة الوقت الحقيقي (مثل بطاقة الصوت) ويعد ما كُتب"""
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime
+        self.samplerate = None
+        self.frames_written = 0
+        self.blocks_written = 0
+
+    def open(self, samplerate, channels, sampwidth, blocksize):
+        self.samplerate = samplerate
+        self.frame_bytes = channels * sampwidth
+        self.block_duration = blocksize / samplerate
+        self._queued_until = 0.0
+
+    def room_in(self):
+        """الثواني حتى يتسع المخزن لكتلة جديدة (مخزن كتلة واحدة مثل بطاقة الصوت)"""
+        if not self.realtime:
+            return 0.0
+        return max(0.0, self._queued_until - self.block_duration - time.perf_counter())
+
+    def next_audible(self):
+        """وقت سماع أول عينة تُكتب الآن (perf_counter)"""
+        return max(self._queued_until, time.perf_counter())
+
+    def write(self, block):
+        frames = len(block) // self.frame_bytes
+        self.frames_written += frames
+        self.blocks_written += 1
+        if not self.realtime:
+            return
+        wait = self.room_in()
+        if wait > 0:
+            time.sleep(wait)
+        self._queued_until = self.next_audible() + frames / self.samplerate
+
+    def close(self):
+        pass
+
+    def describe(self):
+        return "null"
+
+
+class FileSink(NullSink):
+    """مخرج إلى ملف WAV بسرعة الوقت الحقيقي (للاختبار: يمكن مقارنة ما كُتب لكل منطقة)"""
+
+    def __init__(self, path, realtime=True):
+        super().__init__(realtime)
+        self.path = path
+        self.wav = None
+
+    def open(self, samplerate, channels, sampwidth, blocksize):
+        super().open(samplerate, channels, sampwidth, blocksize)
+        self.wav = wave.open(self.path, "wb")
+        self.wav.setnchannels(channels)
+        self.wav.setsampwidth(sampwidth)
+        self.wav.setframerate(samplerate)
+
+    def write(self, block):
+        self.wav.writeframes(block)
+        super().write(block)
+
+    def close(self):
+        if self.wav is not None:
+            self.wav.close()
+            self.wav = None
+
+    def describe(self):
+        return f"file:{self.path}"
+
+
+class SoundDeviceSink:
+    """مخرج صوت حقيقي عبر sounddevice (PortAudio) يبقى مفتوحاً طوال التشغيل"""
+
+    def __init__(self, device=None):
+        self.device = device
+        self.stream = None
+
+    def open(self, samplerate, channels, sampwidth, blocksize):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        if sampwidth != 2:
+            raise ValueError("sounddevice: عينات 16 بت فقط")
+        self.stream = sounddevice.RawOutputStream(
+            samplerate=samplerate, channels=channels, dtype="int16",
+            blocksize=blocksize, device=self.device, latency="low")
+        self.stream.start()
+
+    def room_in(self):
+        """الثواني حتى يتسع مخزن المخرج لكتلة جديدة"""
+        missing = self.blocksize - self.stream.write_available
+        return max(0, missing) / self.samplerate
+
+    def next_audible(self):
+        """وقت سماع أول عينة تُكتب الآن (تقريبي: بعد زمن تأخر المخرج)"""
+        return time.perf_counter() + self.stream.latency
+
+    def write(self, block):
+        self.stream.write(block)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def describe(self):
+        return f"sounddevice:{self.device or 'default'}"
+
+
+def apply_ramp(block, gain_start, gain_end):
+    """تدرج خطي للصوت على كتلة عينات 16 بت للتلاشي (التضخيم الثابت مطبق مسبقاً: loudness.apply_gain)"""
+    samples = array("h")
+    samples.frombytes(block)
+    count = len(samples)
+    if count:
+        step = (gain_end - gain_start) / count
+        gain = gain_start
+        for index in range(count):
+            samples[index] = max(-32768, min(32767, int(samples[index] * gain)))
+            gain += step
+    return samples.tobytes()
+
+
+class PlayRequest:
+    """طلب تشغيل في الطابور (when: وقت الحائط المطلوب لـ play_at)"""
+
+    def __init__(self, request_id, sound, category, priority, when=None, reader=None):
+        self.request_id = request_id
+        self.sound = sound
+        self.reader = reader        # قارئ محضر مسبقاً (فك مشترك بين المناطق)، أو None
+        self.category = category
+        self.priority = priority
+        self.when = when
+        self.target = None          # نفس الوقت على perf_counter (عند بداية التحضير)
+        self.requested_at = time.perf_counter()
+
+
+class Voice:
+    """الصوت الجاري: صمت التحضير حتى الوقت المطلوب، موضع القراءة، والتلاشي"""
+
+    def __init__(self, request):
+        self.request = request
+        self.reader = request.reader or request.sound.reader()
+        self.first_sample_at = None  # وقت سماع أول عينة (perf_counter)
+        self.announced = False
+        self.fade_frames = None     # مدة التلاشي الكلية (إطارات)
+        self.fade_left = None       # الإطارات المتبقية من التلاشي
+        self.fade_reason = None
+
+    def fade(self, frames, reason):
+        frames = max(1, frames)
+        if self.fade_left is not None and self.fade_left <= frames:
+            return  # تلاشٍ أسرع جارٍ
+        self.fade_frames = self.fade_left = frames
+        self.fade_reason = reason
+
+    def next_block(self, blocksize, block_start):
+        """الكتلة التالية التي تُسمع ابتداءً من block_start، وسبب الانتهاء (أو None)"""
+        sound = self.request.sound
+        lead = b""
+        if self.first_sample_at is None:
+            # صمت حتى الوقت المطلوب بالضبط (بدقة العينة)
+            lead_frames = 0
+            if self.request.target is not None:
+                lead_frames = max(0, round((self.request.target - block_start) * sound.samplerate))
+            if lead_frames >= blocksize:
+                return bytes(blocksize * sound.frame_bytes), None
+            self.first_sample_at = block_start + lead_frames / sound.samplerate
+            lead = bytes(lead_frames * sound.frame_bytes)
+            blocksize -= lead_frames
+
+        frames = blocksize
+        if self.fade_left is not None:
+            frames = min(frames, self.fade_left)
+        block = self.reader.read(frames)
+        frames = len(block) // sound.frame_bytes
+
+        finished = None
+        if self.fade_left is not None:
+            gain_start = self.fade_left / self.fade_frames
+            self.fade_left -= frames
+            block = apply_ramp(block, gain_start, max(0, self.fade_left) / self.fade_frames)
+            if self.fade_left <= 0:
+                finished = self.fade_reason
+        if finished is None and self.reader.done:
+            finished = REASON_DONE
+        if finished:
+            self.reader.close()
+        return (lead + block if lead else block), finished
+
+    def close(self):
+        self.reader.close()
+
+
+class AudioEngine:
+    """عامل تشغيل واحد بمخرج مفتوح وطابور أولويات
+
+    sounds: SoundBank مشترك، أو {الاسم: مسار WAV} كلها بنفس الصيغة
+    sink: المخرج (SoundDeviceSink أو NullSink أو FileSink)
+    events: queue.Queue تُرسل إليه أحداث البدء والانتهاء (يقرؤها خيط الواجهة)
+    zone: اسم منطقة الإخراج (يُرفق بالأحداث)
+
+    الصوت الأعلى أولوية (AUDIO_PRIORITIES) يقاطع الجاري بتلاشٍ قصير، والأدنى ينتظر
+    انتهاءه، و play يُسمع بعد الصوت الموجود في مخزن المخرج فقط.
+    play_at يحضّر المخرج قبل AUDIO_PREROLL_S بصمت ويبدأ الصوت على العينة الموافقة للوقت المطلوب.
+    """
+
+    def __init__(self, sounds, sink, blocksize=AUDIO_BLOCK_FRAMES, events=None, zone=None):
+        self.bank = sounds if isinstance(sounds, SoundBank) else SoundBank(sounds)
+        self.sink = sink
+        self.blocksize = blocksize
+        self.events = events if events is not None else queue.Queue()
+        self.zone = zone
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._queue = []              # (-الأولوية، الترتيب، الطلب)
+        self._scheduled = []          # (الوقت، الترتيب، الطلب) لطلبات play_at قبل التحضير
+        self._ids = itertools.count(1)
+        self._current = None
+        self._next_sample_at = None   # وقت سماع العينة التالية ما دام المخرج يُغذى دون انقطاع
+        self._closed = False
+        self._thread = None
+
+        self.plays = 0
+        self.last_latency_ms = None
+        self.max_latency_ms = 0.0
+        self.last_offset_ms = None
+
+    @property
+    def sounds(self):
+        return self.bank.sounds
+
+    @property
+    def format(self):
+        return self.bank.format
+
+    def start(self):
+        """فك الأصوات (إن لم تُفك بعد)، فتح المخرج، وتشغيل العامل"""
+        if not self.bank.loaded:
+            self.bank.load()
+        if self.format is None:
+            print("⚠️ لا توجد أصوات للتشغيل")
+            return False
+        samplerate, channels, sampwidth = self.format
+        self.sink.open(samplerate, channels, sampwidth, self.blocksize)
+        self._thread = threading.Thread(target=self._run, name="audio-engine", daemon=True)
+        self._thread.start()
+        return True
+
+    # ---------- الطلبات (من أي خيط) ----------
+
+    def _request(self, name, category, when=None, request_id=None, reader=None):
+        sound = self.sounds.get(name)
+        if sound is None:
+            print(f"⚠️ صوت غير محمل: {name}")
+            return None
+        category = category or name
+        return PlayRequest(request_id or next(self._ids), sound, category,
+                           AUDIO_PRIORITIES.get(category, 0), when, reader)
+
+    def play(self, name, category=None, request_id=None, reader=None):
+        """طلب تشغيل صوت حسب أولوية فئته؛ يرجع رقم الطلب أو None إذا أُلغي
+
+        request_id: رقم مشترك عند تشغيل نفس الطلب في عدة مناطق
+        reader: قارئ هذه المنطقة من sound.readers (فك واحد لكل المناطق)"""
+        request = self._request(name, category, request_id=request_id, reader=reader)
+        if request is None:
+            return None
+        with self._lock:
+            if not self._enqueue(request):
+                return None
+        self._wake.set()
+        return request.request_id
+
+    def play_at(self, name, when, category=None, request_id=None, reader=None):
+        """تشغيل صوت بحيث تُسمع أول عينة في وقت الحائط when (datetime)"""
+        late_s = (get_clock().now() - when).total_seconds()
+        if late_s > AUDIO_PLAY_AT_MAX_LATE_S:
+            print(f"⚠️ فات وقت تشغيل {name} بـ {late_s:.1f} ثانية")
+            return None
+        request = self._request(name, category, when, request_id, reader)
+        if request is None:
+            return None
+        with self._lock:
+            heapq.heappush(self._scheduled, (when, request.request_id, request))
+        self._wake.set()
+        return request.request_id
+
+    def cancel(self, request_id):
+        """إلغاء طلب (مجدول، في الطابور، أو جارٍ)"""
+        with self._lock:
+            for pending in (self._scheduled, self._queue):
+                for item in pending:
+                    if item[2].request_id == request_id:
+                        pending.remove(item)
+                        heapq.heapify(pending)
+                        self._emit(AUDIO_FINISHED, item[2], REASON_DROPPED)
+                        return True
+            if self._current is not None and self._current.request.request_id == request_id:
+                self._emit(AUDIO_FINISHED, self._current.request, REASON_STOPPED)
+                self._current.close()
+                self._current = None
+                return True
+        return False
+
+    def stop(self):
+        """إيقاف الصوت الجاري فوراً وإلغاء الطابور (الطلبات المجدولة تبقى)"""
+        with self._lock:
+            self._drop_queue()
+            if self._current is not None:
+                self._emit(AUDIO_FINISHED, self._current.request, REASON_STOPPED)
+                self._current.close()
+                self._current = None
+        self._wake.set()
+
+    def fade_out(self, ms):
+        """تلاشي الصوت الجاري خلال ms ثم إيقافه، وإلغاء الطابور"""
+        with self._lock:
+            self._drop_queue()
+            if self._current is not None:
+                self._current.fade(self._ms_to_frames(ms), REASON_FADED)
+        self._wake.set()
+
+    def is_playing(self):
+        with self._lock:
+            return self._current is not None or bool(self._queue)
+
+    def is_pending(self, request_id):
+        """الطلب سيُسمع أو يُسمع الآن (play_at الذي فات وقته بأكثر من AUDIO_PLAY_AT_MAX_LATE_S لا يُحسب)"""
+        now = get_clock().now()
+        with self._lock:
+            if self._current is not None and self._current.request.request_id == request_id:
+                return True
+            if any(request.request_id == request_id for _, _, request in self._queue):
+                return True
+            return any(request.request_id == request_id
+                       and (now - when).total_seconds() <= AUDIO_PLAY_AT_MAX_LATE_S
+                       for when, _, request in self._scheduled)
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._current is not None:
+            self._current.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.sink.close()
+
+    def _enqueue(self, request):
+        """إضافة طلب للطابور مع مقاطعة الصوت الأدنى أولوية؛ False إذا أُلغي"""
+        current = self._current
+        if (current is not None and request.priority <= current.request.priority
+                and request.category in AUDIO_DROP_WHEN_BUSY):
+            self._emit(AUDIO_FINISHED, request, REASON_DROPPED)
+            return False
+        heapq.heappush(self._queue, (-request.priority, request.request_id, request))
+        if current is not None and request.priority > current.request.priority:
+            current.fade(self._ms_to_frames(AUDIO_PREEMPT_FADE_MS), REASON_PREEMPTED)
+        return True
+
+    def _ms_to_frames(self, ms):
+        return int(self.format[0] * ms / 1000)
+
+    def _drop_queue(self):
+        for _, _, request in self._queue:
+            self._emit(AUDIO_FINISHED, request, REASON_DROPPED)
+        self._queue.clear()
+
+    def _emit(self, kind, request, reason=None, offset_ms=None):
+        if kind == AUDIO_FINISHED and request.reader is not None:
+            request.reader.close()  # طلب انتهى قبل أن يُشغل: تحرير مخزنه في الفك المشترك
+        self.events.put(AudioEvent(kind, request.request_id, request.sound.name, request.category,
+                                   reason, offset_ms, self.zone))
+
+    # ---------- العامل ----------
+
+    def _start_prerolls(self):
+        """نقل طلبات play_at التي اقترب وقتها إلى الطابور (بداية التحضير)"""
+        if not self._scheduled:
+            return
+        now = get_clock().now()
+        while self._scheduled and (self._scheduled[0][0] - now).total_seconds() <= AUDIO_PREROLL_S:
+            request = heapq.heappop(self._scheduled)[2]
+            lead_s = (request.when - now).total_seconds()
+            if lead_s < -AUDIO_PLAY_AT_MAX_LATE_S:
+                print(f"⚠️ فات وقت تشغيل {request.sound.name} بـ {-lead_s:.1f} ثانية")
+                self._emit(AUDIO_FINISHED, request, REASON_MISSED)
+                continue
+            request.target = time.perf_counter() + lead_s
+            self._enqueue(request)
+
+    def _timeline(self):
+        """وقت سماع العينة التالية: محسوب بعدد العينات ما دام المخرج يُغذى دون انقطاع"""
+        next_sample_at = self._next_sample_at
+        if next_sample_at is None or next_sample_at < time.perf_counter():
+            next_sample_at = self.sink.next_audible()
+        return next_sample_at
+
+    def _run(self):
+        """حلقة العامل: أخذ الطلب الأعلى أولوية، ثم كتابته كتلة بكتلة"""
+        while not self._closed:
+            with self._lock:
+                self._start_prerolls()
+                if self._current is None and self._queue:
+                    self._current = Voice(heapq.heappop(self._queue)[2])
+                voice = self._current
+
+            if voice is None:
+                self._next_sample_at = None
+                self._wake.wait(0.5)
+                self._wake.clear()
+                continue
+
+            # انتظار مكان في مخزن المخرج مع الاستيقاظ فوراً عند طلب جديد
+            room_in = self.sink.room_in()
+            if room_in > 0:
+                self._wake.wait(room_in)
+                self._wake.clear()
+                continue
+
+            block_start = self._timeline()
+            with self._lock:
+                if self._current is not voice:
+                    continue  # أُوقف أثناء الانتظار
+                block, finished = voice.next_block(self.blocksize, block_start)
+                if voice.first_sample_at is not None and not voice.announced:
+                    voice.announced = True
+                    self._announce(voice)
+                if finished:
+                    self._current = None
+                    self._emit(AUDIO_FINISHED, voice.request, finished)
+
+            self.sink.write(block)
+            frame_bytes = voice.request.sound.frame_bytes
+            self._next_sample_at = block_start + len(block) / frame_bytes / self.format[0]
+
+    def _announce(self, voice):
+        """حدث البدء مع زمن البدء (play) أو الفرق عن الوقت المطلوب (play_at)"""
+        request = voice.request
+        offset_ms = None
+        if request.target is not None:
+            offset_ms = (voice.first_sample_at - request.target) * 1000
+            self.last_offset_ms = offset_ms
+        else:
+            self._record_latency((voice.first_sample_at - request.requested_at) * 1000)
+        self.plays += 1
+        self._emit(AUDIO_STARTED, request, offset_ms=offset_ms)
+
+    def _record_latency(self, latency_ms):
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+
+    def summary(self):
+        last = f"{self.last_latency_ms:.1f} ms" if self.last_latency_ms is not None else "-"
+        offset = f"{self.last_offset_ms:+.1f} ms" if self.last_offset_ms is not None else "-"
+        zone = f"[{self.zone}] " if self.zone else ""
+        return (f"🔊 {zone}تشغيلات: {self.plays}، آخر زمن بدء: {last}، أقصى زمن بدء: {self.max_latency_ms:.1f} ms، "
+                f"آخر فرق عن الوقت المجدول: {offset}")
@@ -1,36 +1,238 @@
 # audio_manager.py
+import json
+import queue
 import threading
 import os
-from playsound import playsound
-from config import resource_path, ADHAN_FILE, IQAMA_FILE
+from clock import get_clock
+from config import (resource_path, ADHAN_FILE, IQAMA_FILE, AUDIO_BACKEND, AUDIO_SOUNDS,
+                    AUDIO_EVENTS_POLL_MS, AUDIO_OFFSET_LOG, AUDIO_ZONES, AUDIO_NORMALIZE)
+from audio_engine import (AudioEvent, SoundBank, sounddevice,
+                          AUDIO_STARTED, AUDIO_FINISHED, REASON_DONE)
+from audio_zones import AudioRouter
+from loudness import start_loudness_analysis
+
+
+def create_audio_engine(events, backend=AUDIO_BACKEND):
+    """محرك الصوت لكل مناطق AUDIO_ZONES حسب AUDIO_BACKEND، أو None لاستعمال playsound"""
+    if backend == "auto":
+        backend = "sounddevice" if sounddevice is not None else "playsound"
+    if backend == "sounddevice" and sounddevice is None:
+        print("⚠️ sounddevice غير مثبت، استعمال playsound")
+        backend = "playsound"
+    if backend == "playsound":
+        if len(AUDIO_ZONES) > 1:
+            print("⚠️ playsound لا يدعم مناطق الإخراج: كل الأصوات على المخرج الافتراضي")
+        if AUDIO_NORMALIZE:
+            print("⚠️ playsound لا يدعم توحيد مستوى الصوت")
+        return None
+
+    bank = SoundBank({name: resource_path(path) for name, path in AUDIO_SOUNDS.items()})
+    router = AudioRouter(bank, events, backend=backend)
+    try:
+        if router.start():
+            if AUDIO_NORMALIZE:
+                start_loudness_analysis(bank)
+            return router
+    except Exception as e:
+        print(f"خطأ في فتح مخرج الصوت: {e}")
+    return None
+
 
 class AudioManager:
-    def __init__(self):
+    """واجهة الصوت للتطبيق: الطلبات من خيط الواجهة، والأحداث تعود إليه عبر queue.Queue"""
+
+    def __init__(self, executor=None):
+        """executor: فك الأصوات وفتح المخارج في خيط خلفي (بدء التشغيل لا ينتظره)"""
+        # الحالة تُعدل في خيط الواجهة فقط (من poll_events)
         self.currently_playing = None
-    
-    def play_adhan(self):
-        """تشغيل صوت الأذان"""
-        adhan_file = resource_path(ADHAN_FILE)
-        if os.path.exists(adhan_file):
-            self.currently_playing = "adhan"
-            threading.Thread(target=lambda: self._play_sound(adhan_file), daemon=True).start()
-    
+        self.zones_playing = {}     # {المنطقة: (رقم الطلب، الفئة) الجاري فيها}
+        self.events = queue.Queue()
+        self.listeners = []
+        self._legacy_ids = 0
+        # طلبات play_at التي لم تنته بعد: {رقم الطلب: (الفئة، الوقت المطلوب)}
+        self.scheduled = {}
+        self._legacy_timers = {}
+        self._engine = None
+        self._engine_future = None
+        if executor is not None:
+            self._engine_future = executor.submit(create_audio_engine, self.events)
+        else:
+            self._set_engine(create_audio_engine(self.events))
+
+    def _set_engine(self, engine):
+        self._engine = engine
+        self._engine_future = None
+        print(f"🔊 مخرج الصوت: {engine.describe() if engine else 'playsound'}")
+
+    @property
+    def engine(self):
+        """محرك الصوت (ينتظر تحضيره إذا طُلب صوت قبل انتهائه)"""
+        if self._engine_future is not None:
+            self._set_engine(self._engine_future.result())
+        return self._engine
+
+    @property
+    def ready_future(self):
+        """future تحضير المحرك (None إذا كان جاهزاً)"""
+        return self._engine_future
+
+    def finish_startup(self, engine=None):
+        """مرحلة بدء التشغيل: اعتماد المحرك الذي حُضر في الخلفية (نتيجة ready_future)"""
+        if self._engine_future is not None:
+            self._set_engine(engine)
+
+    def attach(self, root):
+        """قراءة أحداث الصوت دورياً في خيط Tk"""
+        self.root = root
+        self._poll()
+
+    def _poll(self):
+        self.poll_events()
+        self.root.after(AUDIO_EVENTS_POLL_MS, self._poll)
+
+    def poll_events(self):
+        """معالجة أحداث البدء والانتهاء الواردة من خيط الصوت"""
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if event.kind == AUDIO_STARTED:
+                self.zones_playing[event.zone] = (event.request_id, event.category)
+                if event.offset_ms is not None:
+                    self._log_offset(event)
+            elif event.kind == AUDIO_FINISHED:
+                if self.zones_playing.get(event.zone, (None,))[0] == event.request_id:
+                    del self.zones_playing[event.zone]
+                if all(request_id != event.request_id for request_id, _ in self.zones_playing.values()):
+                    self.scheduled.pop(event.request_id, None)
+            # الفئة الجارية في أي منطقة
+            self.currently_playing = next((category for _, category in self.zones_playing.values()), None)
+            if event.reason not in (None, REASON_DONE):
+                zone = f" [{event.zone}]" if event.zone else ""
+                print(f"🔇 {event.name} ({event.category}){zone}: {event.reason}")
+            for listener in self.listeners:
+                listener(event)
+
+    def play(self, name, category=None):
+        """تشغيل صوت بأولوية فئته (adhan، iqama، test، azkar)"""
+        if self.engine:
+            return self.engine.play(name, category)
+        return self._play_legacy(name, category or name)
+
+    def play_at(self, name, when, category=None):
+        """تشغيل صوت بحيث يبدأ في وقت الحائط when بالضبط (مع playsound: بمؤقت Tk)"""
+        category = category or name
+        if self.engine:
+            request_id = self.engine.play_at(name, when, category)
+        else:
+            self._legacy_ids += 1
+            request_id = self._legacy_ids
+            delay_ms = max(0, int((when - get_clock().now()).total_seconds() * 1000))
+            self._legacy_timers[request_id] = self.root.after(
+                delay_ms, lambda: self._play_legacy_scheduled(request_id, name, category))
+        if request_id is not None:
+            self.scheduled[request_id] = (category, when)
+            print(f"⏰ جدولة {name} ({category}) على {when.strftime('%H:%M:%S')}")
+        return request_id
+
+    def cancel_scheduled(self):
+        """إلغاء كل طلبات play_at (بعد قفزة في الساعة تُعاد جدولتها)"""
+        for request_id in list(self.scheduled):
+            if self.engine:
+                self.engine.cancel(request_id)
+            elif request_id in self._legacy_timers:
+                self.root.after_cancel(self._legacy_timers.pop(request_id))
+        self.scheduled.clear()
+
+    def _play_legacy_scheduled(self, request_id, name, category):
+        self._legacy_timers.pop(request_id, None)
+        self.scheduled.pop(request_id, None)
+        self._play_legacy(name, category)
+
+    def _log_offset(self, event):
+        """تسجيل الفرق بين بداية الصوت ووقته المجدول (سطر JSON لكل تشغيل)"""
+        _, when = self.scheduled.get(event.request_id, (event.category, None))
+        zone = f" [{event.zone}]" if event.zone else ""
+        print(f"🎯 {event.name}{zone} بدأ بفرق {event.offset_ms:+.1f} ms عن الوقت المجدول")
+        record = {
+            "scheduled": when.isoformat() if when else None,
+            "zone": event.zone,
+            "name": event.name,
+            "category": event.category,
+            "offset_ms": round(event.offset_ms, 2),
+        }
+        try:
+            with open(AUDIO_OFFSET_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"⚠️ تعذر تسجيل فرق التشغيل: {e}")
+
+    def play_adhan(self, test=False):
+        """تشغيل صوت الأذان (test: اختبار F1 بأولوية أقل)
+
+        الأذان الحقيقي لا يتكرر إذا كان مجدولاً مسبقاً (play_at) أو جارياً، ويُشغل فوراً
+        إذا فات المجدول (سكون الجهاز مثلاً) حتى لو لم يُقرأ حدث REASON_MISSED بعد"""
+        if not test:
+            self.poll_events()
+            pending = any(category == "adhan" and self._is_pending(request_id)
+                          for request_id, (category, _) in self.scheduled.items())
+            if self.currently_playing == "adhan" or pending:
+                print("⏰ الأذان مجدول مسبقاً أو جارٍ")
+                return None
+        return self.play("adhan", "test" if test else "adhan")
+
+    def _is_pending(self, request_id):
+        """طلب play_at لم يُلغ ولم يفت وقته"""
+        if self.engine:
+            return self.engine.is_pending(request_id)
+        return request_id in self._legacy_timers
+
     def play_iqama(self):
         """تشغيل صوت الإقامة"""
-        iqama_file = resource_path(IQAMA_FILE)
-        if os.path.exists(iqama_file):
-            self.currently_playing = "iqama"
-            threading.Thread(target=lambda: self._play_sound(iqama_file), daemon=True).start()
-    
-    def _play_sound(self, file_path):
-        """تشغيل الصوت في thread منفصل"""
+        return self.play("iqama")
+
+    def stop(self):
+        """إيقاف الصوت فوراً (غير متاح مع playsound)"""
+        if self.engine:
+            self.engine.stop()
+
+    def fade_out(self, ms):
+        """تلاشي الصوت ثم إيقافه (غير متاح مع playsound)"""
+        if self.engine:
+            self.engine.fade_out(ms)
+
+    def _play_legacy(self, name, category):
+        """playsound: لا يمكن إيقافه، لذلك لا يبدأ صوت جديد أثناء صوت آخر"""
+        path = resource_path({"adhan": ADHAN_FILE, "iqama": IQAMA_FILE}.get(name, AUDIO_SOUNDS.get(name, "")))
+        if not os.path.exists(path) or self.currently_playing is not None:
+            return None
+        self._legacy_ids += 1
+        request_id = self._legacy_ids
+        self.zones_playing[None] = (request_id, category)
+        self.currently_playing = category
+        self.events.put(AudioEvent(AUDIO_STARTED, request_id, name, category, None))
+        threading.Thread(target=lambda: self._play_sound(path, request_id, name, category), daemon=True).start()
+        return request_id
+
+    def _play_sound(self, file_path, request_id, name, category):
+        """تشغيل الصوت في thread منفصل (بدون محرك الصوت)"""
+        # استيراد عند الحاجة فقط: غير مطلوب مع محرك الصوت
+        from playsound import playsound
         try:
             playsound(file_path, block=True)
         except Exception as e:
             print(f"خطأ في تشغيل الصوت: {e}")
         finally:
-            self.currently_playing = None
-    
+            self.events.put(AudioEvent(AUDIO_FINISHED, request_id, name, category, REASON_DONE))
+
     def is_playing(self):
         """التحقق إذا كان هناك صوت يشغل حالياً"""
-        return self.currently_playing is not None
\ No newline at end of file
+        if self.engine:
+            return self.engine.is_playing()
+        return self.currently_playing is not None
+
+    def summary(self):
+        if self.engine:
+            return self.engine.summary()
+        return "🔊 مخرج الصوت: playsound (بدون قياس زمن البدء)"
@@ -0,0 +1,289 @@
+# audio_stream.py
+# تشغيل الملفات الطويلة أو المضغوطة (mp3، flac، ogg) بالفك على أجزاء ثابتة الحجم في مخزن دائري
+# بدل فكها كاملة في الذاكرة: الذاكرة المستعملة بضع مئات KB مهما طالت التلاوة
+import os
+import threading
+import wave
+
+try:
+    import miniaudio
+except ImportError:  # اختياري: بدونه تُشغل ملفات WAV فقط
+    miniaudio = None
+
+from config import AUDIO_STREAM_CHUNK_FRAMES, AUDIO_STREAM_HEAD_FRAMES, AUDIO_STREAM_RING_FRAMES
+from loudness import apply_gain
+
+COMPRESSED_EXTENSIONS = (".mp3", ".flac", ".ogg")
+
+
+class RingBuffer:
+    """مخزن دائري ثابت الحجم بين خيط الفك (يكتب وينتظر إذا امتلأ) وعامل الصوت (ينتظر مدة قصيرة فقط)"""
+
+    def __init__(self, capacity):
+        self.buffer = bytearray(capacity)
+        self.capacity = capacity
+        self.start = 0
+        self.count = 0
+        self.closed = False
+        self.eof = False
+        self.total_read = 0     # ما قرأه المستهلك منذ البداية (لمقارنة تقدم المناطق)
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        """كتابة كل البيانات (انتظار المكان)؛ False إذا أُغلق المخزن"""
+        view = memoryview(data)
+        while view:
+            with self._cond:
+                while self.count == self.capacity and not self.closed:
+                    self._cond.wait()
+                if self.closed:
+                    return False
+                end = (self.start + self.count) % self.capacity
+                size = min(len(view), self.capacity - self.count, self.capacity - end)
+                self.buffer[end:end + size] = view[:size]
+                self.count += size
+                self._cond.notify_all()
+            view = view[size:]
+        return True
+
+    def wait_room(self, size, timeout):
+        """انتظار مكان لـ size بايت timeout ثانية على الأكثر؛ False إذا لم يتسع أو أُغلق المخزن"""
+        size = min(size, self.capacity)
+        with self._cond:
+            self._cond.wait_for(lambda: self.capacity - self.count >= size or self.closed, timeout)
+            return not self.closed and self.capacity - self.count >= size
+
+    def read(self, size, timeout=0.0):
+        """قراءة حتى size بايت (انتظار اكتمالها timeout ثانية على الأكثر)"""
+        with self._cond:
+            if self.count < size and not self.eof:
+                self._cond.wait_for(lambda: self.count >= size or self.eof or self.closed, timeout)
+            size = min(size, self.count)
+            first = min(size, self.capacity - self.start)
+            data = bytes(self.buffer[self.start:self.start + first]) + bytes(self.buffer[:size - first])
+            self.start = (self.start + size) % self.capacity
+            self.count -= size
+            self.total_read += size
+            self._cond.notify_all()
+        return data
+
+    def finish(self):
+        with self._cond:
+            self.eof = True
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+def _wav_chunks(path, chunk_frames, start_frame):
+    with wave.open(path, "rb") as wav:
+        wav.setpos(start_frame)
+        while True:
+            data = wav.readframes(chunk_frames)
+            if not data:
+                return
+            yield data
+
+
+def _miniaudio_chunks(path, samplerate, channels, chunk_frames, start_frame):
+    for samples in miniaudio.stream_file(path, output_format=miniaudio.SampleFormat.SIGNED16,
+                                         nchannels=channels, sample_rate=samplerate,
+                                         frames_to_read=chunk_frames, seek_frame=start_frame):
+        yield samples.tobytes()
+
+
+class StreamedSound:
+    """صوت يُفك أثناء التشغيل: بدايته فقط في الذاكرة (بدء فوري) والباقي عبر مخزن دائري"""
+
+    def __init__(self, name, path, samplerate, channels, sampwidth, frames, compressed):
+        self.name = name
+        self.path = path
+        self.samplerate = samplerate
+        self.channels = channels
+        self.sampwidth = sampwidth
+        self.frames = frames
+        self.compressed = compressed
+        self.underruns = 0
+        # التضخيم والبداية المضروبة فيه معاً (قيمة واحدة يقرؤها StreamReader بدون قفل)
+        self.levelled = (1.0, b"".join(self.chunks(0, AUDIO_STREAM_HEAD_FRAMES)))
+
+    @property
+    def gain(self):
+        return self.levelled[0]
+
+    @property
+    def head(self):
+        return self.levelled[1]
+
+    @property
+    def frame_bytes(self):
+        return self.channels * self.sampwidth
+
+    @property
+    def duration(self):
+        return self.frames / self.samplerate
+
+    @property
+    def format(self):
+        return (self.samplerate, self.channels, self.sampwidth)
+
+    @property
+    def resident_bytes(self):
+        """الذاكرة أثناء التشغيل: البداية المحفوظة + المخزن الدائري"""
+        return len(self.head) + AUDIO_STREAM_RING_FRAMES * self.frame_bytes
+
+    def set_gain(self, gain):
+        """التضخيم يُطبق على البداية المحفوظة الآن، وعلى باقي الأجزاء في خيط الفك"""
+        if gain == self.gain:
+            return
+        head = b"".join(self.chunks(0, AUDIO_STREAM_HEAD_FRAMES))
+        self.levelled = (gain, apply_gain(head, gain, self.sampwidth))
+
+    def chunks(self, start_frame=0, limit_frames=None):
+        """أجزاء PCM الأصلية (بحجم AUDIO_STREAM_CHUNK_FRAMES) ابتداءً من start_frame"""
+        if self.compressed:
+            chunks = _miniaudio_chunks(self.path, self.samplerate, self.channels,
+                                       AUDIO_STREAM_CHUNK_FRAMES, start_frame)
+        else:
+            chunks = _wav_chunks(self.path, AUDIO_STREAM_CHUNK_FRAMES, start_frame)
+        remaining = None if limit_frames is None else limit_frames * self.frame_bytes
+        for chunk in chunks:
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining == 0:
+                return
+
+    def reader(self):
+        return StreamReader(self)
+
+    def readers(self, count):
+        """قراء لنفس التشغيل في count منطقة بفك واحد للملف"""
+        if count == 1:
+            return [self.reader()]
+        return SharedDecode(self, count).readers
+
+
+class StreamReader:
+    """قراءة صوت مفكوك على أجزاء: البداية من الذاكرة، ثم المخزن الدائري الذي يملؤه خيط الفك"""
+
+    def __init__(self, sound, levelled=None, decode=True):
+        """levelled: (التضخيم، البداية) المشتركة مع قراء المناطق الأخرى؛ decode=False: يملؤه SharedDecode"""
+        self.sound = sound
+        self.gain, head = levelled or sound.levelled
+        self.head = memoryview(head)
+        self.head_position = 0
+        self.ring = RingBuffer(AUDIO_STREAM_RING_FRAMES * sound.frame_bytes)
+        self.done = False
+        if decode:
+            self.decode_from(len(head) // sound.frame_bytes)
+
+    def decode_from(self, start_frame):
+        """فك خاص بهذا القارئ ابتداءً من start_frame في خيط خلفي"""
+        threading.Thread(target=self._decode, args=(start_frame,),
+                         name=f"decode-{self.sound.name}", daemon=True).start()
+
+    def _decode(self, start_frame):
+        try:
+            for chunk in self.sound.chunks(start_frame):
+                if not self.ring.write(apply_gain(chunk, self.gain, self.sound.sampwidth)):
+                    return
+        except Exception as e:
+            print(f"خطأ في فك {self.sound.path}: {e}")
+        finally:
+            self.ring.finish()
+
+    def read(self, frames):
+        """حتى frames إطار؛ إذا تأخر الفك أكثر من نصف مدة الكتلة تُكمل بصمت (ويُعد ذلك)"""
+        size = frames * self.sound.frame_bytes
+        block = b""
+        if self.head_position < len(self.head):
+            block = bytes(self.head[self.head_position:self.head_position + size])
+            self.head_position += len(block)
+        if len(block) < size:
+            wait = frames / self.sound.samplerate / 2
+            block += self.ring.read(size - len(block), wait)
+            eof = self.ring.eof and not self.ring.count
+            if len(block) < size:
+                if eof:
+                    self.done = True
+                else:
+                    self.sound.underruns += 1
+                    block += bytes(size - len(block))
+        return block
+
+    def close(self):
+        self.ring.close()
+
+
+class SharedDecode:
+    """فك واحد لتشغيل يُسمع في عدة مناطق: كل جزء مفكوك يُنسخ إلى المخزن الدائري لقارئ كل منطقة
+
+    الفك يتقدم بسرعة المناطق كلها؛ المنطقة التي تتأخر عن أسرعها بأكثر من نصف المخزن
+    (بدأت متأخرة خلف صوت آخر مثلاً) تنفصل وتكمل بفك خاص بها حتى لا توقف الباقي
+    """
+
+    def __init__(self, sound, count):
+        self.sound = sound
+        levelled = sound.levelled
+        self.gain = levelled[0]
+        self.start_frame = len(levelled[1]) // sound.frame_bytes
+        self.readers = [StreamReader(sound, levelled, decode=False) for _ in range(count)]
+        threading.Thread(target=self._decode, name=f"decode-{sound.name}", daemon=True).start()
+
+    def _deliver(self, reader, chunk, readers):
+        """نسخ جزء إلى مخزن القارئ؛ False إذا أُغلق أو تأخر كثيراً عن أسرع المناطق"""
+        ring = reader.ring
+        wait = AUDIO_STREAM_CHUNK_FRAMES / self.sound.samplerate / 4
+        while not ring.wait_room(len(chunk), wait):
+            if ring.closed:
+                return False
+            leader = max(other.ring.total_read for other in readers)
+            if leader - ring.total_read > ring.capacity // 2:
+                return False
+        return ring.write(chunk)
+
+    def _decode(self):
+        readers = list(self.readers)
+        position = self.start_frame
+        try:
+            for chunk in self.sound.chunks(position):
+                chunk = apply_gain(chunk, self.gain, self.sound.sampwidth)
+                for reader in list(readers):
+                    if not self._deliver(reader, chunk, readers):
+                        readers.remove(reader)
+                        if not reader.ring.closed:
+                            print(f"⚠️ {self.sound.name}: منطقة متأخرة، فك خاص بها")
+                            reader.decode_from(position)
+                if not readers:
+                    return
+                position += len(chunk) // self.sound.frame_bytes
+        except Exception as e:
+            print(f"خطأ في فك {self.sound.path}: {e}")
+        finally:
+            for reader in readers:
+                reader.ring.finish()
+
+
+def open_streamed(name, path, target_format=None):
+    """StreamedSound لملف WAV أو ملف مضغوط (يُحول إلى target_format إن أمكن)، أو None"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COMPRESSED_EXTENSIONS:
+        if miniaudio is None:
+            print(f"⚠️ miniaudio غير مثبت، لا يمكن تشغيل {path}")
+            return None
+        info = miniaudio.get_file_info(path)
+        samplerate, channels = (target_format[:2] if target_format else (info.sample_rate, info.nchannels))
+        frames = info.num_frames * samplerate // info.sample_rate
+        return StreamedSound(name, path, samplerate, channels, 2, frames, compressed=True)
+
+    with wave.open(path, "rb") as wav:
+        if wav.getcomptype() != "NONE":
+            raise ValueError(f"WAV مضغوط غير مدعوم: {path}")
+        samplerate, channels, sampwidth = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        frames = wav.getnframes()
+    return StreamedSound(name, path, samplerate, channels, sampwidth, frames, compressed=False)
@@ -0,0 +1,111 @@
+# audio_zones.py
+# مناطق الإخراج: محرك صوت لكل منطقة (مخرج وطابور أولويات خاص بها) وكلها تشترك في نفس الأصوات المفكوكة
+import itertools
+
+from audio_engine import AudioEngine, FileSink, NullSink, SoundDeviceSink, sounddevice
+from config import AUDIO_ZONES, AUDIO_ROUTES
+
+
+def create_sink(device, backend="sounddevice"):
+    """مخرج المنطقة حسب وصف الجهاز في AUDIO_ZONES"""
+    if backend == "null" or device == "null":
+        return NullSink()
+    if device.startswith("file:"):
+        return FileSink(device[len("file:"):])
+    if sounddevice is None:
+        print(f"⚠️ sounddevice غير مثبت، الجهاز {device} بدون صوت")
+        return NullSink()
+    return SoundDeviceSink(None if device == "default" else device)
+
+
+class AudioRouter:
+    """تشغيل كل طلب في مناطق فئته (AUDIO_ROUTES) بنفس رقم الطلب
+
+    له نفس واجهة AudioEngine (play، play_at، cancel، stop، fade_out، is_playing، is_pending، summary)
+    """
+
+    def __init__(self, bank, events, zones=AUDIO_ZONES, routes=AUDIO_ROUTES, backend="sounddevice"):
+        self.bank = bank
+        self.events = events
+        self.routes = routes
+        self.engines = {name: AudioEngine(bank, create_sink(device, backend), events=events, zone=name)
+                        for name, device in zones.items()}
+        self._ids = itertools.count(1)
+
+        for category, zone_names in routes.items():
+            for zone in zone_names:
+                if zone not in self.engines:
+                    print(f"⚠️ منطقة غير معرفة في AUDIO_ROUTES[{category}]: {zone}")
+
+    def start(self):
+        """فك الأصوات مرة واحدة ثم فتح مخرج كل منطقة (المنطقة التي يفشل جهازها تُستبعد)"""
+        self.bank.load()
+        for name, engine in list(self.engines.items()):
+            try:
+                started = engine.start()
+            except Exception as e:
+                print(f"خطأ في فتح مخرج المنطقة {name}: {e}")
+                started = False
+            if not started:
+                del self.engines[name]
+        return bool(self.engines)
+
+    def zones_for(self, category):
+        """محركات مناطق الفئة"""
+        zone_names = self.routes.get(category, self.engines)
+        return [self.engines[zone] for zone in zone_names if zone in self.engines]
+
+    def _readers(self, name, engines):
+        """قارئ لكل منطقة من فك واحد للملف (None إذا لم يكن الصوت محملاً)"""
+        sound = self.bank.sounds.get(name)
+        if sound is None or not engines:
+            return [None] * len(engines)
+        return sound.readers(len(engines))
+
+    @staticmethod
+    def _accepted(request_id, reader):
+        """طلب رفضته المنطقة: إغلاق قارئها (لا يوقف الفك المشترك للمناطق الأخرى)"""
+        if request_id is None and reader is not None:
+            reader.close()
+        return request_id
+
+    def play(self, name, category=None):
+        request_id = next(self._ids)
+        engines = self.zones_for(category or name)
+        accepted = [self._accepted(engine.play(name, category, request_id, reader), reader)
+                    for engine, reader in zip(engines, self._readers(name, engines))]
+        return request_id if any(accepted) else None
+
+    def play_at(self, name, when, category=None):
+        request_id = next(self._ids)
+        engines = self.zones_for(category or name)
+        accepted = [self._accepted(engine.play_at(name, when, category, request_id, reader), reader)
+                    for engine, reader in zip(engines, self._readers(name, engines))]
+        return request_id if any(accepted) else None
+
+    def cancel(self, request_id):
+        return any([engine.cancel(request_id) for engine in self.engines.values()])
+
+    def stop(self):
+        for engine in self.engines.values():
+            engine.stop()
+
+    def fade_out(self, ms):
+        for engine in self.engines.values():
+            engine.fade_out(ms)
+
+    def is_playing(self):
+        return any(engine.is_playing() for engine in self.engines.values())
+
+    def is_pending(self, request_id):
+        return any(engine.is_pending(request_id) for engine in self.engines.values())
+
+    def close(self):
+        for engine in self.engines.values():
+            engine.close()
+
+    def describe(self):
+        return "، ".join(f"{name}: {engine.sink.describe()}" for name, engine in self.engines.items())
+
+    def summary(self):
+        return "\n".join(engine.summary() for engine in self.engines.values())
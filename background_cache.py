@@ -0,0 +1,60 @@
+# background_cache.py
+# الخلفية بدقة الشاشة: تُحجم بـ LANCZOS مرة واحدة ثم تُحمل من الكاش (مفتاحه بصمة الصورة + الدقة)
+import hashlib
+import os
+import time
+
+from PIL import Image
+
+from config import BACKGROUND_CACHE_DIR
+
+CACHE_QUALITY = 95
+
+
+def _source_digest(path):
+    """بصمة SHA-256 لصورة المصدر (تغيير الصورة بنفس الاسم يعيد التحجيم)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def cache_path_for(digest, size, cache_dir=BACKGROUND_CACHE_DIR):
+    width, height = size
+    return os.path.join(cache_dir, f"{digest}_{width}x{height}.jpg")
+
+
+def _prune(cache_dir, digest):
+    """حذف خلفيات الصور القديمة (تبقى كل دقات الصورة الحالية)"""
+    for name in os.listdir(cache_dir):
+        if not name.startswith(digest):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def load_background(source, size, cache_dir=BACKGROUND_CACHE_DIR):
+    """صورة الخلفية بحجم الشاشة من الكاش، أو بتحجيمها وحفظها (يُستدعى من خيط خلفي)"""
+    started = time.perf_counter()
+    digest = _source_digest(source)
+    path = cache_path_for(digest, size, cache_dir)
+    if os.path.exists(path):
+        image = Image.open(path)
+        image.load()
+        print(f"🖼️ الخلفية من الكاش {size[0]}x{size[1]} في {(time.perf_counter() - started) * 1000:.0f} ms")
+        return image
+
+    with Image.open(source) as original:
+        image = original.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        image.save(tmp_path, "JPEG", quality=CACHE_QUALITY)
+        os.replace(tmp_path, path)
+        _prune(cache_dir, digest)
+    except OSError as e:
+        print(f"⚠️ تعذر حفظ الخلفية في الكاش: {e}")
+    print(f"🖼️ تحجيم الخلفية إلى {size[0]}x{size[1]} في {(time.perf_counter() - started) * 1000:.0f} ms")
+    return image
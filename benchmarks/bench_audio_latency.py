@@ -0,0 +1,125 @@
+# benchmarks/bench_audio_latency.py
+# قياس زمن بدء التشغيل: المسار القديم (فتح وفك الملف وخيط جديد لكل تشغيل)
+# مقابل محرك الصوت (أصوات مفكوكة مسبقاً وعامل واحد) على مخرج صامت بسرعة الوقت الحقيقي،
+# ودقة play_at: الفرق بين أول عينة مسموعة والوقت المجدول
+#
+# التشغيل: python benchmarks/bench_audio_latency.py [عدد التشغيلات]
+import datetime
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_engine import AudioEngine, NullSink, decode_wav, AUDIO_STARTED
+from config import ADHAN_FILE, AUDIO_BLOCK_FRAMES, AUDIO_PREEMPT_FADE_MS, AUDIO_SOUNDS
+
+
+def legacy_latency(path):
+    """مثل playsound: خيط جديد، فتح الملف وفكه، ثم أول كتلة"""
+    started = time.perf_counter()
+    done = threading.Event()
+    result = []
+
+    def play():
+        sound = decode_wav("adhan", path)
+        sink = NullSink()
+        sink.open(sound.samplerate, sound.channels, sound.sampwidth, AUDIO_BLOCK_FRAMES)
+        audible_at = sink.next_audible()
+        sink.write(sound.view[:AUDIO_BLOCK_FRAMES * sound.frame_bytes])
+        result.append((audible_at - started) * 1000)
+        done.set()
+
+    threading.Thread(target=play, daemon=True).start()
+    done.wait()
+    return result[0]
+
+
+def play_and_wait(engine, name, category=None):
+    """تشغيل وانتظار أول كتلة مسموعة، وإرجاع زمن البدء"""
+    plays = engine.plays
+    engine.play(name, category)
+    while engine.plays <= plays:
+        time.sleep(0.0005)
+    return engine.last_latency_ms
+
+
+def engine_latencies(engine, count, preempt):
+    """زمن بدء الأذان: من السكون، أو بمقاطعة تلاوة أذكار جارية (preempt)"""
+    latencies = []
+    for _ in range(count):
+        engine.stop()
+        time.sleep(0.1)  # تفريغ مخزن المخرج
+        if preempt:
+            play_and_wait(engine, "iqama", "azkar")
+            time.sleep(random.uniform(0.01, 0.2))
+        latencies.append(play_and_wait(engine, "adhan"))
+    return latencies
+
+
+def scheduled_offsets(engine, count):
+    """play_at على وقت عشوائي خلال ثانيتين (أحياناً أثناء أذكار جارية): الفرق عن الوقت المطلوب"""
+    offsets = []
+    for index in range(count):
+        engine.stop()
+        if index % 2:
+            engine.play("iqama", "azkar")
+        when = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(0.5, 2.0))
+        request_id = engine.play_at("adhan", when)
+        while True:
+            event = engine.events.get()
+            if event.kind == AUDIO_STARTED and event.request_id == request_id:
+                offsets.append(abs(event.offset_ms))
+                break
+    engine.stop()
+    return offsets
+
+
+def describe(label, values):
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    print(f"  {label:<34} متوسط {statistics.mean(values):7.2f} ms   p95 {p95:7.2f} ms   أقصى {values[-1]:7.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    legacy = [legacy_latency(ADHAN_FILE) for _ in range(count)]
+
+    sink = NullSink(realtime=True)
+    engine = AudioEngine(AUDIO_SOUNDS, sink)
+    started = time.perf_counter()
+    engine.start()
+    load_ms = (time.perf_counter() - started) * 1000
+    idle = engine_latencies(engine, count, preempt=False)
+    preempted = engine_latencies(engine, count, preempt=True)
+    offsets = scheduled_offsets(engine, max(1, count // 5))
+    engine.close()
+
+    samplerate = engine.format[0]
+    block_ms = AUDIO_BLOCK_FRAMES / samplerate * 1000
+    print(f"زمن بدء التشغيل ({count} تشغيل، كتلة {AUDIO_BLOCK_FRAMES} إطار = {block_ms:.1f} ms)")
+    # playsound يفتح جهاز الصوت أيضاً في كل تشغيل (غير محسوب هنا مع المخرج الصامت)
+    describe("القديم (خيط + فك الملف لكل تشغيل):", legacy)
+    describe("المحرك من السكون:", idle)
+    describe("المحرك بمقاطعة الأذكار (مع التلاشي):", preempted)
+    describe("play_at (الفرق عن الوقت المجدول):", offsets)
+    print(f"  فك الأصوات عند البدء مرة واحدة: {load_ms:.0f} ms")
+    # مخزن المخرج: الكتلة المسموعة حالياً + كتلة واحدة في الانتظار (+ التلاشي عند المقاطعة)
+    buffer_ms = 2 * block_ms
+    within = (sum(1 for latency in idle if latency <= buffer_ms)
+              + sum(1 for latency in preempted if latency <= buffer_ms + AUDIO_PREEMPT_FADE_MS))
+    print(f"  تشغيلات سُمعت خلال مخزن المخرج ({buffer_ms:.1f} ms، +{AUDIO_PREEMPT_FADE_MS} ms تلاشٍ عند المقاطعة): "
+          f"{within}/{2 * count}")
+    # play_at: أول عينة على الوقت المطلوب بدقة عينة واحدة تقريباً
+    sample_ms = 1000 / samplerate
+    aligned = sum(1 for offset in offsets if offset <= 2 * sample_ms)
+    print(f"  تشغيلات مجدولة بدأت على الوقت (±{2 * sample_ms:.3f} ms): {aligned}/{len(offsets)}")
+    return 0 if within == 2 * count and aligned == len(offsets) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
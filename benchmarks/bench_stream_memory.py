@@ -0,0 +1,105 @@
+# benchmarks/bench_stream_memory.py
+# ذروة الذاكرة عند تشغيل صوت طويل: فكه كاملاً في الذاكرة مقابل الفك على أجزاء في مخزن دائري
+# (على مخرج صامت بدون انتظار الوقت الحقيقي، والذاكرة تُقاس بـ tracemalloc)،
+# ثم نفس التشغيل في عدة مناطق إخراج: خيط فك واحد للطلب مهما كان عدد المناطق
+#
+# التشغيل: python benchmarks/bench_stream_memory.py [ملف الصوت]
+# (adhan.mp3 افتراضياً إذا كان miniaudio مثبتاً، وإلا adhan.wav)
+import os
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_engine import AudioEngine, NullSink, SoundBank, decode_wav, AUDIO_FINISHED
+from audio_stream import miniaudio, open_streamed
+from audio_zones import AudioRouter
+from config import ADHAN_FILE, resource_path
+
+# الهدف: بضع مئات KB مهما طال الصوت
+STREAM_PEAK_LIMIT_KB = 512
+
+
+def full_decode(path):
+    """الفك الكامل في الذاكرة (ما يفعله decode_wav للملفات الصغيرة)"""
+    if path.lower().endswith(".wav"):
+        return decode_wav("adhan", path).data
+    return miniaudio.decode_file(path).samples
+
+
+def measure(label, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} ذروة {peak / 1024:9.0f} KB   {elapsed * 1000:7.0f} ms")
+    return peak, result
+
+
+def stream_play(path):
+    """تشغيل الصوت كاملاً عبر محرك الصوت مع الفك أثناء التشغيل"""
+    sound = open_streamed("adhan", path)
+    bank = SoundBank({})
+    bank.add(sound)
+    events = queue.Queue()
+    engine = AudioEngine(bank, NullSink(realtime=False), events=events)
+    engine.start()
+    engine.play("adhan")
+    while events.get().kind != AUDIO_FINISHED:
+        pass
+    engine.close()
+    return sound, engine.sink.frames_written
+
+
+def zones_play(path, zones=3):
+    """تشغيل نفس الطلب في عدة مناطق صامتة: (أقصى عدد خيوط فك، الإطارات المكتوبة في كل منطقة)"""
+    sound = open_streamed("adhan", path)
+    bank = SoundBank({})
+    bank.add(sound)
+    events = queue.Queue()
+    names = [f"zone{index}" for index in range(zones)]
+    router = AudioRouter(bank, events, zones={name: "null" for name in names},
+                         routes={"adhan": tuple(names)}, backend="null")
+    for engine in router.engines.values():
+        engine.sink = NullSink(realtime=False)
+    router.start()
+    router.play("adhan")
+    decoders, finished = 0, 0
+    while finished < zones:
+        decoders = max(decoders, sum(thread.name.startswith("decode-") for thread in threading.enumerate()))
+        try:
+            finished += events.get(timeout=0.01).kind == AUDIO_FINISHED
+        except queue.Empty:
+            pass
+    router.close()
+    return sound, decoders, [engine.sink.frames_written for engine in router.engines.values()]
+
+
+def main():
+    default = resource_path("adhan.mp3") if miniaudio is not None else ADHAN_FILE
+    path = sys.argv[1] if len(sys.argv) > 1 else default
+    print(f"🔊 {path} ({os.path.getsize(path) / 1e6:.1f} MB على القرص)")
+
+    full_peak, _ = measure("الفك الكامل:", lambda: full_decode(path))
+    stream_peak, (sound, written) = measure("الفك على أجزاء (تشغيل كامل):", lambda: stream_play(path))
+
+    print(f"  مدة الصوت {sound.duration:.1f} ثانية، إطارات مكتوبة {written} من {sound.frames}، "
+          f"نقص في المخزن: {sound.underruns}")
+    print(f"  الذاكرة مع الفك على أجزاء: {stream_peak / full_peak:.1%} من الفك الكامل "
+          f"(الحد {STREAM_PEAK_LIMIT_KB} KB)")
+    ok = stream_peak <= STREAM_PEAK_LIMIT_KB * 1024 and written >= sound.frames and not sound.underruns
+
+    sound, decoders, zone_written = zones_play(path)
+    print(f"  {len(zone_written)} مناطق لنفس الطلب: خيوط فك {decoders}، إطارات مكتوبة "
+          f"{', '.join(map(str, zone_written))}، نقص في المخزن: {sound.underruns}")
+    ok = ok and decoders == 1 and all(frames >= sound.frames for frames in zone_written) and not sound.underruns
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# benchmarks/bench_timetable_parse.py
+# قياس زمن تحليل ملف الأوقات قبل وبعد القراءة المتدفقة
+#
+# التشغيل: python benchmarks/bench_timetable_parse.py [ملف.csv] [عدد التكرارات]
+import csv
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CSV_FILE
+from timetable import CompactTimetable
+from timetable_cache import compile_timetable, load_cached_timetable
+
+
+def parse_legacy(csv_path):
+    """المسار القديم: utils.load_csv (قائمة DictReader) ثم تحليل كل سطر إلى قاموس نصوص"""
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        csv_data = list(csv.DictReader(file))
+
+    prayer_data = {}
+    for row in csv_data:
+        if isinstance(row, str):
+            continue
+        date_str = row.get('تاريخ', '').strip()
+        if not date_str:
+            continue
+        date_obj = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+        prayer_times = {
+            'Fajr': row.get('الفجر', '--:--').strip(),
+            'Dhuhr': row.get('الظهر', '--:--').strip(),
+            'Asr': row.get('العصر', '--:--').strip(),
+            'Maghrib': row.get('المغرب', '--:--').strip(),
+            'Isha': row.get('العشاء', '--:--').strip(),
+            'Sunrise': row.get('الشروق', '--:--').strip(),
+            'Imsak': row.get('الإمساك', '--:--').strip(),
+            'Midnight': row.get('منتصف الليل', '--:--').strip(),
+            'HijriDate': row.get('التاريخ الهجري', '').strip(),
+            'HijriDay': row.get('اليوم الهجري', '').strip(),
+            'HijriMonth': row.get('الشهر الهجري', '').strip(),
+            'HijriYear': row.get('السنة الهجرية', '').strip(),
+            'ArabicDay': row.get('اليوم العربي', '').strip()
+        }
+        for prayer in ['Fajr', 'Dhuhr', 'Asr', 'Maghrib', 'Isha', 'Sunrise', 'Imsak', 'Midnight']:
+            value = prayer_times[prayer]
+            try:
+                hour, minute = map(int, value.split(':'))
+                valid = 0 <= hour <= 23 and 0 <= minute <= 59
+            except ValueError:
+                valid = False
+            if not valid:
+                prayer_times[prayer] = '--:--'
+        prayer_data[date_obj] = prayer_times
+    return prayer_data
+
+
+def parse_dictreader(csv_path):
+    """قائمة DictReader ثم الجدول المضغوط (قبل القراءة المتدفقة)"""
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        return CompactTimetable.from_rows(list(csv.DictReader(file)))
+
+
+def parse_streaming(csv_path):
+    """القراءة المتدفقة مباشرة إلى الجدول المضغوط"""
+    return CompactTimetable.from_csv(csv_path)
+
+
+def best_of(func, arg, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_FILE
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    legacy_time, legacy = best_of(parse_legacy, csv_path, repeat)
+    dict_time, dict_table = best_of(parse_dictreader, csv_path, repeat)
+    stream_time, stream_table = best_of(parse_streaming, csv_path, repeat)
+
+    # التحقق من تطابق النتائج
+    for date_obj, values in legacy.items():
+        assert dict(stream_table.get(date_obj)) == values, date_obj
+        assert dict(dict_table.get(date_obj)) == values, date_obj
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'bench.timetable')
+        compile_timetable(stream_table, csv_path, cache_path)
+        cache_time, _ = best_of(lambda path: load_cached_timetable(path, cache_path), csv_path, repeat)
+
+    print(f"الملف: {csv_path} ({len(legacy)} يوم، أفضل زمن من {repeat} تكرار)")
+    print(f"  القديم (DictReader + قواميس):   {legacy_time * 1000:8.2f} ms")
+    print(f"  DictReader + جدول مضغوط:       {dict_time * 1000:8.2f} ms")
+    print(f"  قراءة متدفقة + جدول مضغوط:     {stream_time * 1000:8.2f} ms  (x{legacy_time / stream_time:.1f})")
+    print(f"  كاش ثنائي (mmap):              {cache_time * 1000:8.2f} ms  (x{legacy_time / cache_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/longrun_overlay.py
+# تشغيل آلاف دورات الأذان والإقامة على الـ overlay والتحقق من ثبات عدد العناصر والذاكرة
+#
+# التشغيل: python benchmarks/longrun_overlay.py [عدد الدورات]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+
+from overlay_manager import OverlayManager
+from utils import calculate_font_scales
+
+
+class SilentAudio:
+    """بدون صوت أثناء الاختبار"""
+
+    def play_adhan(self, test=False):
+        pass
+
+    def play_iqama(self):
+        pass
+
+
+def tcl_command_count(root):
+    """عدد أوامر Tcl (كل عنصر أو خط أو صورة جديدة تضيف أوامر)"""
+    return len(root.tk.splitlist(root.tk.call("info", "commands")))
+
+
+def run_cycle(root, overlay, prayer):
+    """دورة كاملة كما تعرضها دورة الصلاة: أذان، عد تنازلي، إقامة، ثم إقامة الجمعة"""
+    overlay.show_adhan_overlay(prayer)
+    root.update()
+    overlay.show_iqama_countdown(prayer)
+    for remaining in (600, 599, 598):
+        overlay.update_iqama_countdown(remaining)
+        root.update()
+    overlay.show_iqama_message(prayer)
+    root.update()
+    overlay.hide_overlay()
+    overlay.play_iqama_directly("Dhuhr")
+    root.update()
+    overlay.hide_overlay()
+    root.update()
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    prayers = ["Fajr", "Dhuhr", "Asr", "Maghrib", "Isha"]
+
+    root = ctk.CTk()
+    root.geometry("1280x720")
+    root.update()
+    overlay = OverlayManager(root, calculate_font_scales(1280, 720), SilentAudio())
+    root.update()
+
+    # دورة تسخين قبل أخذ القياس المرجعي
+    run_cycle(root, overlay, "Fajr")
+    tracemalloc.start()
+    baseline = (overlay.widget_count(), tcl_command_count(root), tracemalloc.get_traced_memory()[0])
+    print(f"{'الدورات':>8} {'العناصر':>8} {'أوامر Tcl':>10} {'الذاكرة KB':>11} {'ms/دورة':>8}")
+    print(f"{0:>8} {baseline[0]:>8} {baseline[1]:>10} {baseline[2] / 1024:>11.0f} {'-':>8}")
+
+    started = time.perf_counter()
+    step = max(1, cycles // 10)
+    rows = []
+    for cycle in range(1, cycles + 1):
+        run_cycle(root, overlay, prayers[cycle % len(prayers)])
+        if cycle % step == 0:
+            elapsed = time.perf_counter() - started
+            row = (overlay.widget_count(), tcl_command_count(root), tracemalloc.get_traced_memory()[0])
+            rows.append(row)
+            print(f"{cycle:>8} {row[0]:>8} {row[1]:>10} {row[2] / 1024:>11.0f} {elapsed / cycle * 1000:>8.2f}")
+
+    root.destroy()
+    widgets, commands, memory = rows[-1]
+    # الذاكرة قد تتذبذب قليلاً (كاش الخطوط والنصوص)؛ العناصر والأوامر يجب أن تبقى ثابتة
+    stable = widgets == baseline[0] and commands == baseline[1] and memory - baseline[2] < 1024 * 1024
+    print("✅ عدد العناصر والذاكرة ثابتان" if stable else "❌ تراكم العناصر أو الذاكرة")
+    return 0 if stable else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# clock.py
+import datetime
+import heapq
+import itertools
+import time
+
+
+class SystemClock:
+    """ساعة النظام الحقيقية"""
+
+    def now(self):
+        return datetime.datetime.now()
+
+    def today(self):
+        return datetime.date.today()
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+class VirtualClock:
+    """ساعة افتراضية لا تتقدم إلا يدوياً (للمحاكاة والاختبار)"""
+
+    def __init__(self, start):
+        self._now = start
+        self._monotonic = 0.0
+
+    def now(self):
+        return self._now
+
+    def today(self):
+        return self._now.date()
+
+    def time(self):
+        return self._now.timestamp()
+
+    def monotonic(self):
+        return self._monotonic
+
+    def advance(self, seconds):
+        """تقديم الساعة seconds ثانية"""
+        self._now += datetime.timedelta(seconds=seconds)
+        self._monotonic += seconds
+
+    def set(self, when):
+        """ضبط الساعة على وقت معين (قفزة في ساعة الحائط دون تغيير الساعة الرتيبة)"""
+        self._now = when
+
+
+class VirtualTimers:
+    """بديل after/after_cancel الخاص بـ Tk يعمل على الساعة الافتراضية"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._cancelled = set()
+        self.fired = 0
+
+    def after(self, ms, callback, *args):
+        timer_id = next(self._ids)
+        due = self.clock.monotonic() + max(0, ms) / 1000
+        heapq.heappush(self._queue, (due, timer_id, callback, args))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def next_due(self):
+        """وقت أقرب مؤقت (بالساعة الرتيبة) أو None"""
+        while self._queue and self._queue[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._queue)[1])
+        return self._queue[0][0] if self._queue else None
+
+    def run_until(self, monotonic_end):
+        """تنفيذ المؤقتات بالترتيب مع تقديم الساعة حتى monotonic_end"""
+        while True:
+            due = self.next_due()
+            if due is None or due > monotonic_end:
+                break
+            _, timer_id, callback, args = heapq.heappop(self._queue)
+            self.clock.advance(max(0.0, due - self.clock.monotonic()))
+            self.fired += 1
+            callback(*args)
+        self.clock.advance(max(0.0, monotonic_end - self.clock.monotonic()))
+
+    def run_for(self, seconds):
+        self.run_until(self.clock.monotonic() + seconds)
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    """الساعة المستعملة في التطبيق"""
+    return _clock
+
+
+def set_clock(clock):
+    """استبدال ساعة التطبيق (مثلاً بساعة افتراضية للمحاكاة) وإرجاع السابقة"""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def now():
+    return _clock.now()
+
+
+def today():
+    return _clock.today()
@@ -24,9 +24,85 @@ CLOSE_IMG = resource_path("close.png")
 MINIMIZE_IMG = resource_path("minimize.png")
 MOSQUE_ICON = resource_path("mosque.ico")
 
+# كاش ثنائي لجدول الأوقات بجانب ملف CSV (يُعاد بناؤه تلقائياً عند تغير الملف)
+TIMETABLE_CACHE_ENABLED = True
+# في نسخة PyInstaller ملفات CSV في مجلد مؤقت جديد عند كل تشغيل: الكاش يُحفظ هنا (حسب بصمة الملف)
+TIMETABLE_CACHE_DIR = os.path.abspath("timetable_cache")
+
+# وضع تحميل جدول الأوقات:
+# "all"    = تحميل ملف CSV_FILE كاملاً
+# "yearly" = تحميل ملف السنة الحالية فقط (والسنة التالية قرب نهاية السنة)، والباقي عند الطلب
+TIMETABLE_LOAD_MODE = "all"
+YEARLY_CSV_PATTERN = resource_path("meknes_prayer_{year}.csv")
+TIMETABLE_RESIDENT_YEARS = 2          # أقصى عدد من السنوات في الذاكرة
+TIMETABLE_NEXT_YEAR_PRELOAD_DAYS = 7  # تحميل السنة التالية قبل نهاية السنة بهذه الأيام
+
+# ملفات aladhan السنوية بتوقيت GMT+1، والتطبيق يعمل بتوقيت GMT+0 (نفس تحويل load_csv.py)
+ALADHAN_TIME_SHIFT_MINUTES = -60
+
+# الصوت: الأصوات تُفك مرة واحدة في الذاكرة ويشغلها عامل واحد بمخرج صوت مفتوح دائماً
+# "auto" = sounddevice إذا كان مثبتاً وإلا playsound، "sounddevice"، "playsound"، "null" (بدون صوت)
+AUDIO_BACKEND = "auto"
+AUDIO_BLOCK_FRAMES = 1024  # حجم كتلة الصوت (إطارات)؛ زمن بدء التشغيل أقل من كتلة واحدة
+AUDIO_SOUNDS = {
+    "adhan": ADHAN_FILE,
+    "iqama": IQAMA_FILE,
+}
+
+# أولوية الأصوات: الأعلى يقاطع الأدنى (بتلاشٍ قصير)، والأدنى ينتظر انتهاء الجاري
+AUDIO_PRIORITIES = {
+    "adhan": 3,
+    "iqama": 2,
+    "test": 1,    # اختبار الأذان (F1)
+    "azkar": 0,   # تلاوات الأذكار
+}
+AUDIO_DROP_WHEN_BUSY = ("test",)  # تُلغى بدل الانتظار إذا كان صوت آخر يعمل
+AUDIO_PREEMPT_FADE_MS = 150       # تلاشي الصوت المقاطَع
+AUDIO_EVENTS_POLL_MS = 100        # قراءة أحداث الصوت في خيط الواجهة
+
+# تشغيل الأذان على الثانية بالضبط: تحضير المخرج بصمت قبل الوقت، وتسجيل الفرق المقاس لكل أذان
+AUDIO_PREROLL_S = 3
+AUDIO_SCHEDULE_AHEAD_S = 30       # المحرك يجدول صوت الأذان قبل وقته بهذه المدة
+AUDIO_PLAY_AT_MAX_LATE_S = 5      # بعد هذا التأخر يُلغى الطلب (ويشغله عرض الأذان إن لزم)
+AUDIO_OFFSET_LOG = os.path.abspath("adhan_offsets.jsonl")
+
+# الملفات المضغوطة (mp3، flac، ogg عبر miniaudio) وملفات WAV الأكبر من AUDIO_STREAM_MIN_BYTES
+# تُفك أثناء التشغيل على أجزاء في مخزن دائري بدل تحميلها كاملة في الذاكرة
+AUDIO_STREAM_MIN_BYTES = 8 * 1024 * 1024
+AUDIO_STREAM_CHUNK_FRAMES = 4096  # حجم جزء الفك
+AUDIO_STREAM_RING_FRAMES = 32768  # المخزن الدائري (~0.7 ثانية)
+AUDIO_STREAM_HEAD_FRAMES = 16384  # بداية الصوت تبقى في الذاكرة ليبدأ فوراً
+
+# توحيد مستوى الأصوات: يُقاس كل ملف مرة واحدة (كاش حسب بصمة المحتوى) ويُضخم عند التشغيل فقط
+AUDIO_NORMALIZE = True
+AUDIO_TARGET_LOUDNESS_DB = -20.0  # المستوى المطلوب (dBFS)
+AUDIO_MAX_GAIN_DB = 12.0          # أقصى تضخيم أو تخفيض
+AUDIO_LOUDNESS_CACHE = os.path.abspath("loudness_cache.json")
+
+# مناطق الإخراج: {الاسم: الجهاز}. الجهاز: "default"، اسم جهاز sounddevice (ALSA أو PulseAudio
+# مثل "hw:1,0")، "null" (بدون صوت)، أو "file:مسار.wav" (للاختبار). كل المناطق تشترك في نفس الأصوات المفكوكة
+# مثال: {"minaret": "hw:1,0", "hall": "hw:2,0", "women": "pulse_women"}
+AUDIO_ZONES = {
+    "main": "default",
+}
+# مناطق كل فئة صوت (الفئة غير المذكورة تُسمع في كل المناطق)
+AUDIO_ROUTES = {
+    "adhan": ("main",),
+    "iqama": ("main",),
+    "test": ("main",),
+    "azkar": ("main",),
+}
+
 CITY = "Meknes"
 COUNTRY = "Morocco"
-REFRESH_INTERVAL_MS = 1000
+REFRESH_INTERVAL_MS = 1000  # تحديث الساعة والعد التنازلي فقط
+
+# أقصى مدة انتظار بين تحديثين كاملين للواجهة (ثواني)
+SCHEDULER_MAX_SLEEP_S = 600
+
+# نبضات الساعة: هامش بعد بداية الثانية، وحد اعتبار النبضة متأخرة
+TICK_ALIGN_MARGIN_S = 0.005
+TICK_LATE_THRESHOLD_MS = 250
 
 # Buttons images
 CLOSE_IMG = "close.png"
@@ -61,6 +137,66 @@ JUMA_SCHEDULE = {
     "azkar_delay": 5 * 60   # 5 دقائق بعد الصلاة للأذكار
 }
 
+# بداية الأذكار بعد وقت الأذان (ثواني) - تشمل مدة الإقامة والصلاة
+AZKAR_TIMES = {
+    "Fajr": 26 * 60,
+    "Dhuhr": 23 * 60,
+    "Asr": 23 * 60,
+    "Maghrib": 17 * 60,
+    "Isha": 24 * 60
+}
+
+# مدة نافذة عرض الأذكار (دقائق): لا تُعرض الأذكار إذا فات هذا الوقت
+AZKAR_WINDOW_MINUTES = 30
+
+# مدة عرض كل ذكر وكل سورة (ثواني)
+AZKAR_ROTATION = {
+    "zekr_seconds": 25,
+    "surah_seconds": 30,
+    "last_surah_seconds": 25
+}
+
+# الأحداث الفائتة (سكون الجهاز، قفزة في ساعة النظام، تأخر الحلقة) لكل نوع:
+# "replay"  = إعادة المرحلة كاملة من الآن
+# "shorten" = الالتحاق بالمرحلة حيث كان يجب أن تكون الآن (المدة المتبقية فقط)
+# "skip"    = تجاهل المرحلة الفائتة
+MISSED_EVENT_POLICY = {
+    "adhan": "shorten",
+    "iqama": "shorten",   # العد التنازلي، الإقامة، ومراحل الجمعة
+    "azkar": "shorten",
+}
+MISSED_EVENT_GRACE_S = 5           # تأخر أقل من هذا يعتبر عادياً
+MISSED_EVENT_MAX_LATE_S = 20 * 60  # الأحداث الأقدم من هذا تُتجاهل دائماً
+
+# فرق بين تقدم ساعة الحائط والساعة الرتيبة بين نبضتين يعتبر قفزة في الساعة (ثواني)
+CLOCK_JUMP_THRESHOLD_S = 2
+
+# مسار Unix socket لأحداث الوضع بدون واجهة (None = المخرج القياسي)
+HEADLESS_SOCKET_PATH = None
+
+# نبض أيقونة الإقامة (صور مرسومة مسبقاً بدل تغيير حجم الخط)
+ICON_PULSE = {
+    "fps": 10,          # عدد الصور في الثانية
+    "period_s": 2.8,    # مدة نبضة كاملة (تكبير ثم تصغير)
+    "grow_px": 30,      # أقصى تكبير فوق حجم overlay_icon_font
+    "shrink_px": 20,    # أقصى تصغير تحت حجم overlay_icon_font
+}
+MOSQUE_PNG = resource_path("mosque.png")  # بديل الأيقونة إذا لم يتوفر خط الإيموجي
+
+# الخلفية المصغرة لدقة الشاشة تُحفظ على القرص (حسب بصمة الصورة والدقة) وتُحمل مباشرة في المرات القادمة
+BACKGROUND_CACHE_DIR = os.path.abspath("background_cache")
+BACKGROUND_POLL_MS = 50  # انتظار خيط تحضير الخلفية (يُعرض لون صلب حتى ينتهي)
+
+# بدء التشغيل على مراحل: خيوط تحضير الملفات (الصوت، الخلفية، الأيقونات) وانتظارها من خيط الواجهة
+STARTUP_WORKERS = 3
+STARTUP_POLL_MS = 20
+
+# مراحل شاشة الأذان والإقامة (ثواني)
+PRAYER_CYCLE_TIMING = {
+    "adhan_seconds": 60,          # شاشة الأذان قبل بداية العد التنازلي للإقامة
+    "iqama_message_seconds": 15,  # رسالة "إطفئ الهاتف" بعد الإقامة
+}
+
 # ألوان الثيمات
 THEME_COLORS = {
     "light": {
@@ -0,0 +1,154 @@
+# day_planner.py
+import datetime
+from collections import namedtuple
+
+from config import (IQAMA_DELAY, JUMA_SCHEDULE, AZKAR_TIMES, AZKAR_WINDOW_MINUTES, AZKAR_ROTATION,
+                    PRAYER_CYCLE_TIMING, MISSED_EVENT_MAX_LATE_S)
+from timetable import PRAYER_COLUMNS
+
+# أنواع الأحداث
+EVENT_ADHAN = "adhan"
+EVENT_IQAMA_START = "iqama_start"    # بداية العد التنازلي للإقامة
+EVENT_IQAMA = "iqama"                # نهاية العد التنازلي (وقت الإقامة)
+EVENT_AZKAR_START = "azkar_start"
+EVENT_SURAH_START = "surah_start"    # الانتقال من الأذكار إلى السور
+EVENT_AZKAR_END = "azkar_end"
+EVENT_KHOTBA_START = "khotba_start"
+EVENT_JUMAA_PRAYER = "jumaa_prayer"  # صفحة صلاة الجمعة
+EVENT_JUMAA_AZKAR = "jumaa_azkar"    # الأذكار بعد صلاة الجمعة
+
+# المدة التي يبقى فيها الحدث صالحاً للتنفيذ بعد وقته (ثواني)
+EVENT_WINDOWS = {
+    EVENT_ADHAN: 5,
+    EVENT_KHOTBA_START: 10,
+    EVENT_JUMAA_PRAYER: 40,
+    EVENT_AZKAR_START: AZKAR_WINDOW_MINUTES * 60,
+    EVENT_JUMAA_AZKAR: AZKAR_WINDOW_MINUTES * 60,
+}
+
+# حدث مجدول: الوقت، النوع، الصلاة، وآخر وقت لتنفيذه
+PlannedEvent = namedtuple("PlannedEvent", ["at", "kind", "prayer", "until"])
+
+
+class DayPlanner:
+    """تجميع أحداث اليوم (الأذان، الإقامة، الأذكار، الجمعة) مرة واحدة عند بداية كل يوم"""
+
+    def __init__(self, prayer_times, zekr_counts=None, surah_count=3):
+        self.prayer_times = prayer_times
+        self.zekr_counts = zekr_counts or {}
+        self.surah_count = surah_count
+        self.day = None
+        self.events = []
+        # أحداث اليوم التي نُفذت أو فاتت (حتى لا تتكرر بعد رجوع الساعة إلى الوراء)
+        self.done = set()
+
+    def compile(self, day):
+        """بناء قائمة أحداث اليوم مرتبة حسب الوقت"""
+        events = []
+        snapshot = self.prayer_times.get_day_snapshot(day)
+
+        def add(at, kind, prayer):
+            window = EVENT_WINDOWS.get(kind, 0)
+            events.append(PlannedEvent(at, kind, prayer, at + datetime.timedelta(seconds=window)))
+
+        for prayer in PRAYER_COLUMNS:
+            adhan = snapshot.prayer_time(prayer)
+            if adhan is None:
+                continue
+
+            add(adhan, EVENT_ADHAN, prayer)
+
+            if snapshot.is_jumaa and prayer == "Dhuhr":
+                # الجمعة: الخطبة بعد شاشة الأذان، ثم الصلاة، ثم الأذكار
+                khotba = adhan + datetime.timedelta(seconds=PRAYER_CYCLE_TIMING["adhan_seconds"])
+                jumaa_prayer = khotba + datetime.timedelta(minutes=JUMA_SCHEDULE["khotba_duration"])
+                jumaa_azkar = jumaa_prayer + datetime.timedelta(
+                    seconds=JUMA_SCHEDULE["prayer_duration"] + JUMA_SCHEDULE["azkar_delay"])
+                add(khotba, EVENT_KHOTBA_START, prayer)
+                add(jumaa_prayer, EVENT_JUMAA_PRAYER, prayer)
+                add(jumaa_azkar, EVENT_JUMAA_AZKAR, prayer)
+                continue
+
+            # الإقامة: العد التنازلي يبدأ بعد شاشة الأذان
+            iqama_start = adhan + datetime.timedelta(seconds=PRAYER_CYCLE_TIMING["adhan_seconds"])
+            add(iqama_start, EVENT_IQAMA_START, prayer)
+            add(iqama_start + datetime.timedelta(minutes=IQAMA_DELAY.get(prayer, 1)), EVENT_IQAMA, prayer)
+
+            # الأذكار ثم السور
+            azkar_start = adhan + datetime.timedelta(seconds=AZKAR_TIMES[prayer])
+            surah_start = azkar_start + datetime.timedelta(
+                seconds=AZKAR_ROTATION["zekr_seconds"] * self.zekr_counts.get(prayer, 0))
+            azkar_end = surah_start + datetime.timedelta(
+                seconds=AZKAR_ROTATION["surah_seconds"] * max(0, self.surah_count - 1)
+                + AZKAR_ROTATION["last_surah_seconds"])
+            add(azkar_start, EVENT_AZKAR_START, prayer)
+            add(surah_start, EVENT_SURAH_START, prayer)
+            add(azkar_end, EVENT_AZKAR_END, prayer)
+
+        events.sort(key=lambda event: event.at)
+        if self.day != day:
+            self.done.clear()
+        self.day = day
+        self.events = events
+        return events
+
+    def ensure_day(self, now):
+        """إعادة بناء الأحداث عند تغير اليوم (منتصف الليل) وحذف الأحداث المنتهية"""
+        if self.day != now.date():
+            self.compile(now.date())
+            # الأحداث المنتهية قبل بداية التشغيل لا تُعالج كأحداث فائتة
+            self.done.update(event for event in self.events if event.until < now)
+            self.events = [event for event in self.events if event.until >= now]
+            print(self.describe())
+
+    def next_event(self):
+        """الحدث القادم (رأس القائمة) أو None"""
+        return self.events[0] if self.events else None
+
+    def resync(self, now):
+        """إعادة بناء أحداث اليوم فوراً بعد قفزة في الساعة أو سكون الجهاز
+
+        الأحداث المنفذة لا تتكرر، والأحداث الفائتة منذ أقل من MISSED_EVENT_MAX_LATE_S
+        تبقى ليعالجها run_due حسب سياسة الأحداث الفائتة"""
+        same_day = self.day == now.date()
+        self.compile(now.date())
+        oldest = now - datetime.timedelta(seconds=MISSED_EVENT_MAX_LATE_S)
+        self.events = [event for event in self.events
+                       if event not in self.done and (event.until >= now or (same_day and event.at >= oldest))]
+        print(self.describe())
+
+    def run_due(self, now, handler, on_missed=None):
+        """تنفيذ الأحداث التي حان وقتها من رأس القائمة
+        handler(event, now) يرجع False لإبقاء الحدث وإعادة المحاولة في الدورة التالية
+        on_missed(events, now) يستقبل الأحداث التي فات وقت تنفيذها"""
+        self.ensure_day(now)
+        due = []
+        while self.events and self.events[0].at <= now:
+            due.append(self.events.pop(0))
+
+        missed = [event for event in due if now > event.until]
+        self.done.update(missed)
+        if missed and on_missed:
+            on_missed(missed, now)
+
+        kept = []
+        for event in due:
+            if now > event.until:
+                continue
+            if handler(event, now) is False:
+                kept.append(event)
+            else:
+                self.done.add(event)
+        self.events[0:0] = kept
+
+    def describe(self):
+        """نص يعرض أحداث اليوم (للتشخيص)"""
+        lines = [f"📋 أحداث يوم {self.day}:"]
+        for event in self.events:
+            lines.append(f"  {event.at.strftime('%H:%M:%S')}  {event.kind:<13} {event.prayer}")
+        if not self.events:
+            lines.append("  (لا توجد أحداث)")
+        return "\n".join(lines)
+
+    def dump(self):
+        print(self.describe())
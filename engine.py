@@ -0,0 +1,252 @@
+# engine.py
+import datetime
+
+from clock import get_clock
+from config import MISSED_EVENT_POLICY, MISSED_EVENT_GRACE_S, MISSED_EVENT_MAX_LATE_S, AUDIO_SCHEDULE_AHEAD_S
+from day_planner import (DayPlanner, EVENT_ADHAN, EVENT_AZKAR_START, EVENT_KHOTBA_START,
+                         EVENT_JUMAA_PRAYER, EVENT_JUMAA_AZKAR)
+from prayer_cycle import PrayerCycle, POLICY_REPLAY, POLICY_SHORTEN, POLICY_SKIP
+from scheduler import EventScheduler
+from timetable import PRAYER_COLUMNS
+
+# عدد الأذكار والسور المعروضة في الواجهة (للتشغيل بدون واجهة)
+DEFAULT_ZEKR_COUNT = 4
+DEFAULT_SURAH_COUNT = 3
+
+# نوع سياسة الأحداث الفائتة لكل حدث (انظر MISSED_EVENT_POLICY في config)
+EVENT_POLICY_CATEGORY = {
+    EVENT_ADHAN: "adhan",
+    EVENT_AZKAR_START: "azkar",
+    EVENT_JUMAA_AZKAR: "azkar",
+    EVENT_KHOTBA_START: "iqama",
+    EVENT_JUMAA_PRAYER: "iqama",
+}
+
+
+class CycleView:
+    """واجهة فارغة لدورة الصلاة (لا تعرض شيئاً)؛ الواجهات الأخرى ترث منها"""
+
+    def show_adhan(self, prayer):
+        pass
+
+    def show_iqama_countdown(self, prayer):
+        pass
+
+    def update_iqama_countdown(self, remaining_seconds):
+        pass
+
+    def show_iqama_message(self, prayer):
+        pass
+
+    def show_jumaa_iqama(self, prayer):
+        pass
+
+    def hide_overlay(self):
+        pass
+
+    def show_zekr(self, prayer, index):
+        pass
+
+    def hide_zekr(self):
+        pass
+
+    def show_surah(self, prayer, index):
+        pass
+
+    def hide_surah(self):
+        pass
+
+    def show_khotba(self):
+        pass
+
+    def update_khotba(self, remaining_seconds):
+        pass
+
+    def hide_khotba(self):
+        pass
+
+    def show_jumaa_prayer(self):
+        pass
+
+    def update_jumaa_prayer(self, remaining_seconds):
+        pass
+
+    def hide_jumaa_prayer(self):
+        pass
+
+
+class SchedulingEngine:
+    """محرك الجدولة بدون واجهة: أحداث اليوم، دورة الصلاة، ومؤقت التحديث القادم
+
+    host: كائن يوفر after و after_cancel (نافذة Tk أو حلقة بدون واجهة)
+    on_wake: ما يُستدعى عند حلول التحديث القادم (افتراضياً update)
+    on_preroll: يُستدعى بحدث الأذان قبل وقته بـ AUDIO_SCHEDULE_AHEAD_S لجدولة الصوت على الثانية
+    """
+
+    def __init__(self, prayer_times, host, view, zekr_counts=None, surah_count=DEFAULT_SURAH_COUNT,
+                 on_wake=None, on_preroll=None):
+        if zekr_counts is None:
+            zekr_counts = {prayer: DEFAULT_ZEKR_COUNT for prayer in PRAYER_COLUMNS}
+        self.prayer_times = prayer_times
+        self.day_planner = DayPlanner(prayer_times, zekr_counts=zekr_counts, surah_count=surah_count)
+        self.prayer_cycle = PrayerCycle(host, view, zekr_counts=zekr_counts, surah_count=surah_count)
+        self.event_scheduler = EventScheduler(host, on_wake or self.update)
+        self.event_handlers = {
+            EVENT_ADHAN: self._on_adhan_event,
+            EVENT_AZKAR_START: self._on_azkar_event,
+            EVENT_KHOTBA_START: self._on_khotba_event,
+            EVENT_JUMAA_PRAYER: self._on_jumaa_prayer_event,
+            EVENT_JUMAA_AZKAR: self._on_azkar_event,
+        }
+        # مصادر إضافية لأوقات التحديث (مثل تغير الثيم في الواجهة)
+        self.wakeup_sources = []
+        self.next_prayer = (None, None)
+
+        # أحداث الأذان التي جُدول صوتها مسبقاً
+        self.on_preroll = on_preroll
+        self._prerolled = set()
+
+        # أحداث تنتظر إعادة المحاولة (تبدأ عند تنفيذها وليس من وقتها المجدول)
+        self._retrying = set()
+        self.max_event_late_s = 0.0
+        self.late_events = 0
+        self.recoveries = 0
+
+    def update(self, now=None):
+        """الصلاة القادمة، تنفيذ الأحداث التي حان وقتها، وضبط التحديث القادم"""
+        if now is None:
+            now = get_clock().now()
+        self.next_prayer = self.prayer_times.find_next_prayer(now)
+        self.day_planner.run_due(now, self._dispatch_event, self._recover_missed)
+        self._preroll_due(now)
+        self.event_scheduler.arm(self.next_update_time(now), now)
+        return self.next_prayer
+
+    def next_update_time(self, now):
+        """أقرب وقت يتغير فيه شيء: حدث اليوم، الصلاة القادمة، منتصف الليل، أو مصدر إضافي"""
+        tomorrow = now.date() + datetime.timedelta(days=1)
+        candidates = [datetime.datetime(tomorrow.year, tomorrow.month, tomorrow.day)]
+        candidates.extend(source(now) for source in self.wakeup_sources)
+
+        next_event = self.day_planner.next_event()
+        if next_event:
+            candidates.append(next_event.at)
+        next_preroll = self._next_preroll(now)
+        if next_preroll:
+            candidates.append(next_preroll.at - datetime.timedelta(seconds=AUDIO_SCHEDULE_AHEAD_S))
+
+        _, next_prayer_dt = self.next_prayer
+        if next_prayer_dt:
+            candidates.append(next_prayer_dt)
+
+        next_time = min(candidates)
+        if next_time <= now:
+            # حدث ينتظر إعادة المحاولة (مثل الأذكار أثناء عرض أذكار أخرى)
+            next_time = now + datetime.timedelta(seconds=1)
+        return next_time
+
+    def recover(self, now=None):
+        """بعد قفزة في الساعة أو سكون الجهاز: إعادة ضبط دورة الصلاة وبناء أحداث اليوم فوراً"""
+        if now is None:
+            now = get_clock().now()
+        self.recoveries += 1
+        self._prerolled.clear()
+        self.prayer_cycle.resync(now)
+        self.day_planner.resync(now)
+
+    def _next_preroll(self, now):
+        """أقرب أذان قادم لم يُجدول صوته بعد"""
+        if self.on_preroll is None:
+            return None
+        for event in self.day_planner.events:
+            if event.kind == EVENT_ADHAN and event.at > now and event not in self._prerolled:
+                return event
+        return None
+
+    def _preroll_due(self, now):
+        """جدولة صوت الأذان القادم مسبقاً ليبدأ على الثانية بالضبط"""
+        if self.on_preroll is None:
+            return
+        self._prerolled.intersection_update(self.day_planner.events)
+        event = self._next_preroll(now)
+        if event and event.at <= now + datetime.timedelta(seconds=AUDIO_SCHEDULE_AHEAD_S):
+            self._prerolled.add(event)
+            self.on_preroll(event)
+
+    def _late_policy(self, event, late_s):
+        """سياسة الحدث حسب تأخره: None إذا كان في وقته"""
+        if late_s <= MISSED_EVENT_GRACE_S:
+            return None
+        return MISSED_EVENT_POLICY.get(EVENT_POLICY_CATEGORY.get(event.kind), POLICY_SHORTEN)
+
+    def _log_event(self, event, late_s, note=""):
+        self.max_event_late_s = max(self.max_event_late_s, late_s)
+        if late_s > MISSED_EVENT_GRACE_S:
+            self.late_events += 1
+        print(f"📌 {event.kind} ({event.prayer}) المجدول {event.at.strftime('%H:%M:%S')}، "
+              f"التأخر {late_s:.1f} ثانية{note}")
+
+    def _run_handler(self, event, late_s, policy):
+        """تنفيذ الحدث حسب السياسة: replay يبدأ الآن، shorten يلتحق بالوقت المجدول"""
+        if policy == POLICY_SKIP:
+            self._log_event(event, late_s, " (تخطي)")
+            return True
+        self._log_event(event, late_s, f" ({policy})" if policy else "")
+        at = None if policy == POLICY_REPLAY else event.at
+        return self.event_handlers[event.kind](event, at)
+
+    def _dispatch_event(self, event, now):
+        """تنفيذ حدث من جدول أحداث اليوم"""
+        if event.kind not in self.event_handlers:
+            return
+        if event in self._retrying:
+            # إعادة محاولة: الحدث انتظر دورة أخرى ويبدأ الآن
+            result = self.event_handlers[event.kind](event, None)
+        else:
+            late_s = (now - event.at).total_seconds()
+            result = self._run_handler(event, late_s, self._late_policy(event, late_s))
+
+        if result is False:
+            self._retrying.add(event)
+        else:
+            self._retrying.discard(event)
+        return result
+
+    def _recover_missed(self, events, now):
+        """الأحداث التي فات وقتها (سكون الجهاز، قفزة في الساعة): آخر حدث لكل صلاة فقط
+        لأن دورة الصلاة تلتحق منه بالمرحلة التي يجب أن تكون فيها الآن"""
+        events = [event for event in events if event.kind in self.event_handlers]
+        latest = {event.prayer: event for event in events}
+        for event in events:
+            late_s = (now - event.at).total_seconds()
+            if event in self._retrying:
+                self._retrying.discard(event)
+                self._log_event(event, late_s, " (انتهت إعادة المحاولة)")
+            elif latest[event.prayer] is not event:
+                self._log_event(event, late_s, " (فائت، تليه مرحلة لاحقة)")
+            elif late_s > MISSED_EVENT_MAX_LATE_S:
+                self._log_event(event, late_s, " (فائت منذ مدة طويلة، تجاهل)")
+            else:
+                policy = MISSED_EVENT_POLICY.get(EVENT_POLICY_CATEGORY.get(event.kind), POLICY_SHORTEN)
+                self._run_handler(event, late_s, policy)
+
+    def _on_adhan_event(self, event, at):
+        """وقت الأذان (يلغي أي دورة سابقة)"""
+        jumaa = event.prayer == "Dhuhr" and self.prayer_times.get_day_snapshot(event.at.date()).is_jumaa
+        self.prayer_cycle.on_adhan(event.prayer, jumaa=jumaa, at=at)
+
+    def _on_azkar_event(self, event, at):
+        """عرض الأذكار بعد الصلاة (يُعاد المحاولة ما دامت دورة أخرى جارية)"""
+        return self.prayer_cycle.on_azkar(event.prayer, at=at)
+
+    def _on_khotba_event(self, event, at):
+        """بداية الخطبة: بعد شاشة أذان الجمعة"""
+        self.prayer_cycle.on_khotba(at=at)
+
+    def _on_jumaa_prayer_event(self, event, at):
+        """نهاية الخطبة: إقامة وصفحة صلاة الجمعة"""
+        self.prayer_cycle.on_jumaa_prayer(at=at)
+
+    def summary(self):
+        return (f"📌 أحداث متأخرة: {self.late_events}، أقصى تأخر حدث: {self.max_event_late_s:.1f} ثانية، "
+                f"إعادات ضبط بعد قفزة الساعة: {self.recoveries}")
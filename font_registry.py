@@ -0,0 +1,85 @@
+# font_registry.py
+import customtkinter as ctk
+
+FONT_FAMILY = "Arial"
+
+# دور كل خط: (مفتاح الحجم في calculate_font_scales أو حجم ثابت، الوزن)
+FONT_ROLES = {
+    # الواجهة الرئيسية
+    "mosque": ("mosque_font", "bold"),
+    "place": ("place_font", "normal"),
+    "date": ("date_font", "normal"),
+    "next_title": ("next_title_font", "bold"),
+    "next_name": ("next_name_font", "bold"),
+    "countdown": ("countdown_font", "normal"),
+    "schedule_title": ("schedule_title_font", "bold"),
+    "prayer_name": ("prayer_name_font", "bold"),
+    "prayer_time": ("prayer_time_font", "bold"),
+    "button": (14, "bold"),
+
+    # الـ overlay
+    "overlay_icon": ("overlay_icon_font", "bold"),
+    "overlay_text": ("overlay_text_font", "bold"),
+    "overlay_countdown": ("overlay_countdown_font", "bold"),
+
+    # صفحات الأذكار والسور
+    "page_icon": (110, "bold"),
+    "zekr_title": (50, "bold"),
+    "surah_title": (55, "bold"),
+    "page_text": (70, "normal"),
+    "page_footer": (18, "normal"),
+    "back_button": (16, "bold"),
+
+    # صفحات الجمعة
+    "khotba_text": (80, "bold"),
+    "khotba_timer": (40, "bold"),
+    "jumaa_icon": (120, "bold"),
+    "jumaa_title": (80, "bold"),
+    "jumaa_instruction": (40, "normal"),
+    "jumaa_timer": (50, "bold"),
+}
+
+
+class FontRegistry:
+    """خط CTkFont واحد مشترك لكل دور بدل إنشاء خط جديد لكل عنصر أو configure
+
+    تغيير عامل التحجيم (rescale) يعدل أحجام الخطوط الموجودة فتتحدث كل العناصر التي تستعملها
+    """
+
+    def __init__(self, font_scales):
+        self.font_scales = font_scales
+        self._fonts = {}
+
+    def _size(self, role):
+        size, _ = FONT_ROLES[role]
+        return self.font_scales[size] if isinstance(size, str) else size
+
+    def get(self, role):
+        """الخط المشترك للدور (يُنشأ عند أول طلب)"""
+        font = self._fonts.get(role)
+        if font is None:
+            _, weight = FONT_ROLES[role]
+            font = ctk.CTkFont(family=FONT_FAMILY, size=self._size(role), weight=weight)
+            self._fonts[role] = font
+        return font
+
+    __getitem__ = get
+
+    def size(self, role):
+        """حجم الدور الحالي (بالبيكسل، كما في CTkFont)"""
+        return self._size(role)
+
+    def rescale(self, font_scales):
+        """تطبيق أحجام جديدة من calculate_font_scales على كل الخطوط في مرة واحدة"""
+        self.font_scales = font_scales
+        changed = 0
+        for role, font in self._fonts.items():
+            size = self._size(role)
+            if font.cget("size") != size:
+                font.configure(size=size)
+                changed += 1
+        print(f"🔤 إعادة تحجيم الخطوط: {changed} من {len(self._fonts)}")
+        return changed
+
+    def summary(self):
+        return f"🔤 خطوط مشتركة: {len(self._fonts)}"
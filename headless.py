@@ -0,0 +1,253 @@
+# headless.py
+# تشغيل محرك الجدولة بدون واجهة وإرسال الأحداث كسطور JSON
+#
+# التشغيل: python -m mosque_app --headless [--socket /tmp/mosque_events.sock]
+import argparse
+import heapq
+import itertools
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+from clock import get_clock
+from config import HEADLESS_SOCKET_PATH
+from engine import CycleView, SchedulingEngine
+from prayer_times import PrayerTimes
+from scheduler import ClockJumpDetector
+
+# فحص قفزات الساعة (بدون نبضات الساعة في هذا الوضع)
+JUMP_CHECK_INTERVAL_MS = 1000
+
+
+class StdoutSink:
+    """كتابة الأحداث على المخرج القياسي"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.greeting = None
+
+    def fileno(self):
+        return None
+
+    def poll(self):
+        pass
+
+    def write(self, line):
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class UnixSocketSink:
+    """خادم Unix socket يرسل كل حدث لجميع المتصلين (مكبرات الصوت، الشاشات...)"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+        self.server.setblocking(False)
+        self.clients = []
+        # آخر حالة (الصلاة القادمة) تُرسل لكل متصل جديد
+        self.greeting = None
+        print(f"🔌 انتظار المتصلين على {path}", file=sys.stderr)
+
+    def fileno(self):
+        return self.server.fileno()
+
+    def poll(self):
+        """قبول المتصلين الجدد"""
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except BlockingIOError:
+                return
+            client.setblocking(False)
+            self.clients.append(client)
+            if self.greeting:
+                self._send(client, self.greeting)
+            print(f"🔌 متصل جديد ({len(self.clients)})", file=sys.stderr)
+
+    def _send(self, client, line):
+        try:
+            client.sendall((line + "\n").encode("utf-8"))
+        except OSError:
+            # متصل مغلق أو بطيء جداً: يُحذف
+            self.clients.remove(client)
+            client.close()
+
+    def write(self, line):
+        for client in list(self.clients):
+            self._send(client, line)
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+        self.server.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class JsonEventView(CycleView):
+    """عرض دورة الصلاة كأحداث JSON بدل الشاشات"""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.prayer_cycle = None
+
+    def emit(self, event, **fields):
+        record = {"at": get_clock().now().isoformat(timespec="seconds"), "event": event}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False)
+        self.sink.write(line)
+        return line
+
+    def _deadline(self):
+        deadline = self.prayer_cycle.deadline if self.prayer_cycle else None
+        return deadline.isoformat(timespec="seconds") if deadline else None
+
+    def show_adhan(self, prayer):
+        self.emit("adhan", prayer=prayer)
+
+    def show_iqama_countdown(self, prayer):
+        self.emit("iqama_countdown", prayer=prayer, until=self._deadline())
+
+    def show_iqama_message(self, prayer):
+        self.emit("iqama", prayer=prayer)
+
+    def show_zekr(self, prayer, index):
+        if index == 0:
+            self.emit("azkar", prayer=prayer)
+
+    def show_surah(self, prayer, index):
+        if index == 0:
+            self.emit("surah", prayer=prayer)
+
+    def show_khotba(self):
+        self.emit("jumaa_khotba", prayer="Dhuhr", until=self._deadline())
+
+    def show_jumaa_iqama(self, prayer):
+        self.emit("jumaa_iqama", prayer=prayer)
+
+    def show_jumaa_prayer(self):
+        self.emit("jumaa_prayer", prayer="Dhuhr", until=self._deadline())
+
+
+class HeadlessLoop:
+    """حلقة مؤقتات بسيطة (after/after_cancel) على الساعة الرتيبة بدون Tk"""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._cancelled = set()
+
+    def after(self, ms, callback, *args):
+        timer_id = next(self._ids)
+        heapq.heappush(self._queue, (time.monotonic() + max(0, ms) / 1000, timer_id, callback, args))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run(self):
+        readable = [sink for sink in self.sinks if sink.fileno() is not None]
+        while True:
+            while self._queue and self._queue[0][1] in self._cancelled:
+                self._cancelled.discard(heapq.heappop(self._queue)[1])
+
+            timeout = None
+            if self._queue:
+                timeout = max(0.0, self._queue[0][0] - time.monotonic())
+
+            if readable:
+                select.select(readable, [], [], timeout)
+                for sink in readable:
+                    sink.poll()
+            else:
+                time.sleep(timeout if timeout is not None else 1.0)
+
+            while self._queue and self._queue[0][0] <= time.monotonic():
+                _, timer_id, callback, args = heapq.heappop(self._queue)
+                if timer_id in self._cancelled:
+                    self._cancelled.discard(timer_id)
+                    continue
+                callback(*args)
+
+
+class HeadlessRunner:
+    """ربط المحرك بالحلقة بدون واجهة وإرسال الصلاة القادمة عند تغيرها"""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.view = JsonEventView(sink)
+        self.loop = HeadlessLoop([sink])
+        self.engine = SchedulingEngine(PrayerTimes.from_config(), self.loop, self.view, on_wake=self.update)
+        self.view.prayer_cycle = self.engine.prayer_cycle
+        self.next_prayer = None
+        self.jump_detector = ClockJumpDetector()
+
+    def update(self):
+        next_prayer = self.engine.update()
+        if next_prayer != self.next_prayer:
+            self.next_prayer = next_prayer
+            prayer, at = next_prayer
+            self.sink.greeting = self.view.emit(
+                "next_prayer", prayer=prayer, time=at.isoformat(timespec="seconds") if at else None)
+
+    def _check_clock_jump(self):
+        """قفزة في ساعة النظام أو استيقاظ من السكون: إعادة حساب أحداث اليوم فوراً"""
+        drift = self.jump_detector.check()
+        if drift:
+            print(f"⏩ قفزة في ساعة النظام: {drift:+.1f} ثانية", file=sys.stderr)
+            self.view.emit("clock_jump", drift_seconds=round(drift, 1))
+            self.engine.recover()
+            self.update()
+        self.loop.after(JUMP_CHECK_INTERVAL_MS, self._check_clock_jump)
+
+    def run(self):
+        self.update()
+        self.jump_detector.reset()
+        self.loop.after(JUMP_CHECK_INTERVAL_MS, self._check_clock_jump)
+        self.loop.run()
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mosque_app --headless",
+                                     description="محرك أوقات الصلاة بدون واجهة (أحداث JSON)")
+    parser.add_argument("--socket", default=HEADLESS_SOCKET_PATH,
+                        help="مسار Unix socket لإرسال الأحداث (افتراضياً المخرج القياسي)")
+    args = parser.parse_args(argv)
+
+    # المخرج القياسي مخصص لسطور JSON؛ باقي الرسائل إلى stderr
+    stdout = sys.stdout
+    for stream in (sys.stdout, sys.stderr):
+        if stream is not None:
+            stream.reconfigure(encoding='utf-8')
+    sys.stdout = sys.stderr
+    signal.signal(signal.SIGTERM, _stop)
+
+    sink = UnixSocketSink(args.socket) if args.socket else StdoutSink(stdout)
+    try:
+        HeadlessRunner(sink).run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
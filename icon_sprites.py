@@ -0,0 +1,72 @@
+# icon_sprites.py
+# رسم صور نبض أيقونة الإقامة مرة واحدة بـ Pillow بدل إعادة رسم الإيموجي بخط جديد في كل إطار
+from PIL import Image, ImageDraw, ImageFont
+
+# خطوط الإيموجي الملونة حسب النظام (Windows، Linux، macOS)
+EMOJI_FONTS = [
+    "seguiemj.ttf",
+    "NotoColorEmoji.ttf",
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+]
+# خطوط الإيموجي النقطية (Noto) لا تقبل إلا هذا الحجم
+BITMAP_EMOJI_SIZE = 109
+
+
+def _load_emoji_font(size):
+    for path in EMOJI_FONTS:
+        for font_size in (size, BITMAP_EMOJI_SIZE):
+            try:
+                return ImageFont.truetype(path, font_size)
+            except OSError:
+                continue
+    return None
+
+
+def render_glyph(text, size_px):
+    """رسم الإيموجي بالألوان على خلفية شفافة (مقصوصة على حدوده)، أو None إذا لم يتوفر الخط"""
+    font = _load_emoji_font(size_px)
+    if font is None:
+        return None
+
+    left, top, right, bottom = font.getbbox(text)
+    image = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+    ImageDraw.Draw(image).text((-left, -top), text, font=font, embedded_color=True)
+    bbox = image.getbbox()
+    return image.crop(bbox) if bbox else None
+
+
+def load_icon_source(text, size_px, fallback_path):
+    """صورة الأيقونة الأصلية: الإيموجي إن أمكن، وإلا صورة بديلة"""
+    image = render_glyph(text, size_px)
+    if image is None:
+        print(f"⚠️ خط الإيموجي غير متوفر، استعمال {fallback_path}")
+        image = Image.open(fallback_path).convert("RGBA")
+    return image
+
+
+def pulse_sizes(base, grow, shrink, fps, period_s):
+    """أحجام إطارات نبضة كاملة (موجة مثلثية: من الحجم الأصلي إلى الأكبر، ثم الأصغر، ثم العودة)"""
+    count = max(2, round(fps * period_s))
+    low, high = base - shrink, base + grow
+    span = 2 * (high - low)
+    sizes = []
+    for frame in range(count):
+        # الموضع على المسار low → high → low بدءاً من الحجم الأصلي
+        position = ((base - low) + span * frame / count) % span
+        size = low + position if position <= span / 2 else low + span - position
+        sizes.append(int(round(size)))
+    return sizes
+
+
+def build_pulse_frames(source, sizes_px):
+    """تصغير صورة الأيقونة لكل حجم مرة واحدة: {الحجم: صورة}"""
+    frames = {}
+    for size in sizes_px:
+        if size in frames:
+            continue
+        scale = size / max(source.size)
+        frames[size] = source.resize((max(1, round(source.width * scale)), max(1, round(source.height * scale))),
+                                     Image.Resampling.LANCZOS)
+    return frames
@@ -0,0 +1,159 @@
+# loudness.py
+# قياس مستوى صوت الملفات مرة واحدة (مخزن حسب بصمة المحتوى) وحساب التضخيم الذي يوحد مستواها عند التشغيل
+import hashlib
+import json
+import math
+import operator
+import os
+import threading
+import time
+from array import array
+
+try:
+    import audioop  # أُزيل من Python 3.13: بدونه تُحسب الطاقة والتضخيم بحلقة Python (أبطأ بكثير)
+except ImportError:
+    audioop = None
+
+from config import AUDIO_LOUDNESS_CACHE, AUDIO_TARGET_LOUDNESS_DB, AUDIO_MAX_GAIN_DB
+
+# كتل القياس وبوابات BS.1770: تجاهل الصمت المطلق، ثم الكتل الأخفض من المتوسط بـ 10 dB
+BLOCK_SECONDS = 0.4
+ABSOLUTE_GATE_DB = -70.0
+RELATIVE_GATE_DB = -10.0
+FULL_SCALE = 32768.0
+
+
+def file_sha256(path):
+    """بصمة SHA-256 لمحتوى الملف (تغيير الملف بنفس الاسم يعيد القياس)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_db(mean_square):
+    return 10 * math.log10(mean_square) if mean_square > 0 else -math.inf
+
+
+def _energy(data):
+    """مجموع مربعات عينات 16 بت (audioop في C إن وُجد)"""
+    if audioop is not None:
+        return audioop.rms(data, 2) ** 2 * (len(data) // 2)
+    samples = memoryview(data).cast("h")
+    return sum(map(operator.mul, samples, samples))
+
+
+def measure_loudness(sound):
+    """المستوى المتكامل (dBFS) لصوت 16 بت: متوسط طاقة كتل 400 ms بعد بوابات BS.1770 (بدون مرشح K)"""
+    if sound.sampwidth != 2:
+        return None
+    block = max(1, int(sound.samplerate * BLOCK_SECONDS)) * sound.channels * 2
+
+    # الصوت يُقرأ جزءاً بجزء (الأصوات المفكوكة أثناء التشغيل لا تُحمل كاملة)،
+    # والكتلة قد تمتد على جزأين: الطاقة والحجم يتراكمان حتى تكتمل (بدون نسخ العينات)
+    powers = []
+    energy = filled = 0
+    for chunk in sound.chunks():
+        view = memoryview(chunk)
+        position = 0
+        while position < len(view):
+            window = view[position:position + block - filled]
+            energy += _energy(window)
+            filled += len(window)
+            position += len(window)
+            if filled == block:
+                powers.append(energy / (block // 2 * FULL_SCALE * FULL_SCALE))
+                energy = filled = 0
+    if filled:
+        powers.append(energy / (filled // 2 * FULL_SCALE * FULL_SCALE))
+
+    gated = [power for power in powers if _to_db(power) > ABSOLUTE_GATE_DB]
+    if not gated:
+        return None
+    threshold = _to_db(sum(gated) / len(gated)) + RELATIVE_GATE_DB
+    gated = [power for power in gated if _to_db(power) > threshold]
+    return _to_db(sum(gated) / len(gated))
+
+
+def gain_for(loudness_db, target_db=AUDIO_TARGET_LOUDNESS_DB, max_gain_db=AUDIO_MAX_GAIN_DB):
+    """التضخيم الخطي الذي يوصل الصوت إلى المستوى المطلوب (محدود بـ max_gain_db)"""
+    if loudness_db is None:
+        return 1.0
+    gain_db = max(-max_gain_db, min(max_gain_db, target_db - loudness_db))
+    return 10 ** (gain_db / 20)
+
+
+def apply_gain(data, gain, sampwidth=2):
+    """عينات PCM مضروبة في تضخيم ثابت (مع القص)؛ تُحسب مرة واحدة للصوت أو لكل جزء مفكوك، لا عند كل كتلة"""
+    if gain == 1.0:
+        return data
+    if audioop is not None:
+        return audioop.mul(data, sampwidth, gain)
+    if sampwidth != 2:
+        return data
+    samples = array("h")
+    samples.frombytes(data)
+    return array("h", [max(-32768, min(32767, int(sample * gain))) for sample in samples]).tobytes()
+
+
+class LoudnessCache:
+    """ملف JSON: {بصمة المحتوى: {"loudness_db": ...، "name": ...}}"""
+
+    def __init__(self, path=AUDIO_LOUDNESS_CACHE):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, digest):
+        entry = self.entries.get(digest)
+        return entry["loudness_db"] if entry else None
+
+    def put(self, digest, loudness_db, name):
+        self.entries[digest] = {"loudness_db": loudness_db, "name": name}
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def analyze_sounds(bank, cache):
+    """قياس أصوات SoundBank (أو أخذها من الكاش) وضبط تضخيم كل صوت"""
+    for name, sound in list(bank.sounds.items()):
+        started = time.perf_counter()
+        digest = file_sha256(bank.paths[name])
+        loudness_db = cache.get(digest)
+        source = "كاش"
+        if loudness_db is None:
+            loudness_db = measure_loudness(sound)
+            if loudness_db is None:
+                print(f"⚠️ تعذر قياس مستوى {name}")
+                continue
+            cache.put(digest, loudness_db, os.path.basename(bank.paths[name]))
+            source = "قياس"
+        sound.set_gain(gain_for(loudness_db))
+        print(f"🎚️ {name}: {loudness_db:.1f} dBFS → تضخيم {20 * math.log10(sound.gain):+.1f} dB "
+              f"({source}، {(time.perf_counter() - started) * 1000:.0f} ms)")
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️ تعذر حفظ كاش مستوى الصوت: {e}")
+
+
+def start_loudness_analysis(bank, cache_path=AUDIO_LOUDNESS_CACHE):
+    """القياس في خيط خلفي عند البدء (الأصوات تُسمع بدون تضخيم حتى ينتهي)"""
+    thread = threading.Thread(target=lambda: analyze_sounds(bank, LoudnessCache(cache_path)),
+                              name="loudness", daemon=True)
+    thread.start()
+    return thread
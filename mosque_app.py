@@ -1,11 +1,16 @@
 # mosque_app.csv
+import sys
+
+# وضع بدون واجهة (python -m mosque_app --headless): قبل تحميل customtkinter و PIL
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from headless import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
 import customtkinter as ctk
 from PIL import Image, ImageTk
-import datetime
-import sys
 import os
-import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 
 if sys.stdout is not None:
     sys.stdout.reconfigure(encoding='utf-8')
@@ -15,52 +20,96 @@ from config import *
 from utils import *
 from audio_manager import AudioManager
 from overlay_manager import OverlayManager
+from font_registry import FontRegistry
 from prayer_times import PrayerTimes
 from theme_manager import ThemeManager
+from scheduler import ClockTicker
+from ui_bindings import WidgetBinder
+from engine import SchedulingEngine
+from clock import get_clock
+from background_cache import load_background
+from startup import StartupStages
 
 class MosqueApp:
     def __init__(self, root):
         self.root = root
         self.root.title(MOSQUE_NAME)
+        # المرحلة الأولى متزامنة (حتى أول إطار: الساعة وأوقات اليوم)، والباقي في callbacks خاملة
+        self.startup = StartupStages(self.root)
+        # خيوط تحضير الملفات الثقيلة (الصوت، الخلفية، الأيقونات) بعيداً عن خيط الواجهة
+        self.executor = ThreadPoolExecutor(max_workers=STARTUP_WORKERS, thread_name_prefix="assets")
         
         # تهيئة الموديولات
         self.theme_manager = ThemeManager()
-        self.audio_manager = AudioManager()
-        
-        # إنشاء الأيقونة
-        # create_mosque_icon()
-        self._setup_icon()
+        self.audio_manager = AudioManager(self.executor)
+        self.audio_manager.attach(self.root)
+        self.ui = WidgetBinder()
         
         # إعداد الشاشة
         self.root.attributes("-fullscreen", True)
         self.root.bind("<Escape>", lambda e: self.toggle_fullscreen())
-        self.root.bind("<F1>", lambda e: self.test_adhan_maghrib())
+        self.startup.mark("النافذة")
         
         # تحميل البيانات
-        csv_data, self.place = load_csv()
-        self.prayer_times = PrayerTimes(csv_data)
-        
-        # ⭐⭐ إضافة هذا السطر: تعريف is_jumaa قبل استخدامه ⭐⭐
-        self.is_jumaa = False  # القيمة الافتراضية
+        self.prayer_times = PrayerTimes.from_config()
+        self.place = self.prayer_times.place or PLACE_NAME
+        self._setup_azkar_data()
+        self.startup.mark("جدول الأوقات")
         
-        # إعداد الواجهة
+        # إعداد الواجهة الرئيسية (الأزرار بنصوص حتى تُحمل أيقوناتها)
         self._setup_ui()
+        self.startup.mark("الواجهة الرئيسية")
+        
+        # محرك الجدولة: أحداث اليوم ودورة الصلاة (هذه الواجهة هي العرض)
+        self.engine = SchedulingEngine(
+            self.prayer_times, self.root, self,
+            zekr_counts={prayer: len(azkar) for prayer, azkar in self.azkar_by_prayer.items()},
+            surah_count=len(self.surahs),
+            on_wake=self.update_display,
+            on_preroll=lambda event: self.audio_manager.play_at("adhan", event.at)
+        )
+        self.engine.wakeup_sources.append(self.theme_manager.next_change)
+        self.day_planner = self.engine.day_planner
+        self.prayer_cycle = self.engine.prayer_cycle
+        self.event_scheduler = self.engine.event_scheduler
+        
+        # أول إطار: الساعة وأوقات اليوم فقط (الأحداث تبدأ بعد بناء كل الشاشات)
+        self.ready = False
+        self.next_prayer = (None, None)
+        self.arabic_day = ""
+        self.clock_ticker = ClockTicker(self.root, self.tick, on_missed=self._on_missed_ticks,
+                                        on_jump=self._on_clock_jump)
+        self._paint_first_frame()
+        self.clock_ticker.start()
+        self.startup.mark("الساعة والأوقات")
+        
+        # باقي المراحل بعد ظهور أول إطار
+        self.startup.add("الأيقونة", self._setup_icon)
+        self.startup.add("أيقونات الأزرار", self._apply_button_icons,
+                         self.executor.submit(self._load_button_icons))
+        self.startup.add("الـ overlay", self._setup_overlay)
+        self.startup.add("الأذكار والسور", self._create_azkar_pages)
+        self.startup.add("صفحات الجمعة", self._setup_jumaa_system)
+        # الأذان المجدول مسبقاً يحتاج محرك الصوت: الجدولة تبدأ بعد تحضيره
+        self.startup.add("الصوت", self.audio_manager.finish_startup, self.audio_manager.ready_future)
+        self.startup.add("بدء الجدولة", self._start_scheduling)
+        self.startup.run()
+    
+    def _start_scheduling(self):
+        """آخر مرحلة: كل الشاشات جاهزة، بدء تنفيذ أحداث اليوم والساعة"""
+        self.root.bind("<F1>", lambda e: self.test_adhan_maghrib())
+        self.root.bind("<F2>", lambda e: self.day_planner.dump())
+        self.root.bind("<F3>", lambda e: self._print_stats())
+        self.root.bind("<F4>", lambda e: self.rescale_fonts())
         
-        # تهيئة الـ overlay
-        self.overlay_manager = OverlayManager(self.root, self.font_scales, self.audio_manager)
-        
-        # تهيئة نظام الأذكار
-        self._setup_azkar_system()
-        
-        # تهيئة نظام الجمعة الخاص
-        self._setup_jumaa_system()
-        
-        # بدء التحديث
-        self.last_adhan_played = None
-        self.last_prayer_completed = None
+        # بدء التحديث: تحديث كامل عند كل حدث مهم، والساعة فقط كل ثانية
+        self.ready = True
         self.update_display()
-        self._check_jumaa_day()  # ✅ الآن ستعمل بدون خطأ
-        self.root.after(REFRESH_INTERVAL_MS, self.tick)
+    
+    def _setup_overlay(self):
+        """تهيئة الـ overlay (شاشات الأذان والإقامة) ورسم صور نبض الأيقونة في خيط خلفي"""
+        self.overlay_manager = OverlayManager(self.root, self.font_scales, self.audio_manager, self.fonts)
+        self.overlay_manager.preload_pulse_frames(self.executor)
         
     def _setup_icon(self):
         """إعداد أيقونة التطبيق"""
@@ -83,25 +132,6 @@ class MosqueApp:
         except Exception as e:
             print(f"خطأ في تحميل الأيقونة: {e}")
     
-    def _check_jumaa_day(self):
-        """التحقق كل ساعة مما إذا كان اليوم جمعة"""
-        now = datetime.datetime.now()
-        weekday = now.weekday()  # 0 = Monday ... 4 = Friday
-        
-        if weekday == 4:
-            # اليوم جمعة
-            print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] 🕌 اليوم جمعة - سيتم استخدام صلاة الجمعة (بدل الظهر)")
-            self.is_jumaa = True
-        else:
-            # باقي الأيام - إعادة تعيين العلامات
-            if self.is_jumaa:  # إذا كان اليوم جمعة وأصبح غير جمعة
-                self._reset_jumaa_flags()
-            self.is_jumaa = False
-            print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] 📅 اليوم عادي (ليس جمعة)")
-        
-        # إعادة التحقق كل ساعة (3600000 ms)
-        self.root.after(3600000, self._check_jumaa_day)
-
     def _setup_ui(self):
         """إعداد واجهة المستخدم"""
         screen_w = self.root.winfo_screenwidth()
@@ -110,9 +140,10 @@ class MosqueApp:
         print(f"دقة الشاشة: {screen_w} x {screen_h}")
         self.font_scales = calculate_font_scales(screen_w, screen_h)
         print(f"عامل التحجيم: {self.font_scales['scale_factor']:.1f}")
+        self.fonts = FontRegistry(self.font_scales)
 
-        # الخلفية - يجب أن تكون أول شيء
-        self.root.after(500, self._setup_background)
+        # الخلفية - يجب أن تكون أول شيء (لون صلب فوراً، والصورة عند جاهزيتها)
+        self._setup_background()
     
         # الحاوية الرئيسية
         main_container = ctk.CTkFrame(self.root, fg_color="transparent")
@@ -134,7 +165,9 @@ class MosqueApp:
         self._setup_prayer_schedule(main_container)
     
     def _setup_background(self):
-        """إعداد خلفية التطبيق باستخدام CTkImage بشكل صحيح"""
+        """خلفية لون صلب فوراً، ثم صورة الخلفية بحجم الشاشة من الكاش أو بتحجيمها في خيط خلفي"""
+        self._create_solid_background("#1a1a1a")
+
         # البحث عن ملف الخلفية في مسارات مختلفة
         possible_paths = [
             "background.jpg",
@@ -151,49 +184,38 @@ class MosqueApp:
                 print(f"تم العثور على خلفية: {path}")
                 break
         
-        if bg_file_found:
-            try:
-                # تحميل الصورة باستخدام PIL
-                print(f"جاري تحميل الخلفية من: {bg_file_found}")
-                bg_img = Image.open(bg_file_found)
-                
-                # تحجيم الصورة لتناسب الشاشة
-                screen_w = self.root.winfo_screenwidth()
-                screen_h = self.root.winfo_screenheight()
-                print(f"تحجيم الصورة إلى: {screen_w} x {screen_h}")
-                
-                bg_img_resized = bg_img.resize((screen_w, screen_h), Image.Resampling.LANCZOS)
-                
-                # استخدام CTkImage بشكل صحيح
-                self.bg_ctk_image = ctk.CTkImage(
-                    light_image=bg_img_resized,
-                    dark_image=bg_img_resized,
-                    size=(screen_w, screen_h)
-                )
-                
-                # استخدام CTkLabel مع CTkImage - بدون لون خلفية
-                self.bg_label = ctk.CTkLabel(
-                    self.root, 
-                    image=self.bg_ctk_image, 
-                    text=""
-                )
-                self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-                
-                # تأكد من أن الخلفية في الخلف
-                self.bg_label.lower()
-                
-                print("تم تحميل الخلفية بنجاح باستخدام CTkImage")
-                
-            except Exception as e:
-                print(f"خطأ في تحميل الخلفية: {e}")
-                print("استخدام خلفية صلبة بدلاً من الصورة")
-                self._create_solid_background("#1a1a1a")
-        else:
+        if not bg_file_found:
             print("لم يتم العثور على ملف الخلفية في المسارات التالية:")
             for path in possible_paths:
                 print(f"  - {path}")
             print("استخدام لون خلفية افتراضي")
-            self._create_solid_background("#1a1a1a")
+            return
+
+        size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        print(f"جاري تحضير الخلفية من: {bg_file_found} ({size[0]} x {size[1]})")
+        self._background_future = self.executor.submit(load_background, bg_file_found, size)
+        self._poll_background()
+
+    def _poll_background(self):
+        """انتظار خيط تحضير الخلفية ثم عرض الصورة (CTkImage يُنشأ في خيط الواجهة فقط)"""
+        future = self._background_future
+        if not future.done():
+            self.root.after(BACKGROUND_POLL_MS, self._poll_background)
+            return
+        try:
+            bg_img = future.result()
+        except Exception as e:
+            print(f"خطأ في تحميل الخلفية: {e}")
+            print("استخدام خلفية صلبة بدلاً من الصورة")
+            return
+
+        self.bg_ctk_image = ctk.CTkImage(
+            light_image=bg_img,
+            dark_image=bg_img,
+            size=bg_img.size
+        )
+        self.bg_label.configure(image=self.bg_ctk_image)
+        print("تم تحميل الخلفية بنجاح باستخدام CTkImage")
 
     def _create_solid_background(self, color):
         """إنشاء خلفية صلبة"""
@@ -216,32 +238,43 @@ class MosqueApp:
         button_container.pack(side="right")
 
         # زر الإغلاق
-        close_btn = self._create_button(button_container, CLOSE_IMG, "X", "#E74C3C", self.root.destroy)
+        close_btn = self._create_button(button_container, "X", "#E74C3C", self.root.destroy)
         close_btn.pack(side="right", padx=5)
 
         # زر التصغير
-        min_btn = self._create_button(button_container, MINIMIZE_IMG, "_", "#3498DB", self.root.iconify)
+        min_btn = self._create_button(button_container, "_", "#3498DB", self.root.iconify)
         min_btn.pack(side="right", padx=5)
+
+        # الأيقونات تُحمل في خيط خلفي وتُطبق بعد أول إطار
+        self.button_icons = {CLOSE_IMG: close_btn, MINIMIZE_IMG: min_btn}
     
-    def _create_button(self, parent, img_path, text, color, command):
-        """إنشاء زر"""
-        img_path = resource_path(img_path)
-        if os.path.exists(img_path):
-            try:
-                img = Image.open(img_path)
-                icon = ctk.CTkImage(light_image=img, dark_image=img, size=(20, 20))
-                return ctk.CTkButton(
-                    parent, image=icon, text="", width=30, height=2,
-                    fg_color=color, hover_color=color, command=command
-                )
-            except Exception as e:
-                print(f"Error loading icon {img_path}: {e}")
-        
+    def _create_button(self, parent, text, color, command):
+        """إنشاء زر (بنص حتى تُحمل أيقونته)"""
         return ctk.CTkButton(
             parent, text=text, width=30, height=2,
-            fg_color=color, hover_color=color, font=("Arial", 14, "bold"), command=command
+            fg_color=color, hover_color=color, font=self.fonts["button"], command=command
         )
     
+    def _load_button_icons(self):
+        """فك صور أيقونات الأزرار (في خيط خلفي): {المسار: صورة}"""
+        images = {}
+        for img_path in self.button_icons:
+            path = resource_path(img_path)
+            if os.path.exists(path):
+                try:
+                    img = Image.open(path)
+                    img.load()
+                    images[img_path] = img
+                except Exception as e:
+                    print(f"Error loading icon {path}: {e}")
+        return images
+    
+    def _apply_button_icons(self, images):
+        """وضع الأيقونات على الأزرار (CTkImage يُنشأ في خيط الواجهة)"""
+        for img_path, img in images.items():
+            icon = ctk.CTkImage(light_image=img, dark_image=img, size=(20, 20))
+            self.button_icons[img_path].configure(image=icon, text="")
+    
     def _setup_titles(self, parent):
         """إعداد العناوين"""
         colors = self.theme_manager.get_colors()
@@ -249,7 +282,7 @@ class MosqueApp:
         # اسم المسجد
         self.mosque_label = ctk.CTkLabel(
             parent, text=MOSQUE_NAME,
-            font=("Arial", self.font_scales['mosque_font'], "bold"),
+            font=self.fonts["mosque"],
             text_color=colors["title"], fg_color="transparent"
         )
         self.mosque_label.pack(pady=(self.font_scales['title_pady'], 0))
@@ -257,7 +290,7 @@ class MosqueApp:
         # المكان
         self.place_label = ctk.CTkLabel(
             parent, text=PLACE_NAME,
-            font=("Arial", self.font_scales['place_font']),
+            font=self.fonts["place"],
             text_color=colors["text_color"], fg_color="transparent"
         )
         self.place_label.pack(pady=(3, 0))
@@ -265,7 +298,7 @@ class MosqueApp:
         # التاريخ والوقت
         self.date_label = ctk.CTkLabel(
             parent, text="",
-            font=("Arial", self.font_scales['date_font']),
+            font=self.fonts["date"],
             text_color=colors["text_color"], fg_color="transparent"
         )
         self.date_label.pack(pady=(0, 2))
@@ -292,7 +325,7 @@ class MosqueApp:
         # عنوان القسم
         self.next_title = ctk.CTkLabel(
             next_prayer_container, text="الصلاة القادمة",
-            font=("Arial", self.font_scales['next_title_font'], "bold"),
+            font=self.fonts["next_title"],
             text_color=colors["text_color"]
         )
         self.next_title.pack(pady=(3, 0))
@@ -300,7 +333,7 @@ class MosqueApp:
         # اسم الصلاة
         self.next_name = ctk.CTkLabel(
             next_prayer_container, text="",
-            font=("Arial", self.font_scales['next_name_font'], "bold"),
+            font=self.fonts["next_name"],
             text_color="gold"
         )
         self.next_name.pack(pady=10)
@@ -308,7 +341,7 @@ class MosqueApp:
         # العد التنازلي
         self.countdown = ctk.CTkLabel(
             next_prayer_container, text="",
-            font=("Arial", self.font_scales['countdown_font']),
+            font=self.fonts["countdown"],
             text_color=colors["countdown_color"]
         )
 
@@ -338,7 +371,7 @@ class MosqueApp:
         sunrise_title = ctk.CTkLabel(
             sunrise_frame,
             text="🌅 وقت الشروق",
-            font=("Arial", self.font_scales['prayer_name_font'], "bold"),
+            font=self.fonts["prayer_name"],
             text_color="#FFD700"
         )
         sunrise_title.pack()
@@ -346,7 +379,7 @@ class MosqueApp:
         self.sunrise_time = ctk.CTkLabel(
             sunrise_frame,
             text="--:--",
-            font=("Arial", self.font_scales['prayer_time_font'], "bold"),
+            font=self.fonts["prayer_time"],
             text_color=colors["countdown_color"]
         )
         self.sunrise_time.pack()
@@ -358,7 +391,7 @@ class MosqueApp:
         jumaa_title = ctk.CTkLabel(
             jumaa_frame,
             text="🕌 صلاة الجمعة",
-            font=("Arial", self.font_scales['prayer_name_font'], "bold"),
+            font=self.fonts["prayer_name"],
             text_color="#FFD700"
         )
         jumaa_title.pack()
@@ -366,7 +399,7 @@ class MosqueApp:
         self.jumaa_time = ctk.CTkLabel(
             jumaa_frame,
             text="12:30",  # وقت افتراضي لصلاة الجمعة
-            font=("Arial", self.font_scales['prayer_time_font'], "bold"),
+            font=self.fonts["prayer_time"],
             text_color=colors["countdown_color"]
         )
         self.jumaa_time.pack()
@@ -385,7 +418,7 @@ class MosqueApp:
         # عنوان الجدول
         schedule_title = ctk.CTkLabel(
             schedule_frame, text="أوقات الصلاة اليوم",
-            font=("Arial", self.font_scales['schedule_title_font'], "bold"),
+            font=self.fonts["schedule_title"],
             text_color=colors["text_color"]
         )
         schedule_title.pack(pady=10)
@@ -417,7 +450,7 @@ class MosqueApp:
             # اسم الصلاة
             name_label = ctk.CTkLabel(
                 column_frame, text=DISPLAY_NAMES[prayer],
-                font=("Arial", self.font_scales['prayer_name_font'], "bold"),
+                font=self.fonts["prayer_name"],
                 text_color="#FFD700"
             )
             name_label.pack(pady=(15, 5))
@@ -425,7 +458,7 @@ class MosqueApp:
             # وقت الصلاة
             time_label = ctk.CTkLabel(
                 column_frame, text="--:--",
-                font=("Arial", self.font_scales['prayer_time_font'], "bold"),
+                font=self.fonts["prayer_time"],
                 text_color=colors["countdown_color"]
             )
             time_label.pack(pady=(5, 15))
@@ -434,28 +467,12 @@ class MosqueApp:
     
     def _setup_jumaa_system(self):
         """إعداد نظام الجمعة الخاص"""
-        # حالات نظام الجمعة
-        self.jumaa_dark_page_visible = False
-        self.jumaa_prayer_page_visible = False
-        self.jumaa_adhan_played = False
-        self.jumaa_iqama_played = False
-        self.azkar_started = False  # إضافة هذا المتغير
-        
         # إنشاء صفحة الخطبة (سوداء)
         self._create_khotba_page()
         
         # إنشاء صفحة الصلاة (بدون عداد)
         self._create_jumaa_prayer_page()
 
-    def _reset_jumaa_flags(self):
-        """إعادة تعيين علامات الجمعة"""
-        self.jumaa_dark_page_visible = False
-        self.jumaa_prayer_page_visible = False
-        self.jumaa_adhan_played = False
-        self.jumaa_iqama_played = False
-        self.azkar_started = False
-        print("🔄 إعادة تعيين علامات نظام الجمعة")
-    
     def _create_khotba_page(self):
         """إنشاء صفحة الخطبة السوداء"""
         self.khotba_frame = ctk.CTkFrame(
@@ -469,7 +486,7 @@ class MosqueApp:
         self.khotba_label = ctk.CTkLabel(
             self.khotba_frame,
             text="🕌 خطبة الجمعة\n\nيرجى الإنصات للخطيب",
-            font=("Arial", 80, "bold"),
+            font=self.fonts["khotba_text"],
             text_color="#FFFFFF",
             justify="center"
         )
@@ -479,7 +496,7 @@ class MosqueApp:
         self.khotba_timer = ctk.CTkLabel(
             self.khotba_frame,
             text="⏳ وقت الخطبة: 15:00",
-            font=("Arial", 40, "bold"),
+            font=self.fonts["khotba_timer"],
             text_color="#FFD700"
         )
         self.khotba_timer.place(relx=0.5, rely=0.8, anchor="center")
@@ -504,7 +521,7 @@ class MosqueApp:
         self.jumaa_icon = ctk.CTkLabel(
             center_frame,
             text="🕌",
-            font=("Arial", 120, "bold"),
+            font=self.fonts["jumaa_icon"],
             text_color="gold"
         )
         self.jumaa_icon.pack(pady=(0, 30))
@@ -513,7 +530,7 @@ class MosqueApp:
         self.jumaa_prayer_label = ctk.CTkLabel(
             center_frame,
             text="صلاة الجمعة",
-            font=("Arial", 80, "bold"),
+            font=self.fonts["jumaa_title"],
             text_color="#FFFFFF"
         )
         self.jumaa_prayer_label.pack(pady=(0, 20))
@@ -522,7 +539,7 @@ class MosqueApp:
         self.jumaa_instruction = ctk.CTkLabel(
             center_frame,
             text="الرجاء متابعة الإمام في الصلاة",
-            font=("Arial", 40),
+            font=self.fonts["jumaa_instruction"],
             text_color="#87CEEB"
         )
         self.jumaa_instruction.pack(pady=(0, 10))
@@ -531,7 +548,7 @@ class MosqueApp:
         self.jumaa_prayer_timer = ctk.CTkLabel(
             center_frame,
             text="⏳ 00:30",
-            font=("Arial", 50, "bold"),
+            font=self.fonts["jumaa_timer"],
             text_color="#FFD700"
         )
         self.jumaa_prayer_timer.pack(pady=(20, 0))
@@ -539,168 +556,73 @@ class MosqueApp:
         # إخفاء الصفحة في البداية
         self.jumaa_prayer_frame.place_forget()
     
-    def _start_jumaa_khotba(self):
-        """بدء فترة الخطبة (15 دقيقة)"""
-        if self.jumaa_dark_page_visible:
-            return
-            
+    def show_khotba(self):
+        """إظهار صفحة الخطبة السوداء"""
         print("🕌 بدء فترة الخطبة - 15 دقيقة")
-        self.jumaa_dark_page_visible = True
-        
-        # إظهار صفحة الخطبة السوداء
         self.khotba_frame.lift()
         self.khotba_frame.place(x=0, y=0, relwidth=1, relheight=1)
-        
-        # بدء العد التنازلي للخطبة (15 دقيقة)
-        self.khotba_remaining = 15 * 60  # 15 دقيقة بالثواني
-        self._update_khotba_timer()
     
-    def _update_khotba_timer(self):
+    def update_khotba(self, remaining_seconds):
         """تحديث عداد الخطبة"""
-        if not self.jumaa_dark_page_visible:
-            return
-            
-        self.khotba_remaining -= 1
-        
-        if self.khotba_remaining <= 0:
-            # انتهت فترة الخطبة، الانتقال للإقامة
-            self._end_khotba_period()
-            return
-        
-        # تحديث العداد
-        minutes = self.khotba_remaining // 60
-        seconds = self.khotba_remaining % 60
-        self.khotba_timer.configure(text=f"⏳ وقت الخطبة: {minutes:02d}:{seconds:02d}")
-        
-        # الاستمرار في العد
-        self.root.after(1000, self._update_khotba_timer)
+        minutes = remaining_seconds // 60
+        seconds = remaining_seconds % 60
+        self.ui.set_text(self.khotba_timer, f"⏳ وقت الخطبة: {minutes:02d}:{seconds:02d}")
     
-    def _end_khotba_period(self):
-        """إنهاء فترة الخطبة وبدء الإقامة"""
-        print("🕌 انتهت فترة الخطبة، بدء الإقامة مباشرة")
-        self.jumaa_dark_page_visible = False
+    def hide_khotba(self):
         self.khotba_frame.place_forget()
-        
-        # تشغيل الإقامة مباشرة (بدون عد تنازلي)
-        self.overlay_manager.play_iqama_directly("Dhuhr")
-        
-        # بعد 30 ثانية من الإقامة، عرض صفحة الصلاة
-        # self.root.after(30000, self._show_jumaa_prayer_page)  # 30 ثانية
     
-    def _show_jumaa_prayer_page(self):
-        """عرض صفحة الصلاة بعد الإقامة"""
-        if self.jumaa_prayer_page_visible:
-            return  # منع التكرار إذا الصفحة معروضة بالفعل
-            
-        print("🕌 عرض صفحة الصلاة بعد الإقامة بـ 30 ثانية")
-        self.jumaa_prayer_page_visible = True
-        
-        # إظهار صفحة الصلاة
+    def show_jumaa_prayer(self):
+        """إظهار صفحة صلاة الجمعة"""
+        print("🕌 وقت الإقامة - عرض صفحة الصلاة")
         self.jumaa_prayer_frame.lift()
         self.jumaa_prayer_frame.place(x=0, y=0, relwidth=1, relheight=1)
-        
-        # بدء العد التنازلي للصلاة (30 ثانية)
-        self.prayer_remaining = 30  # 30 ثانية
-        self._update_prayer_timer()
     
-    def _update_prayer_timer(self):
+    def update_jumaa_prayer(self, remaining_seconds):
         """تحديث عداد الصلاة"""
-        if not self.jumaa_prayer_page_visible:
-            return
-            
-        self.prayer_remaining -= 1
-        
-        if self.prayer_remaining <= 0:
-            # انتهت فترة الصلاة، الانتقال للأذكار
-            self._end_prayer_period()
-            return
-        
-        # تحديث العداد
-        self.jumaa_prayer_timer.configure(text=f"⏳ {self.prayer_remaining:02d}")
-        
-        # الاستمرار في العد
-        self.root.after(1000, self._update_prayer_timer)
+        self.ui.set_text(self.jumaa_prayer_timer, f"⏳ {remaining_seconds:02d}")
     
-    def _end_prayer_period(self):
-        """إنهاء فترة الصلاة وبدء الأذكار"""
-        print("🕌 انتهت فترة الصلاة، بدء الأذكار بعد 5 دقائق")
-        self.jumaa_prayer_page_visible = False
+    def hide_jumaa_prayer(self):
+        """إخفاء صفحة الصلاة (الأذكار تبدأ من جدول أحداث اليوم بعد 5 دقائق)"""
         self.jumaa_prayer_frame.place_forget()
-        
-        # بعد 5 دقائق من الإقامة، عرض الأذكار
-        self.root.after(5 * 60 * 1000, self._start_jumaa_azkar)  # 5 دقائق
     
-    def _start_jumaa_azkar(self):
-        """بدء الأذكار بعد صلاة الجمعة"""
-        if getattr(self, 'azkar_started', False):
-            print("⛔ الأذكار بدأت بالفعل - منع التكرار")
-            return  # منع التكرار إذا الأذكار بدأت بالفعل
-            
-        print("🕌 بدء الأذكار بعد صلاة الجمعة")
-        self.azkar_started = True
-        
-        # تعيين أن صلاة الظهر قد اكتملت (لمنع النظام العادي من عرض الأذكار)
-        self.last_prayer_completed = "Dhuhr"
-        
-        # عرض الأذكار
-        self.show_zekr("Dhuhr")
+    def show_adhan(self, prayer_name):
+        self.overlay_manager.show_adhan_overlay(prayer_name, test=self.prayer_cycle.is_test)
     
-    def _check_jumaa_schedule(self):
-        """التحقق من جدول الجمعة مع التوقيتات الجديدة"""
-        now = datetime.datetime.now()
-        
-        # التحقق إذا كان اليوم جمعة
-        if now.weekday() != 4:  # 4 = الجمعة
-            return False
+    def show_iqama_countdown(self, prayer_name):
+        self.overlay_manager.show_iqama_countdown(prayer_name)
+    
+    def update_iqama_countdown(self, remaining_seconds):
+        self.overlay_manager.update_iqama_countdown(remaining_seconds)
     
-        # الحصول على وقت صلاة الجمعة (الظهر)
-        jumaa_time = self._get_prayer_time_today("Dhuhr")
-        if not jumaa_time:
-            return False
-        
-        # الوقت الحالي
-        current_time = now
-        
-        # 1 دقيقة بعد الأذان - بدء الخطبة
-        khotba_start_time = jumaa_time + datetime.timedelta(minutes=1)
-        if khotba_start_time <= current_time <= khotba_start_time + datetime.timedelta(seconds=10):
-            if not self.jumaa_adhan_played:
-                print("🕌 وقت الجمعة - بدء الخطبة بعد الأذان بـ 1 دقيقة")
-                self.jumaa_adhan_played = True
-                self._start_jumaa_khotba()
-                return True
-        
-        # بعد الإقامة بـ 30 ثانية - عرض صفحة الصلاة
-        iqama_time = jumaa_time + datetime.timedelta(minutes=1 + 15)  # 1 دقيقة أذان + 15 دقيقة خطبة
-        if iqama_time <= current_time <= iqama_time + datetime.timedelta(seconds=40):
-            if not self.jumaa_iqama_played and not self.jumaa_prayer_page_visible:
-                print("🕌 وقت الإقامة - عرض صفحة الصلاة بعد 30 ثانية")
-                self.jumaa_iqama_played = True
-                # إيقاف أي overlay للإقامة
-                self.overlay_manager.stop_iqama_countdown()
-                # عرض صفحة الصلاة مباشرة
-                self._show_jumaa_prayer_page()
-                return True
-        
-        return False
+    def show_iqama_message(self, prayer_name):
+        self.overlay_manager.show_iqama_message(prayer_name)
+    
+    def show_jumaa_iqama(self, prayer_name):
+        self.overlay_manager.play_iqama_directly(prayer_name)
+    
+    def hide_overlay(self):
+        self.overlay_manager.hide_overlay()
     
     def toggle_fullscreen(self):
         """تبديل وضع ملء الشاشة"""
         self.root.attributes("-fullscreen", not self.root.attributes("-fullscreen"))
     
+    def rescale_fonts(self):
+        """إعادة حساب أحجام الخطوط بعد تغيير الشاشة (F4) وتطبيقها على كل العناصر دفعة واحدة"""
+        font_scales = calculate_font_scales(self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        if font_scales['scale_factor'] == self.font_scales['scale_factor']:
+            return
+        self.font_scales.update(font_scales)
+        self.fonts.rescale(self.font_scales)
+        self.overlay_manager.invalidate_pulse_frames()
+    
     def test_adhan_maghrib(self):
-        """اختبار الأذان للمغرب"""
-        self.overlay_manager.show_adhan_overlay("Maghrib")
+        """اختبار الأذان للمغرب (يُتجاهل أثناء دورة صلاة جارية)"""
+        self.prayer_cycle.test_adhan("Maghrib")
     
-    def _setup_azkar_system(self):
-        """إعداد نظام الأذكار بعد الصلوات"""
-        self.azkar_times = {
-            "Fajr": 26 * 60,     
-            "Dhuhr": 23 * 60,
-            "Asr": 23 * 60,
-            "Maghrib": 17 * 60,
-            "Isha": 24 * 60
-        }
+    def _setup_azkar_data(self):
+        """نصوص الأذكار والسور بعد الصلوات (الصفحات تُبنى بعد أول إطار)"""
+        self.azkar_times = AZKAR_TIMES
                 
         # أذكار خاصة لكل صلاة (10 تسبيحات) - صفحة الأذكار
         self.azkar_by_prayer = {
@@ -791,16 +713,8 @@ class MosqueApp:
             }
         ]
 
-        # باقي الإعدادات
-        self.current_zekr_index = 0
-        self.current_surah_index = 0
-        self.zekr_visible = False
-        self.surah_visible = False
-        self.zekr_start_time = None
-        self.surah_start_time = None
-        self.current_prayer_for_azkar = None
-
-        # إنشاء عناصر الأذكار والسور
+    def _create_azkar_pages(self):
+        """إنشاء عناصر الأذكار والسور"""
         self._create_zekr_widget()
         self._create_surah_widget()
     
@@ -825,7 +739,7 @@ class MosqueApp:
         self.zekr_icon = ctk.CTkLabel(
             center_frame,
             text="🕌",
-            font=("Arial", 110, "bold"),
+            font=self.fonts["page_icon"],
             text_color="gold"
         )
         self.zekr_icon.pack(pady=(20, 10))
@@ -834,7 +748,7 @@ class MosqueApp:
         self.zekr_prayer_title = ctk.CTkLabel(
             center_frame,
             text="",
-            font=("Arial", 50, "bold"),
+            font=self.fonts["zekr_title"],
             text_color="#FFD700"
         )
         self.zekr_prayer_title.pack(pady=(0, 20))
@@ -844,7 +758,7 @@ class MosqueApp:
         self.zekr_label = ctk.CTkLabel(
             center_frame,
             text="",
-            font=("Arial", 70),
+            font=self.fonts["page_text"],
             text_color="#FFFFFF",
             wraplength=1100,
             justify="center"
@@ -855,7 +769,7 @@ class MosqueApp:
         self.zekr_footer = ctk.CTkLabel(
             center_frame,
             text="",
-            font=("Arial", 18),
+            font=self.fonts["page_footer"],
             text_color="#87CEEB"
         )
         self.zekr_footer.pack(pady=4)
@@ -864,13 +778,13 @@ class MosqueApp:
         self.zekr_back_button = ctk.CTkButton(
             self.zekr_frame,
             text="العودة",
-            font=("Arial", 16, "bold"),
+            font=self.fonts["back_button"],
             fg_color="transparent",
             hover_color="#1E3A5F",
             text_color="white",
             border_width=2,
             border_color="gold",
-            command=self.hide_zekr,
+            command=lambda: self.prayer_cycle.dismiss(),
             width=100,
             height=40
         )
@@ -900,7 +814,7 @@ class MosqueApp:
         self.surah_icon = ctk.CTkLabel(
             center_frame,
             text="📖",
-            font=("Arial", 110, "bold"),
+            font=self.fonts["page_icon"],
             text_color="gold"
         )
         self.surah_icon.pack(pady=(20, 10))
@@ -909,7 +823,7 @@ class MosqueApp:
         self.surah_main_title = ctk.CTkLabel(
             center_frame,
             text="سور الإخلاص والمعوذتين",
-            font=("Arial", 55, "bold"),
+            font=self.fonts["surah_title"],
             text_color="#FFD700"
         )
         self.surah_main_title.pack(pady=(0, 20))
@@ -919,7 +833,7 @@ class MosqueApp:
         self.surah_label = ctk.CTkLabel(
             center_frame,
             text="",
-            font=("Arial", 70),
+            font=self.fonts["page_text"],
             text_color="#E6E6FA",
             wraplength=1100,
             justify="center",
@@ -931,7 +845,7 @@ class MosqueApp:
         self.surah_footer = ctk.CTkLabel(
             center_frame,
             text="",
-            font=("Arial", 18),
+            font=self.fonts["page_footer"],
             text_color="#87CEEB"
         )
         self.surah_footer.pack(pady=15)
@@ -940,13 +854,13 @@ class MosqueApp:
         self.surah_back_button = ctk.CTkButton(
             self.surah_frame,
             text="العودة",
-            font=("Arial", 16, "bold"),
+            font=self.fonts["back_button"],
             fg_color="transparent",
             hover_color="#2A1F3E",
             text_color="white",
             border_width=2,
             border_color="gold",
-            command=self.hide_surah,
+            command=lambda: self.prayer_cycle.dismiss(),
             width=100,
             height=40
         )
@@ -955,271 +869,122 @@ class MosqueApp:
         # إخفاء السور في البداية
         self.surah_frame.place_forget()
 
-    def show_zekr(self, prayer_name):
-        """عرض الأذكار بعد الصلاة"""
-        if getattr(self, "skip_azkar", False):
-            print("⛔ تم تعطيل عرض الأذكار لأن الوقت الحالي بعيد عن أوقات الصلاة.")
-            return
-
-        if self.zekr_visible:
-            print("⛔ الأذكار معروضة بالفعل - منع التكرار")
-            return  # منع التكرار إذا الأذكار معروضة بالفعل
-            
-        print(f"🕌 عرض الأذكار بعد صلاة {prayer_name}")
-        self.zekr_visible = True
-        self.current_prayer_for_azkar = prayer_name
-        self.zekr_start_time = time.time()
-        
-        # تحديث عنوان الصلاة
-        prayer_title = f"أذكار بعد صلاة {DISPLAY_NAMES[prayer_name]}"
-        self.zekr_prayer_title.configure(text=prayer_title)
-        
-        # البدء من أول ذكر
-        self.current_zekr_index = 0
+    def show_zekr(self, prayer_name, index):
+        """عرض ذكر رقم index بعد الصلاة (التبديل تديره دورة الصلاة)"""
         azkar_list = self.azkar_by_prayer[prayer_name]
-        zekr_text = azkar_list[self.current_zekr_index]
-        
-        # تحديث نص الذكر
-        self.zekr_label.configure(text=zekr_text)
-        
-        # تحديث التذييل
-        self.zekr_footer.configure(text=f"الذكر {self.current_zekr_index + 1} من {len(azkar_list)} - التبديل التلقائي بعد 25 ثانية")
-        
-        # إظهار الإطار كامل الشاشة
-        self.zekr_frame.lift()
-        self.zekr_frame.place(x=0, y=0, relwidth=1, relheight=1)
-        
-        # بدء التبديل التلقائي كل 25 ثانية
-        self._start_zekr_rotation()
-    
-    def show_surah(self, prayer_name):
-        """عرض السور بعد الصلاة"""
-        if self.surah_visible:
-            print("⛔ السور معروضة بالفعل - منع التكرار")
-            return  # منع التكرار إذا السور معروضة بالفعل
-            
-        print(f"🕌 عرض السور بعد صلاة {prayer_name}")
-        self.surah_visible = True
-        self.current_prayer_for_azkar = prayer_name
-        self.surah_start_time = time.time()
-        
-        # البدء من أول سورة
-        self.current_surah_index = 0
-        surah = self.surahs[self.current_surah_index]
-        
-        # تحديد عدد التكرارات حسب الصلاة
-        repeat_count = 1
-        if prayer_name in ["Fajr", "Maghrib"]:
-            repeat_count = 3
-        
-        # تحديث نص السورة مع عدد التكرارات
-        surah_text = f"{surah['title']} ({repeat_count} مرات)\n\n{surah['text']}"
-        self.surah_label.configure(text=surah_text)
-        
-        # تحديث التذييل
-        self.surah_footer.configure(
-            text=f"السورة {self.current_surah_index + 1} من {len(self.surahs)} - التبديل التلقائي بعد 30 ثانية"
-        )
         
-        # إظهار الإطار كامل الشاشة
-        self.surah_frame.lift()
-        self.surah_frame.place(x=0, y=0, relwidth=1, relheight=1)
-        
-        # بدء التبديل التلقائي كل 25 ثانية
-        self._start_surah_rotation()
-
-    def _start_zekr_rotation(self):
-        """بدء تدوير الأذكار كل 20 ثانية"""
-        if not self.zekr_visible:
-            return
+        if index == 0:
+            print(f"🕌 عرض الأذكار بعد صلاة {prayer_name}")
+            # تحديث عنوان الصلاة
+            prayer_title = f"أذكار بعد صلاة {DISPLAY_NAMES[prayer_name]}"
+            self.zekr_prayer_title.configure(text=prayer_title)
             
-        # التبديل إلى الذكر التالي كل 25 ثانية
-        self.root.after(25000, self._next_zekr)
-    
-    def _next_zekr(self):
-        """الانتقال إلى الذكر التالي"""
-        if not self.zekr_visible or not self.current_prayer_for_azkar:
-            return
-            
-        azkar_list = self.azkar_by_prayer[self.current_prayer_for_azkar]
-        
-        # الانتقال إلى الذكر التالي
-        self.current_zekr_index = (self.current_zekr_index + 1) % len(azkar_list)
-        zekr_text = azkar_list[self.current_zekr_index]
+            # إظهار الإطار كامل الشاشة
+            self.zekr_frame.lift()
+            self.zekr_frame.place(x=0, y=0, relwidth=1, relheight=1)
         
         # تحديث نص الذكر
-        self.zekr_label.configure(text=zekr_text)
+        self.zekr_label.configure(text=azkar_list[index])
         
         # تحديث التذييل
-        self.zekr_footer.configure(text=f"الذكر {self.current_zekr_index + 1} من {len(azkar_list)} - التبديل التلقائي بعد 25 ثانية")
-        
-        # إذا كان هذا آخر ذكر، الانتقال إلى السور
-        if self.current_zekr_index == len(azkar_list) - 1:
-            # الانتقال إلى السور بعد 25 ثانية
-            self.root.after(25000, self._switch_to_surah)
-        else:
-            # الاستمرار في تدوير الأذكار
-            self._start_zekr_rotation()
+        self.zekr_footer.configure(
+            text=f"الذكر {index + 1} من {len(azkar_list)} - التبديل التلقائي بعد {AZKAR_ROTATION['zekr_seconds']} ثانية"
+        )
     
-    def _start_surah_rotation(self):
-        """بدء تدوير السور كل 30 ثانية"""
-        if not self.surah_visible:
-            return
+    def show_surah(self, prayer_name, index):
+        """عرض سورة رقم index بعد الصلاة"""
+        surah = self.surahs[index]
+        
+        if index == 0:
+            print(f"🕌 عرض السور بعد صلاة {prayer_name}")
             
-        # التبديل إلى السورة التالية كل 30 ثانية
-        self.root.after(30000, self._next_surah)
-    
-    def _next_surah(self):
-        """الانتقال إلى السورة التالية"""
-        if not self.surah_visible:
-            return
+            # تحديد عدد التكرارات حسب الصلاة
+            repeat_count = 1
+            if prayer_name in ["Fajr", "Maghrib"]:
+                repeat_count = 3
+            surah_text = f"{surah['title']} ({repeat_count} مرات)\n\n{surah['text']}"
             
-        # الانتقال إلى السورة التالية
-        self.current_surah_index = (self.current_surah_index + 1) % len(self.surahs)
+            # إظهار الإطار كامل الشاشة
+            self.surah_frame.lift()
+            self.surah_frame.place(x=0, y=0, relwidth=1, relheight=1)
+        else:
+            surah_text = f"{surah['title']}\n\n{surah['text']}"
         
-        surah = self.surahs[self.current_surah_index]
-        self.surah_label.configure(text=f"{surah['title']}\n\n{surah['text']}")
+        self.surah_label.configure(text=surah_text)
         
         # تحديث التذييل
-        self.surah_footer.configure(text=f"السورة {self.current_surah_index + 1} من {len(self.surahs)} - التبديل التلقائي بعد 30 ثانية")
-        
-        # إذا كان هذا آخر سورة، العودة للواجهة الرئيسية
-        if self.current_surah_index == len(self.surahs) - 1:
-            # العودة للواجهة الرئيسية بعد 25 ثانية
-            self.root.after(25000, self._switch_to_main)
-        else:
-            # الاستمرار في تدوير السور
-            self._start_surah_rotation()
-    
-    def _switch_to_surah(self):
-        """التبديل من الأذكار إلى السور"""
-        if self.zekr_visible:
-            self.hide_zekr()
-            if self.current_prayer_for_azkar:
-                self.show_surah(self.current_prayer_for_azkar)
-    
-    def _switch_to_main(self):
-        """التبديل من السور إلى الواجهة الرئيسية"""
-        if self.surah_visible:
-            self.hide_surah()
+        self.surah_footer.configure(
+            text=f"السورة {index + 1} من {len(self.surahs)} - التبديل التلقائي بعد {AZKAR_ROTATION['surah_seconds']} ثانية"
+        )
     
     def hide_zekr(self):
         """إخفاء الأذكار"""
-        self.zekr_visible = False
         self.zekr_frame.place_forget()
     
     def hide_surah(self):
         """إخفاء السور والعودة للصفحة الرئيسية"""
-        self.surah_visible = False
-        self.current_prayer_for_azkar = None
         self.surah_frame.place_forget()
     
     def _get_prayer_time_today(self, prayer_name):
         """الحصول على وقت الصلاة الحالي كـ datetime"""
-        today_times = self.prayer_times.get_today_times()
-        if not today_times or prayer_name not in today_times:
-            return None
-        
-        prayer_time_str = today_times[prayer_name]
-        if not prayer_time_str or prayer_time_str == "--:--":
-            return None
-        
-        try:
-            # تحويل الوقت من نص إلى datetime
-            now = datetime.datetime.now()
-            hour, minute = map(int, prayer_time_str.split(':'))
-            prayer_time = datetime.datetime(now.year, now.month, now.day, hour, minute)
-            return prayer_time
-        except ValueError:
-            return None
+        return self.prayer_times.get_day_snapshot().prayer_time(prayer_name)
     
     def update_display(self):
-        """تحديث العرض"""
-        now = datetime.datetime.now()
-        
-        # التاريخ الميلادي والهجري
-        # استخراج اليوم العربي من البيانات إذا كان متوفراً
-        today_times = self.prayer_times.get_today_times()
-        arabic_day = today_times.get('ArabicDay', '')
-        
-        if not arabic_day:
-            # إذا لم يكن اليوم العربي متوفراً في البيانات، نستخدم القائمة الافتراضية
-            weekday_ar = ["الاثنين","الثلاثاء","الأربعاء","الخميس","الجمعة","السبت","الأحد"]
-            arabic_day = weekday_ar[now.weekday()]
-        
-        # التاريخ الهجري
-        hijri_date = self.prayer_times.get_hijri_date()
-        
-        # تنسيق التاريخ الكامل
-        full_date = f"{arabic_day}،  {now.day}/{now.month}/{now.year}  -  {now.strftime('%H:%M:%S')}"
+        """تحديث كامل للعرض (يُستدعى عند الأحداث المهمة فقط)"""
+        now = get_clock().now()
+        self._update_day(now)
+
+        # الصلاة القادمة، أحداث اليوم التي حان وقتها، وضبط التحديث الكامل القادم
+        self.next_prayer = self.engine.update(now)
+        self._update_next_prayer_name()
         
-        self.date_label.configure(text=full_date)
+        # الساعة والعد التنازلي
+        self._update_clock(now)
+
+    def _paint_first_frame(self):
+        """أول إطار: أوقات اليوم والصلاة القادمة والساعة بدون تنفيذ أحداث اليوم"""
+        now = get_clock().now()
+        self._update_day(now)
+        self.next_prayer = self.prayer_times.find_next_prayer(now)
+        self._update_next_prayer_name()
+        self._update_clock(now)
+
+    def _update_day(self, now):
+        """بيانات اليوم: الثيم، أوقات الصلاة، الشروق والجمعة"""
+        # بيانات اليوم (تُبنى مرة واحدة لكل يوم)
+        snapshot = self.prayer_times.get_day_snapshot(now.date())
+        self.arabic_day = snapshot.arabic_day
         
         # تحديث الثيم
         self.theme_manager.update_theme()
         
         # تحديث أوقات الصلاة
-        if today_times:
-            for prayer, time_label in self.prayer_columns:
-                time_label.configure(text=today_times.get(prayer, "--:--"))
-        else:
-            for _, time_label in self.prayer_columns:
-                time_label.configure(text="--:--")
+        for prayer, time_label in self.prayer_columns:
+            self.ui.set_text(time_label, snapshot.time_texts[prayer])
 
         # تحديث وقت الشروق
-        sunrise_time = self.prayer_times.get_sunrise_time()
-        self.sunrise_time.configure(text=sunrise_time)
+        self.ui.set_text(self.sunrise_time, snapshot.time_texts['Sunrise'])
         
         # تحديث وقت صلاة الجمعة (نفس وقت الظهر في يوم الجمعة) - التصحيح هنا
-        jumaa_time = today_times.get('Dhuhr', '12:30')  # دائماً نستخدم وقت الظهر
-        self.jumaa_time.configure(text=jumaa_time)
+        jumaa_time = snapshot.time_texts['Dhuhr'] if snapshot.available else '12:30'  # دائماً نستخدم وقت الظهر
+        self.ui.set_text(self.jumaa_time, jumaa_time)
 
-        # تحديث الصلاة القادمة والتحقق من الأذكار
-        self.update_next_prayer()
-        
-        # التحقق من جدول الجمعة الخاص
-        self._check_jumaa_schedule()
-        
-        # التحقق من عرض الأذكار بعد الصلوات
-        self._check_azkar_display()
-
-        
-    def _check_azkar_display(self):
-        """التحقق من وقت عرض الأذكار بعد الصلوات"""
-        now = datetime.datetime.now()
-        
-        # ⭐⭐ التعديل المطلوب: إذا كان اليوم جمعة، لا نعرض الأذكار العادية للظهر ⭐⭐
-        if now.weekday() == 4:  # 4 = الجمعة
-            # تخطي التحقق لصلاة الظهر في يوم الجمعة فقط
-            prayers_to_check = ["Fajr", "Asr", "Maghrib", "Isha"]  # استثناء Dhuhr
+    def _update_next_prayer_name(self):
+        """تحديث اسم الصلاة القادمة"""
+        key, dt = self.next_prayer
+        if key and dt:
+            self.ui.set_text(self.next_name, self.prayer_times.get_prayer_display_name(key))
         else:
-            prayers_to_check = ["Fajr", "Dhuhr", "Asr", "Maghrib", "Isha"]
-        
-        if getattr(self, "zekr_visible", False):
-            return  # إذا الأذكار معروضة بالفعل
-
-        for prayer_name in prayers_to_check:  # ⬅️ استخدام القائمة المعدلة
-            prayer_time = self._get_prayer_time_today(prayer_name)
-            if not prayer_time:
-                continue
-            
-            # الوقت بعد الصلاة + IQAMA_DELAY + الوقت الإضافي للأذكار
-            azkar_start_time = prayer_time + datetime.timedelta(seconds=self.azkar_times[prayer_name])
-            azkar_end_time = azkar_start_time + datetime.timedelta(minutes=30)
-            
-            # إذا الوقت الحالي داخل فترة الأذكار ولم يتم عرضها بعد
-            if azkar_start_time <= now <= azkar_end_time and getattr(self, "last_prayer_completed", None) != prayer_name:
-                self.show_zekr(prayer_name)
-                self.last_prayer_completed = prayer_name
-                print(f"⏳ عرض أذكار بعد صلاة {prayer_name}")
-                break
+            self.ui.set_text(self.next_name, "--")
     
-    def update_next_prayer(self):
-        """تحديث الصلاة القادمة"""
-        key, dt = self.prayer_times.find_next_prayer()
+    def _update_clock(self, now):
+        """تحديث الساعة والعد التنازلي فقط (المسار الخفيف كل ثانية)"""
+        full_date = f"{self.arabic_day}،  {now.day}/{now.month}/{now.year}  -  {now.strftime('%H:%M:%S')}"
+        self.ui.set_text(self.date_label, full_date)
+        
+        key, dt = self.next_prayer
         if key and dt:
-            self.next_name.configure(text=self.prayer_times.get_prayer_display_name(key))
-            remaining = dt - datetime.datetime.now()
+            remaining = dt - now
             total = int(remaining.total_seconds())
             if total < 0: total = 0
             
@@ -1228,21 +993,49 @@ class MosqueApp:
             s = total % 60
             
             if h > 0:
-                self.countdown.configure(text=f"باقي : {h:02d}:{m:02d}:{s:02d}")
+                self.ui.set_text(self.countdown, f"باقي : {h:02d}:{m:02d}:{s:02d}")
             else:
-                self.countdown.configure(text=f"باقي : {m:02d}:{s:02d}")
-
-            if total <= 1 and self.last_adhan_played != key:
-                self.last_adhan_played = key
-                self.overlay_manager.show_adhan_overlay(key)
+                self.ui.set_text(self.countdown, f"باقي : {m:02d}:{s:02d}")
         else:
-            self.next_name.configure(text="--")
-            self.countdown.configure(text="")
+            self.ui.set_text(self.countdown, "")
+        
+        # عدادات دورة الصلاة (الإقامة، الخطبة، صلاة الجمعة)
+        self.prayer_cycle.on_tick(now)
+    
+    def tick(self, now):
+        """نبضة الساعة (بداية كل ثانية)"""
+        if self.event_scheduler.is_overdue(now):
+            # تأخر التحديث الكامل: تنفيذه الآن مع الأحداث التي فات وقتها
+            self.update_display()
+            return
+        self._update_clock(now)
     
-    def tick(self):
-        """دورة التحديث"""
+    def _print_stats(self):
+        """طباعة إحصائيات الأداء (F3)"""
+        print(self.clock_ticker.stats.summary())
+        print(self.ui.summary())
+        print(self.prayer_cycle.summary())
+        print(self.engine.summary())
+        print(self.fonts.summary())
+        print(self.audio_manager.summary())
+    
+    def _on_missed_ticks(self, now, missed):
+        """تم تخطي ثوانٍ: تنفيذ أي أحداث مرت خلالها فوراً"""
+        if not self.ready:
+            return
+        next_event = self.day_planner.next_event()
+        if next_event and next_event.at <= now:
+            self.update_display()
+
+    def _on_clock_jump(self, now, drift):
+        """قفزة في ساعة النظام أو استيقاظ من السكون: إعادة حساب أحداث اليوم فوراً"""
+        if not self.ready:
+            # أثناء البدء: الجدولة تبدأ بعد المراحل بالوقت الصحيح
+            self._paint_first_frame()
+            return
+        self.audio_manager.cancel_scheduled()
+        self.engine.recover(now)
         self.update_display()
-        self.root.after(REFRESH_INTERVAL_MS, self.tick)
 
 # التشغيل الرئيسي
 if __name__ == "__main__":
@@ -1,269 +1,277 @@
 import customtkinter as ctk
-import datetime
-from config import IQAMA_DELAY, DISPLAY_NAMES
+from config import IQAMA_DELAY, DISPLAY_NAMES, ICON_PULSE, MOSQUE_PNG
+from font_registry import FontRegistry
+from icon_sprites import load_icon_source, pulse_sizes, build_pulse_frames
+from ui_bindings import WidgetBinder
+
+# شاشات الـ overlay (تُبنى مرة واحدة وتُرفع عند الحاجة)
+SCREEN_ADHAN = "adhan"
+SCREEN_IQAMA = "iqama"
+SCREEN_JUMAA_IQAMA = "jumaa_iqama"
+
+OVERLAY_BG = "#0A1F3A"
 
 
 class OverlayManager:
-    def __init__(self, root, font_scales, audio_manager):
+    def __init__(self, root, font_scales, audio_manager, fonts=None):
         self.root = root
         self.font_scales = font_scales
         self.audio_manager = audio_manager
-        
+        self.fonts = fonts or FontRegistry(font_scales)
+        self.binder = WidgetBinder()
+
         # إنشاء overlay
-        self.overlay = ctk.CTkFrame(root, fg_color="#0A1F3A")
+        self.overlay = ctk.CTkFrame(root, fg_color=OVERLAY_BG)
         self.overlay.place(relwidth=1, relheight=1)
-        
+
         self.animation_running = False
-        self.current_prayer_for_iqama = None
-        self.iqama_countdown_time = 0
-        
-        # متغيرات لتتبع العناصر الحالية
-        self.current_iqama_icon = None
-        self.current_overlay_label = None
-        self.current_overlay_countdown = None
-        self.current_iqama_text = None
-        
-        self._create_overlay_widgets()
+        self._animation_id = None
+        self._animation_frame = 0
+        self.pulse_frames = []
+        self._pulse_future = None
+        self.current_screen = None
+
+        self.screens = {}
+        self._create_adhan_screen()
+        self._create_iqama_screen()
+        self._create_jumaa_iqama_screen()
         self.overlay.lower()
-    
-    def _create_overlay_widgets(self):
-        """إنشاء عناصر الـ overlay"""
-        # تنظيف أي عناصر موجودة مسبقاً
-        self._cleanup_overlay_widgets()
-        
-        overlay_container = ctk.CTkFrame(self.overlay, fg_color="transparent")
-        overlay_container.pack(expand=True)
-        
-        # أيقونة متحركة للإقامة
-        self.current_iqama_icon = ctk.CTkLabel(
-            overlay_container,
-            text="",
-            font=("Arial", self.font_scales['overlay_icon_font'], "bold"),
-            text_color="gold" 
-        )
-        self.current_iqama_icon.pack(pady=20)
-        
-        self.current_overlay_label = ctk.CTkLabel(
-            overlay_container,
-            text="",
-            font=("Arial", self.font_scales['overlay_text_font'], "bold"),
-            text_color="gold"  
-        )
-        self.current_overlay_label.pack(pady=10)
-        
-        self.current_overlay_countdown = ctk.CTkLabel(
-            overlay_container,
-            text="",
-            font=("Arial", self.font_scales['overlay_countdown_font'], "bold"),
-            text_color="#00FFFF"
-        )
-        self.current_overlay_countdown.pack(pady=10)
-    
-    def _cleanup_overlay_widgets(self):
-        """تنظيف جميع عناصر الـ overlay"""
-        self.stop_animation()
-        
-        # تنظيف جميع العناصر الموجودة في الـ overlay
-        for widget in self.overlay.winfo_children():
-            widget.destroy()
-        
-        # إعادة تعيين المؤشرات
-        self.current_iqama_icon = None
-        self.current_overlay_label = None
-        self.current_overlay_countdown = None
-        self.current_iqama_text = None
-    
-    def show_adhan_overlay(self, prayer_name):
-        """عرض شاشة الأذان"""
-        print(f"بدأ الأذان لصلاة {prayer_name}")
-        
-        # تنظيف العناصر القديمة أولاً
-        self._cleanup_overlay_widgets()
-        self._create_overlay_widgets()
-        
-        # تحديث النصوص
-        self.current_overlay_label.configure(text=f"🕌 أذان {DISPLAY_NAMES[prayer_name]} ")
-        if self.current_iqama_icon:
-            self.current_iqama_icon.configure(text="", font=("Arial", self.font_scales['overlay_icon_font'], "bold"))
-        if self.current_overlay_countdown:
-            self.current_overlay_countdown.configure(text="")
-        
-        self.overlay.lift()
-        
-        # تشغيل الأذان
-        self.audio_manager.play_adhan()
-        
-        # حفظ الصلاة الحالية للإقامة
-        self.current_prayer_for_iqama = prayer_name
-        
-        # حساب وقت الإقامة - استخدم وقت الجمعة الخاص إذا كان اليوم جمعة
-        now = datetime.datetime.now()
-        is_jumaa = (now.weekday() == 4 and prayer_name == "Dhuhr")
-        
-        if is_jumaa:
-            iqama_delay_minutes = 1  # 1 دقيقة فقط للجمعة
-            print(f"🕌 اليوم جمعة - سيتم الإقامة بعد {iqama_delay_minutes} دقيقة")
-            
-            # للجمعة، لا نبدأ العد التنازلي للإقامة - سيتم التعامل معها في نظام الجمعة
-            return  # إرجاع مبكر للجمعة
-        else:
-            iqama_delay_minutes = IQAMA_DELAY.get(prayer_name, 1)
-            print(f"سيتم الإقامة بعد {iqama_delay_minutes} دقائق")
-        
-        # بدء شاشة الإقامة بعد دقيقة (لغير الجمعة فقط)
-        self.root.after(60 * 1000, lambda: self._start_iqama_countdown(prayer_name, iqama_delay_minutes, is_jumaa))
 
-    def _start_iqama_countdown(self, prayer_name, total_minutes, is_jumaa=False):
-        """بدء العد التنازلي للإقامة"""
-        print(f"بدأ العد التنازلي للإقامة: {total_minutes} دقائق")
+        # استئناف التحريك عند ظهور النافذة من جديد (بعد التصغير)
+        self.root.bind("<Map>", self._on_map, add="+")
+
+    def _create_screen(self, name):
+        """إطار شاشة يغطي الـ overlay بالكامل"""
+        screen = ctk.CTkFrame(self.overlay, fg_color=OVERLAY_BG)
+        screen.place(relwidth=1, relheight=1)
+        self.screens[name] = screen
+        return screen
+
+    def _create_adhan_screen(self):
+        """شاشة الأذان: اسم الصلاة فقط"""
+        screen = self._create_screen(SCREEN_ADHAN)
+        container = ctk.CTkFrame(screen, fg_color="transparent")
+        container.pack(expand=True)
 
-        # تنظيف العناصر القديمة أولاً
-        self._cleanup_overlay_widgets()
+        self.adhan_label = ctk.CTkLabel(
+            container,
+            text="",
+            font=self.fonts["overlay_text"],
+            text_color="gold"
+        )
+        self.adhan_label.pack(pady=10)
 
-        self.current_prayer_for_iqama = prayer_name
-        self.iqama_countdown_time = total_minutes * 60
+    def _create_iqama_screen(self):
+        """شاشة العد التنازلي للإقامة: أيقونة متحركة، اسم الصلاة، والعداد"""
+        screen = self._create_screen(SCREEN_IQAMA)
 
-        # الأيقونة المتحركة
-        self.current_iqama_icon = ctk.CTkLabel(
-            self.overlay,
+        # الأيقونة المتحركة (الصور تُرسم عند أول عد تنازلي)
+        self.iqama_icon = ctk.CTkLabel(
+            screen,
             text="🕌",
-            font=("Arial", self.font_scales['overlay_icon_font'], "bold"),
+            font=self.fonts["overlay_icon"],
             text_color="gold"
         )
-        self.current_iqama_icon.place(relx=0.5, rely=0.35, anchor="center")
+        self.iqama_icon.place(relx=0.5, rely=0.35, anchor="center")
 
         # Frame للنص والعداد
-        text_frame = ctk.CTkFrame(self.overlay, fg_color="#0A1F3A")
+        text_frame = ctk.CTkFrame(screen, fg_color=OVERLAY_BG)
         text_frame.place(relx=0.5, rely=0.7, anchor="center")
 
-        # النص الثابت - إضافة مؤشر الجمعة إذا كان يوم جمعة
-        prayer_text = f"إقامة صلاة {DISPLAY_NAMES[prayer_name]}"
-        if is_jumaa:
-            prayer_text += " (الجمعة)"
-        
-        self.current_iqama_text = ctk.CTkLabel(
+        self.iqama_text = ctk.CTkLabel(
             text_frame,
-            text=prayer_text,
-            font=("Arial", self.font_scales['overlay_text_font'], "bold"),
+            text="",
+            font=self.fonts["overlay_text"],
             text_color="white"
         )
-        self.current_iqama_text.pack(pady=(0, 15))
+        self.iqama_text.pack(pady=(0, 15))
 
-        # العد التنازلي
-        self.current_overlay_countdown = ctk.CTkLabel(
+        self.iqama_countdown = ctk.CTkLabel(
             text_frame,
             text="",
-            font=("Arial", self.font_scales['overlay_countdown_font'], "bold"),
+            font=self.fonts["overlay_countdown"],
             text_color="#00FFFF"
         )
-        self.current_overlay_countdown.pack()
+        self.iqama_countdown.pack()
 
-        # رفع الـ overlay
+    def _create_jumaa_iqama_screen(self):
+        """شاشة إقامة الجمعة: أيقونة، نص الإقامة، ورسالة إطفاء الهواتف"""
+        screen = self._create_screen(SCREEN_JUMAA_IQAMA)
+        container = ctk.CTkFrame(screen, fg_color="transparent")
+        container.pack(expand=True)
+
+        ctk.CTkLabel(
+            container,
+            text="🕌",
+            font=self.fonts["overlay_icon"],
+            text_color="gold"
+        ).pack(pady=20)
+
+        ctk.CTkLabel(
+            container,
+            text="🕌 إقامة صلاة الجمعة",
+            font=self.fonts["overlay_text"],
+            text_color="gold"
+        ).pack(pady=10)
+
+        ctk.CTkLabel(
+            container,
+            text="يرجى إطفاء الهواتف",
+            font=self.fonts["overlay_countdown"],
+            text_color="#00FFFF"
+        ).pack(pady=10)
+
+    def _show_screen(self, name):
+        """رفع شاشة فوق الأخرى ورفع الـ overlay فوق الواجهة"""
+        self.stop_animation()
+        self.screens[name].tkraise()
+        self.current_screen = name
         self.overlay.lift()
 
-        # بدء التحريك والعد التنازلي
+    def show_adhan_overlay(self, prayer_name, test=False):
+        """عرض شاشة الأذان (مراحل الإقامة تديرها دورة الصلاة)"""
+        print(f"بدأ الأذان لصلاة {prayer_name}")
+
+        self.binder.set_text(self.adhan_label, f"🕌 أذان {DISPLAY_NAMES[prayer_name]} ")
+        self._show_screen(SCREEN_ADHAN)
+
+        # تشغيل الأذان (الاختبار بأولوية أقل من الأذان الحقيقي)
+        self.audio_manager.play_adhan(test=test)
+
+    def show_iqama_countdown(self, prayer_name, is_jumaa=False):
+        """عرض شاشة العد التنازلي للإقامة"""
+        print(f"بدأ العد التنازلي للإقامة: {IQAMA_DELAY.get(prayer_name, 1)} دقائق")
+
+        # النص الثابت - إضافة مؤشر الجمعة إذا كان يوم جمعة
+        prayer_text = f"إقامة صلاة {DISPLAY_NAMES[prayer_name]}"
+        if is_jumaa:
+            prayer_text += " (الجمعة)"
+        self.binder.set_text(self.iqama_text, prayer_text)
+        self.binder.set_text(self.iqama_countdown, "")
+        self._show_screen(SCREEN_IQAMA)
+
+        # بدء التحريك
+        self._ensure_pulse_frames()
         self.animation_running = True
+        self._animation_frame = 0
         self._animate_iqama_icon()
-        self._update_iqama_countdown()
-    
+
     def play_iqama_directly(self, prayer_name):
-        """تشغيل الإقامة مباشرة (لنظام الجمعة)"""
+        """عرض رسالة الإقامة مباشرة (لنظام الجمعة)"""
         print(f"🕌 تشغيل الإقامة مباشرة لصلاة {prayer_name}")
-        
-        # تنظيف أي overlay موجود
-        self._cleanup_overlay_widgets()
-        
+
         # تشغيل صوت الإقامة
         # self.audio_manager.play_iqama()
-        
-        # عرض رسالة الإقامة
-        self._create_overlay_widgets()
-        self.current_overlay_label.configure(text=f"🕌 إقامة صلاة الجمعة")
-        
-        # أيقونة المسجد
-        if self.current_iqama_icon:
-            self.current_iqama_icon.configure(text="🕌", font=("Arial", self.font_scales['overlay_icon_font'], "bold"))
-        
-        # نص توجيهي
-        if self.current_overlay_countdown:
-            self.current_overlay_countdown.configure(text="يرجى إطفاء الهواتف")
-        
-        self.overlay.lift()
-        
-        # إخفاء الـ overlay بعد 15 ثانية
-        self.root.after(15000, self.hide_overlay)
-        
-    def _animate_iqama_icon(self, size=None, growing=True):
-        """تحريك أيقونة الإقامة"""
-        if not self.animation_running:
+
+        self._show_screen(SCREEN_JUMAA_IQAMA)
+
+    def _pulse_plan(self):
+        """أحجام إطارات النبض وحجم الأيقونة الأصلية بالبيكسل (من خيط الواجهة)"""
+        # أحجام CTkFont بالبيكسل، و CTkImage يطبق نفس تكبير الواجهة عليها وعلى الصور
+        base = self.fonts.size("overlay_icon")
+        sizes = pulse_sizes(base, ICON_PULSE["grow_px"], ICON_PULSE["shrink_px"],
+                            ICON_PULSE["fps"], ICON_PULSE["period_s"])
+        return sizes, base + ICON_PULSE["grow_px"]
+
+    @staticmethod
+    def _render_pulse_frames(sizes, source_px):
+        """رسم صور Pillow لكل حجم (بدون Tk، يمكن تنفيذه في خيط خلفي)"""
+        source = load_icon_source("🕌", source_px, MOSQUE_PNG)
+        return sizes, build_pulse_frames(source, sizes)
+
+    def preload_pulse_frames(self, executor):
+        """رسم صور النبض مسبقاً في خيط خلفي (تُحول إلى CTkImage عند أول عد تنازلي)"""
+        if not self.pulse_frames and self._pulse_future is None:
+            self._pulse_future = executor.submit(self._render_pulse_frames, *self._pulse_plan())
+
+    def _ensure_pulse_frames(self):
+        """صور النبض بحجم overlay_icon_font الحالي (مرسومة مسبقاً أو تُرسم الآن)"""
+        if self.pulse_frames:
             return
+        if self._pulse_future is not None:
+            sizes, frames = self._pulse_future.result()
+            self._pulse_future = None
+        else:
+            sizes, frames = self._render_pulse_frames(*self._pulse_plan())
+        images = {size: ctk.CTkImage(light_image=image, size=image.size) for size, image in frames.items()}
+        self.pulse_frames = [images[size] for size in sizes]
+        self.iqama_icon.configure(text="", image=self.pulse_frames[0])
+        print(f"🕌 صور نبض الأيقونة: {len(images)} حجم لـ {len(sizes)} إطار")
 
-        # التحقق من وجود العنصر قبل التعديل
-        if not self.current_iqama_icon or not self.current_iqama_icon.winfo_exists():
-            self.animation_running = False
+    def invalidate_pulse_frames(self):
+        """بعد تغيير حجم الخطوط: إعادة رسم صور النبض (فوراً إذا كان العد التنازلي معروضاً)"""
+        was_running = self.animation_running
+        self.stop_animation()
+        self.pulse_frames = []
+        self._pulse_future = None
+        if was_running:
+            self._ensure_pulse_frames()
+            self.animation_running = True
+            self._animate_iqama_icon()
+
+    def _animate_iqama_icon(self):
+        """تحريك أيقونة الإقامة بتبديل الصور المرسومة مسبقاً"""
+        self._animation_id = None
+        if not self.animation_running:
+            return
+        if not self.iqama_icon.winfo_viewable():
+            # النافذة مصغرة أو الشاشة غير ظاهرة: إيقاف مؤقت حتى <Map>
             return
 
-        if size is None:
-            size = self.font_scales['overlay_icon_font']
+        frame = self.pulse_frames[self._animation_frame % len(self.pulse_frames)]
+        self.binder.configure(self.iqama_icon, image=frame)
+        self._animation_frame += 1
+        self._animation_id = self.root.after(max(1, int(1000 / ICON_PULSE["fps"])), self._animate_iqama_icon)
 
-        if growing:
-            size += 8
-            if size >= self.font_scales['overlay_icon_font'] + 30:
-                growing = False
-        else:
-            size -= 8
-            if size <= self.font_scales['overlay_icon_font'] - 20:
-                growing = True
-
-        self.current_iqama_icon.configure(font=("Arial", size, "bold"))
-
-        if self.overlay.winfo_ismapped() and self.animation_running:
-            self.root.after(200, lambda: self._animate_iqama_icon(size, growing))
-    
-    def _update_iqama_countdown(self):
-        """تحديث العد التنازلي للإقامة"""
-        # التحقق من وجود العناصر قبل التحديث
-        if not self.current_overlay_countdown or not self.current_overlay_countdown.winfo_exists():
+    def _on_map(self, event):
+        if self.animation_running and self._animation_id is None:
+            self._animate_iqama_icon()
+
+    def update_iqama_countdown(self, remaining_seconds):
+        """تحديث العد التنازلي للإقامة (الثواني المتبقية من دورة الصلاة)"""
+        if self.current_screen != SCREEN_IQAMA:
             return
 
-        if self.iqama_countdown_time > 0:
-            minutes = self.iqama_countdown_time // 60
-            seconds = self.iqama_countdown_time % 60
-            
-            self.current_overlay_countdown.configure(text=f"{minutes:02d}:{seconds:02d}")
-            self.iqama_countdown_time -= 1
-            self.root.after(1000, self._update_iqama_countdown)
-        else:
-            self._play_iqama_sound()
-    
-    def _play_iqama_sound(self):
-        """تشغيل صوت الإقامة"""
-        if self.current_prayer_for_iqama:
-            print(f"تشغيل صوت الإقامة لصلاة {self.current_prayer_for_iqama}")
-            
-            self.stop_animation()
-            # self.audio_manager.play_iqama()
-            
-            # التحقق من وجود العنصر قبل التحديث
-            if self.current_overlay_countdown and self.current_overlay_countdown.winfo_exists():
-                self.current_overlay_countdown.configure(text="إطفئ الهاتف")
-            
-            self.root.after(15 * 1000, self.hide_overlay)
-            self.current_prayer_for_iqama = None
-    
+        minutes = remaining_seconds // 60
+        seconds = remaining_seconds % 60
+        self.binder.set_text(self.iqama_countdown, f"{minutes:02d}:{seconds:02d}")
+
+    def show_iqama_message(self, prayer_name):
+        """وقت الإقامة: إيقاف التحريك وعرض رسالة إطفاء الهاتف"""
+        print(f"تشغيل صوت الإقامة لصلاة {prayer_name}")
+
+        self.stop_animation()
+        # self.audio_manager.play_iqama()
+
+        if self.current_screen == SCREEN_IQAMA:
+            self.binder.set_text(self.iqama_countdown, "إطفئ الهاتف")
+
     def stop_animation(self):
-        """إيقاف تحريك الأيقونة"""
+        """إيقاف تحريك الأيقونة وإرجاعها لحجمها الأصلي"""
         self.animation_running = False
-    
+        if self._animation_id is not None:
+            self.root.after_cancel(self._animation_id)
+            self._animation_id = None
+        if self.pulse_frames:
+            self.binder.configure(self.iqama_icon, image=self.pulse_frames[0])
+
+    def widget_count(self):
+        """عدد عناصر الـ overlay (للتحقق من عدم تراكم العناصر)"""
+        pending = [self.overlay]
+        count = 0
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+
     def hide_overlay(self):
-        """إخفاء الـ overlay"""
-        self._cleanup_overlay_widgets()
-        self.overlay.lower()
+        """إخفاء الـ overlay (الشاشات تبقى جاهزة للمرة القادمة)"""
         self.stop_animation()
+        self.overlay.lower()
+        self.current_screen = None
 
     def stop_iqama_countdown(self):
         """إيقاف العد التنازلي للإقامة"""
-        self.stop_animation()
-        self._cleanup_overlay_widgets()
-        self.overlay.lower()
-        print("⏹️ إيقاف العد التنازلي للإقامة")
\ No newline at end of file
+        self.hide_overlay()
+        print("⏹️ إيقاف العد التنازلي للإقامة")
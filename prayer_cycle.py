@@ -0,0 +1,344 @@
+# prayer_cycle.py
+import datetime
+import math
+from collections import deque, namedtuple
+
+from config import (IQAMA_DELAY, JUMA_SCHEDULE, AZKAR_ROTATION, AZKAR_TIMES, AZKAR_WINDOW_MINUTES,
+                    PRAYER_CYCLE_TIMING, MISSED_EVENT_POLICY, MISSED_EVENT_GRACE_S)
+from clock import get_clock
+
+# حالات دورة الصلاة
+STATE_IDLE = "idle"
+STATE_ADHAN = "adhan"
+STATE_IQAMA_COUNTDOWN = "iqama_countdown"
+STATE_IN_PRAYER = "in_prayer"
+STATE_AZKAR = "azkar"
+STATE_SURAH = "surah"
+STATE_JUMAA_KHOTBA = "jumaa_khotba"
+STATE_JUMAA_PRAYER = "jumaa_prayer"
+
+# سياسات المراحل الفائتة (انظر MISSED_EVENT_POLICY في config)
+POLICY_REPLAY = "replay"
+POLICY_SHORTEN = "shorten"
+POLICY_SKIP = "skip"
+
+# انتقال مسجل: الوقت، الحالة السابقة، الحالة الجديدة، الصلاة، السبب، والتأخر عن الوقت المجدول (ms)
+Transition = namedtuple("Transition", ["at", "source", "target", "prayer", "reason", "late_ms"])
+
+
+class PrayerCycle:
+    """آلة حالات واحدة لدورة الصلاة (الأذان، الإقامة، الأذكار، الجمعة) بمؤقت واحد قابل للإلغاء
+
+    host: كائن يوفر after و after_cancel (نافذة Tk)
+    view: كائن العرض ويوفر دوال show_*/update_*/hide_* (الواجهة الرئيسية)
+
+    كل مرحلة تبدأ من وقتها المجدول (start) وليس من وقت تنفيذها، لذلك المراحل
+    التي فاتت (سكون الجهاز، قفزة في الساعة) تُعالج حسب MISSED_EVENT_POLICY.
+    """
+
+    def __init__(self, host, view, zekr_counts=None, surah_count=3):
+        self.host = host
+        self.view = view
+        self.zekr_counts = zekr_counts or {}
+        self.surah_count = surah_count
+
+        self.state = STATE_IDLE
+        self.prayer = None
+        self.index = 0            # رقم الذكر أو السورة المعروضة
+        self.deadline = None      # نهاية العد التنازلي الحالي (الإقامة، الخطبة، صلاة الجمعة)
+        self.started_at = None    # وقت بداية الدورة (الأذان)
+        self.is_test = False
+
+        self._after_id = None
+        self._timer_due = None
+        self._timer_callback = None
+        self._timer_category = None
+
+        self.history = deque(maxlen=200)
+        self.max_late_ms = 0.0
+
+    def now(self):
+        return get_clock().now()
+
+    # ---------- المؤقت الوحيد ----------
+
+    def _arm(self, seconds, callback, start, category=None):
+        """إلغاء المؤقت السابق وضبط مؤقت جديد على start + seconds
+
+        category: نوع المرحلة التالية ("iqama" أو "azkar") لتطبيق سياسة التأخر عليها
+        """
+        self._cancel_timer()
+        self._timer_due = start + datetime.timedelta(seconds=max(0.0, seconds))
+        self._timer_callback = callback
+        self._timer_category = category
+        self._schedule_after(self.now())
+
+    def _schedule_after(self, now):
+        delay_ms = math.ceil(max(0.0, (self._timer_due - now).total_seconds()) * 1000)
+        self._after_id = self.host.after(delay_ms, self._fire)
+
+    def _cancel_timer(self):
+        if self._after_id is not None:
+            self.host.after_cancel(self._after_id)
+        self._after_id = None
+        self._timer_due = None
+        self._timer_callback = None
+        self._timer_category = None
+
+    def _fire(self):
+        self._after_id = None
+        self._run_overdue(self.now())
+
+    def _run_overdue(self, now):
+        """تنفيذ كل المراحل التي حان وقتها (أكثر من مرحلة بعد قفزة في الساعة)"""
+        while self._timer_callback is not None and self._timer_due <= now:
+            callback, due, category = self._timer_callback, self._timer_due, self._timer_category
+            self._cancel_timer()
+
+            late_ms = (now - due).total_seconds() * 1000
+            self.max_late_ms = max(self.max_late_ms, late_ms)
+            start = due
+            if category and late_ms > MISSED_EVENT_GRACE_S * 1000:
+                policy = MISSED_EVENT_POLICY.get(category, POLICY_SHORTEN)
+                print(f"⏰ مرحلة متأخرة ({category}) بـ {late_ms / 1000:.0f} ثانية: {policy}")
+                if policy == POLICY_SKIP:
+                    self._to_idle(now, late_ms, "تخطي مرحلة فائتة")
+                    return
+                if policy == POLICY_REPLAY:
+                    start = now
+            callback(start, late_ms)
+
+        if self._timer_callback is not None and self._after_id is None:
+            # انطلق المؤقت مبكراً: إعادة ضبطه على المتبقي
+            self._schedule_after(now)
+
+    def resync(self, now=None):
+        """إعادة ضبط المؤقت على ساعة الحائط بعد قفزة في الساعة أو سكون الجهاز"""
+        if self._timer_callback is None:
+            return
+        now = now or self.now()
+        if self._after_id is not None:
+            self.host.after_cancel(self._after_id)
+            self._after_id = None
+        self._run_overdue(now)
+
+    @property
+    def timer_due(self):
+        """وقت المؤقت القادم (أو None)"""
+        return self._timer_due
+
+    # ---------- الانتقالات ----------
+
+    def _transition(self, target, prayer, reason, late_ms=0.0, keep_view=False):
+        """إخفاء ما تعرضه الحالة الحالية (إلا إذا كانت الحالة الجديدة تكملها) والانتقال"""
+        self._cancel_timer()
+        if not keep_view:
+            self._clear_view()
+
+        source = self.state
+        self.history.append(Transition(self.now(), source, target, prayer, reason, late_ms))
+        print(f"🔁 {source} → {target} ({prayer or '-'}): {reason}")
+
+        self.state = target
+        self.prayer = prayer
+        self.index = 0
+        self.deadline = None
+        if target == STATE_IDLE:
+            self.started_at = None
+            self.is_test = False
+
+    def _clear_view(self):
+        """إخفاء عناصر الحالة الحالية"""
+        if self.state in (STATE_ADHAN, STATE_IQAMA_COUNTDOWN, STATE_IN_PRAYER):
+            self.view.hide_overlay()
+        elif self.state == STATE_AZKAR:
+            self.view.hide_zekr()
+        elif self.state == STATE_SURAH:
+            self.view.hide_surah()
+        elif self.state == STATE_JUMAA_KHOTBA:
+            self.view.hide_khotba()
+        elif self.state == STATE_JUMAA_PRAYER:
+            self.view.hide_overlay()
+            self.view.hide_jumaa_prayer()
+
+    def _remaining(self, now=None):
+        """الثواني المتبقية حتى نهاية العد التنازلي الحالي"""
+        if self.deadline is None:
+            return 0
+        now = now or self.now()
+        return int(max(0.0, (self.deadline - now).total_seconds()) + 0.5)
+
+    def _to_idle(self, start, late_ms=0.0, reason="نهاية الدورة"):
+        self._transition(STATE_IDLE, None, reason, late_ms)
+
+    # الأذان ثم الإقامة
+
+    def _enter_adhan(self, prayer, start, jumaa, reason):
+        self._transition(STATE_ADHAN, prayer, reason)
+        self.started_at = start
+        adhan_seconds = PRAYER_CYCLE_TIMING["adhan_seconds"]
+        if self.now() < start + datetime.timedelta(seconds=adhan_seconds):
+            self.view.show_adhan(prayer)
+        next_step = self._enter_khotba if jumaa else self._enter_iqama_countdown
+        self._arm(adhan_seconds, next_step, start, "iqama")
+
+    def _enter_iqama_countdown(self, start, late_ms=0.0):
+        prayer = self.prayer
+        self._transition(STATE_IQAMA_COUNTDOWN, prayer, "بداية العد التنازلي للإقامة", late_ms,
+                         keep_view=True)
+        self.deadline = start + datetime.timedelta(minutes=IQAMA_DELAY.get(prayer, 1))
+        self.view.show_iqama_countdown(prayer)
+        self.view.update_iqama_countdown(self._remaining())
+        self._arm((self.deadline - start).total_seconds(), self._enter_in_prayer, start, "iqama")
+
+    def _enter_in_prayer(self, start, late_ms=0.0):
+        prayer = self.prayer
+        self._transition(STATE_IN_PRAYER, prayer, "وقت الإقامة", late_ms, keep_view=True)
+        self.view.show_iqama_message(prayer)
+        self._arm(PRAYER_CYCLE_TIMING["iqama_message_seconds"], self._end_iqama_message, start)
+
+    def _end_iqama_message(self, start, late_ms=0.0):
+        """إخفاء رسالة الإقامة والبقاء في حالة الصلاة حتى بداية الأذكار"""
+        self.view.hide_overlay()
+        if self.is_test or self.prayer not in AZKAR_TIMES:
+            self._to_idle(start, late_ms, "نهاية اختبار الأذان")
+            return
+
+        # حد أقصى: إذا فاتت نافذة الأذكار نعود للحالة العادية
+        started_at = self.started_at or start
+        window_end = started_at + datetime.timedelta(
+            seconds=AZKAR_TIMES[self.prayer] + AZKAR_WINDOW_MINUTES * 60)
+        self._arm((window_end - start).total_seconds(),
+                  lambda fired, late: self._to_idle(fired, late, "انتهت نافذة الأذكار"), start)
+
+    # الأذكار ثم السور
+
+    def _enter_azkar(self, prayer, start, reason):
+        self._transition(STATE_AZKAR, prayer, reason)
+        if self.zekr_counts.get(prayer, 0) == 0:
+            self._enter_surah(start)
+            return
+        self.view.show_zekr(prayer, 0)
+        self._arm(AZKAR_ROTATION["zekr_seconds"], self._next_zekr, start, "azkar")
+
+    def _next_zekr(self, start, late_ms=0.0):
+        self.index += 1
+        if self.index >= self.zekr_counts.get(self.prayer, 0):
+            self._enter_surah(start, late_ms)
+            return
+        self.view.show_zekr(self.prayer, self.index)
+        self._arm(AZKAR_ROTATION["zekr_seconds"], self._next_zekr, start, "azkar")
+
+    def _enter_surah(self, start, late_ms=0.0):
+        self._transition(STATE_SURAH, self.prayer, "الانتقال إلى السور", late_ms)
+        self._show_surah(start)
+
+    def _show_surah(self, start):
+        if self.index >= self.surah_count:
+            self._to_idle(start)
+            return
+        self.view.show_surah(self.prayer, self.index)
+        last = self.index == self.surah_count - 1
+        seconds = AZKAR_ROTATION["last_surah_seconds"] if last else AZKAR_ROTATION["surah_seconds"]
+        self._arm(seconds, self._next_surah, start, None if last else "azkar")
+
+    def _next_surah(self, start, late_ms=0.0):
+        self.index += 1
+        if self.index >= self.surah_count:
+            self._to_idle(start, late_ms, "نهاية السور")
+            return
+        self._show_surah(start)
+
+    # الجمعة: الخطبة ثم الإقامة وصفحة الصلاة
+
+    def _enter_khotba(self, start, late_ms=0.0):
+        self._transition(STATE_JUMAA_KHOTBA, "Dhuhr", "بداية الخطبة", late_ms)
+        self.deadline = start + datetime.timedelta(minutes=JUMA_SCHEDULE["khotba_duration"])
+        self.view.show_khotba()
+        self.view.update_khotba(self._remaining())
+        self._arm((self.deadline - start).total_seconds(), self._enter_jumaa_prayer, start, "iqama")
+
+    def _enter_jumaa_prayer(self, start, late_ms=0.0):
+        self._transition(STATE_JUMAA_PRAYER, "Dhuhr", "إقامة صلاة الجمعة", late_ms)
+        self.deadline = start + datetime.timedelta(seconds=JUMA_SCHEDULE["prayer_duration"])
+        self.view.show_jumaa_prayer()
+        self.view.update_jumaa_prayer(self._remaining())
+        # رسالة الإقامة فوق صفحة الصلاة
+        self.view.show_jumaa_iqama("Dhuhr")
+        seconds = min(PRAYER_CYCLE_TIMING["iqama_message_seconds"], JUMA_SCHEDULE["prayer_duration"])
+        self._arm(seconds, self._end_jumaa_iqama, start)
+
+    def _end_jumaa_iqama(self, start, late_ms=0.0):
+        self.view.hide_overlay()
+        self._arm((self.deadline - start).total_seconds(),
+                  lambda fired, late: self._to_idle(fired, late, "نهاية صلاة الجمعة"), start)
+
+    # ---------- أحداث خارجية ----------
+    # at: الوقت المجدول للحدث إذا كان متأخراً (الالتحاق بالدورة حيث يجب أن تكون الآن)
+
+    def on_adhan(self, prayer, jumaa=False, at=None):
+        """وقت الأذان: يلغي أي حالة سابقة"""
+        now = self.now()
+        self.is_test = False
+        self._enter_adhan(prayer, at or now, jumaa, "وقت الأذان")
+        self._run_overdue(now)
+
+    def test_adhan(self, prayer):
+        """اختبار الأذان (F1): فقط عندما لا توجد دورة صلاة جارية"""
+        if self.state != STATE_IDLE:
+            print(f"⛔ تجاهل اختبار الأذان: الحالة الحالية {self.state}")
+            return False
+        # قبل الدخول: العرض يشغل صوت الاختبار بأولوية أقل من الأذان
+        self.is_test = True
+        self._enter_adhan(prayer, self.now(), False, "اختبار الأذان")
+        return True
+
+    def on_khotba(self, at=None):
+        """بداية الخطبة من جدول الأحداث (إذا لم يبدأها مؤقت الأذان)"""
+        if self.state in (STATE_JUMAA_KHOTBA, STATE_JUMAA_PRAYER):
+            return
+        now = self.now()
+        self._enter_khotba(at or now)
+        self._run_overdue(now)
+
+    def on_jumaa_prayer(self, at=None):
+        """صلاة الجمعة من جدول الأحداث (إذا لم يبدأها مؤقت الخطبة)"""
+        if self.state == STATE_JUMAA_PRAYER:
+            return
+        now = self.now()
+        self._enter_jumaa_prayer(at or now)
+        self._run_overdue(now)
+
+    def on_azkar(self, prayer, at=None):
+        """بداية الأذكار؛ يرجع False إذا كانت دورة أخرى جارية (إعادة المحاولة لاحقاً)"""
+        if self.state in (STATE_AZKAR, STATE_SURAH):
+            if self.prayer == prayer:
+                return True
+            return False
+        if self.state not in (STATE_IDLE, STATE_IN_PRAYER):
+            return False
+        now = self.now()
+        self._enter_azkar(prayer, at or now, f"أذكار بعد صلاة {prayer}")
+        self._run_overdue(now)
+        return True
+
+    def dismiss(self):
+        """زر العودة: إنهاء العرض الحالي"""
+        if self.state != STATE_IDLE:
+            self._to_idle(self.now(), reason="إغلاق يدوي")
+
+    def on_tick(self, now):
+        """تحديث العدادات المعروضة (من نبضة الساعة)"""
+        if self.state == STATE_IQAMA_COUNTDOWN:
+            self.view.update_iqama_countdown(self._remaining(now))
+        elif self.state == STATE_JUMAA_KHOTBA:
+            self.view.update_khotba(self._remaining(now))
+        elif self.state == STATE_JUMAA_PRAYER:
+            self.view.update_jumaa_prayer(self._remaining(now))
+
+    # ---------- التشخيص ----------
+
+    def summary(self):
+        due = self._timer_due.strftime('%H:%M:%S') if self._timer_due else "-"
+        return (f"🔁 دورة الصلاة: {self.state} ({self.prayer or '-'})، المؤقت القادم: {due}، "
+                f"أقصى تأخر انتقال: {self.max_late_ms:.0f} ms، انتقالات: {len(self.history)}")
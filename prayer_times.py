@@ -1,159 +1,253 @@
 import csv
 import datetime
 import os
-from config import CSV_FILE, DISPLAY_NAMES
+from array import array
+from bisect import bisect_right
+from config import (CSV_FILE, DISPLAY_NAMES, TIMETABLE_CACHE_ENABLED,
+                    TIMETABLE_LOAD_MODE, YEARLY_CSV_PATTERN)
+from timetable import (CompactTimetable, parse_minutes, format_minutes, MISSING,
+                       PRAYER_COLUMNS, TIME_COLUMNS)
+from timetable_cache import load_timetable
+from yearly_timetable import YearlyTimetable
+from clock import get_clock
 
-class PrayerTimes:
-    def __init__(self, csv_data):
-        self.csv_data = csv_data
-        self.prayer_data = self._parse_csv_data()
-    
-    def _parse_csv_data(self):
-        """تحليل بيانات CSV بالتنسيق المبسط مع البيانات الإضافية"""
-        prayer_data = {}
-        
-        for row in self.csv_data:
-            try:
-                # إذا كان row عبارة عن سلسلة نصية (من CSV مباشرة)
-                if isinstance(row, str):
-                    continue  # تخطي السلاسل النصية
-                
-                # استخراج التاريخ من العمود "تاريخ"
-                date_str = row.get('تاريخ', '').strip()
-                if not date_str:
-                    continue
-                
-                # تحويل التاريخ من "2025-01-01" إلى كائن date
-                date_obj = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-                
-                # استخراج أوقات الصلوات الأساسية
-                prayer_times = {
-                    'Fajr': row.get('الفجر', '--:--').strip(),
-                    'Dhuhr': row.get('الظهر', '--:--').strip(),
-                    'Asr': row.get('العصر', '--:--').strip(), 
-                    'Maghrib': row.get('المغرب', '--:--').strip(),
-                    'Isha': row.get('العشاء', '--:--').strip(),
-                    
-                    # الأوقات الإضافية
-                    'Sunrise': row.get('الشروق', '--:--').strip(),
-                    'Imsak': row.get('الإمساك', '--:--').strip(),
-                    'Midnight': row.get('منتصف الليل', '--:--').strip(),
-                    
-                    # البيانات الهجرية
-                    'HijriDate': row.get('التاريخ الهجري', '').strip(),
-                    'HijriDay': row.get('اليوم الهجري', '').strip(),
-                    'HijriMonth': row.get('الشهر الهجري', '').strip(),
-                    'HijriYear': row.get('السنة الهجرية', '').strip(),
-                    'ArabicDay': row.get('اليوم العربي', '').strip()
-                }
-                
-                # التحقق من صحة الأوقات
-                for prayer in ['Fajr', 'Dhuhr', 'Asr', 'Maghrib', 'Isha', 'Sunrise', 'Imsak', 'Midnight']:
-                    if not self._is_valid_time(prayer_times[prayer]):
-                        prayer_times[prayer] = '--:--'
-                
-                # إضافة البيانات
-                prayer_data[date_obj] = prayer_times
-                
-            except (ValueError, KeyError) as e:
-                print(f"خطأ في تحليل سطر: {row}. الخطأ: {e}")
+def _local_seconds(dt):
+    """ثواني التوقيت المحلي منذ بداية التقويم (ترتيب ثابت بدون مشاكل المناطق الزمنية)"""
+    return (dt.toordinal() * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+            + dt.microsecond / 1_000_000)
+
+
+def _from_local_seconds(seconds):
+    day, rest = divmod(seconds, 86400)
+    return datetime.datetime.fromordinal(day) + datetime.timedelta(seconds=rest)
+
+
+class PrayerTimeline:
+    """مصفوفة مرتبة لأوقات جميع الصلوات مع مصفوفة موازية لأرقام الصلوات"""
+
+    def __init__(self, tables):
+        self.seconds = array('q')
+        self.prayers = array('B')
+
+        for table in tables:
+            if table.first_ordinal is None:
                 continue
-        
-        print(f"تم تحميل {len(prayer_data)} يوم من بيانات الصلوات")
-        return prayer_data
+            columns = [table.times[prayer] for prayer in PRAYER_COLUMNS]
+            first = table.first_ordinal
+            for index, flag in enumerate(table.present):
+                if not flag:
+                    continue
+                base = (first + index) * 86400
+                for prayer_id, column in enumerate(columns):
+                    minutes = column[index]
+                    if minutes != MISSING:
+                        self.seconds.append(base + minutes * 60)
+                        self.prayers.append(prayer_id)
+
+        # ضمان الترتيب حتى لو كانت الأوقات غير مرتبة داخل اليوم
+        if any(a > b for a, b in zip(self.seconds, self.seconds[1:])):
+            pairs = sorted(zip(self.seconds, self.prayers))
+            self.seconds = array('q', (second for second, _ in pairs))
+            self.prayers = array('B', (prayer for _, prayer in pairs))
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def _event(self, index):
+        return PRAYER_COLUMNS[self.prayers[index]], _from_local_seconds(self.seconds[index])
+
+    def next_events(self, now, count=1):
+        """أول count صلوات بعد now"""
+        index = bisect_right(self.seconds, _local_seconds(now))
+        return [self._event(i) for i in range(index, min(index + count, len(self.seconds)))]
+
+    def previous_event(self, now):
+        """آخر صلاة وقتها قبل أو يساوي now"""
+        index = bisect_right(self.seconds, _local_seconds(now)) - 1
+        if index < 0:
+            return None
+        return self._event(index)
+
+
+# أسماء أيام الأسبوع عند غياب اليوم العربي في البيانات (0 = الاثنين)
+WEEKDAYS_AR = ["الاثنين", "الثلاثاء", "الأربعاء", "الخميس", "الجمعة", "السبت", "الأحد"]
+
+# التاريخ الهجري الافتراضي إذا لم يكن متوفراً في البيانات
+DEFAULT_HIJRI_DATE = "١٤٤٧/٠٧/١٢"
+
+
+class DaySnapshot:
+    """بيانات يوم واحد جاهزة للعرض: أوقات كـ datetime ونصوص التاريخ، تُبنى مرة واحدة لكل يوم"""
+
+    def __init__(self, date_obj, day_times):
+        self.date = date_obj
+        self.generation = None
+        self.available = bool(day_times)
+        midnight = datetime.datetime(date_obj.year, date_obj.month, date_obj.day)
+
+        # نصوص الأوقات "HH:MM" والأوقات كـ datetime (None إذا لم تكن متوفرة)
+        self.time_texts = {}
+        self.times = {}
+        for key in TIME_COLUMNS:
+            minutes = day_times.minutes(key) if day_times else MISSING
+            self.time_texts[key] = format_minutes(minutes)
+            self.times[key] = None if minutes == MISSING else midnight + datetime.timedelta(minutes=minutes)
+
+        # منتصف الليل الشرعي يكون بعد منتصف الليل الفعلي (في اليوم التالي)
+        isha = self.times['Isha']
+        if self.times['Midnight'] and isha and self.times['Midnight'] < isha:
+            self.times['Midnight'] += datetime.timedelta(days=1)
+
+        self.prayers = {prayer: self.times[prayer] for prayer in PRAYER_COLUMNS}
+        self.sunrise = self.times['Sunrise']
+        self.imsak = self.times['Imsak']
+        self.midnight = self.times['Midnight']
+
+        self.arabic_day = (day_times.get('ArabicDay', '') if day_times else '') or WEEKDAYS_AR[date_obj.weekday()]
+        self.hijri_date = (day_times.get('HijriDate', '') if day_times else '') or DEFAULT_HIJRI_DATE
+        self.gregorian_date = f"{date_obj.day}/{date_obj.month}/{date_obj.year}"
+        self.is_jumaa = date_obj.weekday() == 4
+
+    def prayer_time(self, prayer):
+        """وقت الصلاة كـ datetime أو None"""
+        return self.prayers.get(prayer)
+
+
+class PrayerTimes:
+    def __init__(self, csv_data=None, timetable=None):
+        if timetable is None:
+            timetable = self._parse_csv_data(csv_data or [])
+        self.timetable = timetable
+        self.place = timetable.place
+        self._timeline = None
+        self._timeline_generation = None
+        self._snapshot = None
+    
+    @classmethod
+    def from_file(cls, csv_path=CSV_FILE):
+        """تحميل الأوقات من الكاش الثنائي (mmap) أو من ملف CSV عند غيابه"""
+        timetable = load_timetable(csv_path, use_cache=TIMETABLE_CACHE_ENABLED)
+        print(f"تم تحميل {len(timetable)} يوم من بيانات الصلوات")
+        return cls(timetable=timetable)
+    
+    @classmethod
+    def from_yearly_files(cls, path_pattern=YEARLY_CSV_PATTERN):
+        """تحميل السنة الحالية فقط، وباقي السنوات عند الطلب"""
+        prayer_times = cls(timetable=YearlyTimetable(path_pattern))
+        prayer_times._today()
+        prayer_times.place = prayer_times.timetable.place
+        return prayer_times
+    
+    @classmethod
+    def from_config(cls):
+        """تحميل الأوقات حسب TIMETABLE_LOAD_MODE"""
+        if TIMETABLE_LOAD_MODE == "yearly":
+            return cls.from_yearly_files()
+        return cls.from_file(CSV_FILE)
+    
+    def _today(self):
+        """تاريخ اليوم (مع تحميل سنة اليوم مسبقاً في وضع الملفات السنوية)"""
+        today = get_clock().today()
+        ensure_current = getattr(self.timetable, 'ensure_current', None)
+        if ensure_current:
+            ensure_current(today)
+        return today
+    
+    def _parse_csv_data(self, csv_data):
+        """تحليل بيانات CSV بالتنسيق المبسط إلى جدول مضغوط"""
+        timetable = CompactTimetable.from_rows(csv_data)
+        print(f"تم تحميل {len(timetable)} يوم من بيانات الصلوات")
+        return timetable
     
     def _is_valid_time(self, time_str):
         """التحقق من صيغة الوقت"""
-        if not time_str or time_str == '--:--':
-            return False
-        
-        try:
-            if ':' in time_str:
-                parts = time_str.split(':')
-                if len(parts) == 2:
-                    hour, minute = int(parts[0]), int(parts[1])
-                    return 0 <= hour <= 23 and 0 <= minute <= 59
-            return False
-        except ValueError:
-            return False
+        return parse_minutes(time_str) != MISSING
+    
+    def get_day_times(self, date_obj):
+        """الحصول على أوقات يوم معين (عرض مباشر على الجدول المضغوط)"""
+        return self.timetable.get(date_obj, {})
+    
+    def get_day_snapshot(self, date_obj=None):
+        """بيانات اليوم الجاهزة (تُبنى مرة واحدة لكل يوم وتُلغى عند تغير اليوم أو البيانات)"""
+        if date_obj is None:
+            date_obj = self._today()
+        snapshot = self._snapshot
+        generation = self.timetable.generation
+        if snapshot is None or snapshot.date != date_obj or snapshot.generation != generation:
+            snapshot = DaySnapshot(date_obj, self.get_day_times(date_obj))
+            snapshot.generation = generation
+            self._snapshot = snapshot
+        return snapshot
+    
+    def invalidate_snapshot(self):
+        """إلغاء بيانات اليوم المخزنة (عند إعادة تحميل البيانات)"""
+        self._snapshot = None
+        self._timeline = None
     
     def get_today_times(self):
         """الحصول على أوقات الصلوات لليوم الحالي"""
-        today = datetime.date.today()
-        return self.prayer_data.get(today, {})
+        today = self._today()
+        return self.get_day_times(today)
     
     def get_hijri_date(self):
         """الحصول على التاريخ الهجري لليوم الحالي"""
-        today = datetime.date.today()
-        today_data = self.prayer_data.get(today, {})
-        
-        hijri_date = today_data.get('HijriDate', '')
-        if hijri_date:
-            return hijri_date
-        else:
-            # إذا لم يكن التاريخ الهجري متوفراً، نرجع تاريخ افتراضي
-            return "١٤٤٧/٠٧/١٢"
+        return self.get_day_snapshot().hijri_date
     
     def get_sunrise_time(self):
         """الحصول على وقت الشروق لليوم الحالي"""
-        today = datetime.date.today()
-        today_data = self.prayer_data.get(today, {})
-        return today_data.get('Sunrise', '--:--')
+        return self.get_day_snapshot().time_texts['Sunrise']
     
     def get_imsak_time(self):
         """الحصول على وقت الإمساك لليوم الحالي"""
-        today = datetime.date.today()
-        today_data = self.prayer_data.get(today, {})
-        return today_data.get('Imsak', '--:--')
-    
-    def find_next_prayer(self):
-        """إيجاد الصلاة القادمة"""
-        now = datetime.datetime.now()
-        today = now.date()
-        
-        # الحصول على أوقات اليوم
-        today_times = self.get_today_times()
-        if not today_times:
+        return self.get_day_snapshot().time_texts['Imsak']
+    
+    def _get_timeline(self):
+        """الخط الزمني للصلوات (يُعاد بناؤه فقط عند تغير السنوات المحملة)"""
+        generation = self.timetable.generation
+        if self._timeline is None or self._timeline_generation != generation:
+            self._timeline = PrayerTimeline(self.timetable.tables())
+            self._timeline_generation = generation
+        return self._timeline
+    
+    def _lookup(self, query, now, complete, step=1):
+        """تنفيذ بحث على الخط الزمني مع تحميل السنوات المجاورة حتى تكتمل النتيجة
+
+        step: 1 للصلوات القادمة (السنوات التالية)، -1 للصلاة السابقة (السنوات الماضية)
+        """
+        if now is None:
+            now = get_clock().now()
+        # وضع الملفات السنوية: قد تكون الصلوات المطلوبة في سنة غير محملة بعد
+        load_year = getattr(self.timetable, 'year', None)
+        if load_year:
+            load_year(now.year)
+        result = query(self._get_timeline(), now)
+        year = now.year
+        while load_year and not complete(result):
+            year += step
+            if load_year(year) is None:
+                break
+            result = query(self._get_timeline(), now)
+        return result
+
+    def find_next_prayer(self, now=None):
+        """إيجاد الصلاة القادمة (بحث ثنائي عبر جميع الأيام المحملة)"""
+        events = self._lookup(lambda timeline, at: timeline.next_events(at, 1), now, bool)
+        if not events:
             return None, None
-        
-        # ترتيب الصلوات حسب وقتها
-        prayers_order = ['Fajr', 'Dhuhr', 'Asr', 'Maghrib', 'Isha']
-        
-        for prayer in prayers_order:
-            prayer_time_str = today_times.get(prayer)
-            if not prayer_time_str or prayer_time_str == "--:--":
-                continue
-            
-            try:
-                # تحويل وقت الصلاة إلى كائن datetime
-                hour, minute = map(int, prayer_time_str.split(':'))
-                prayer_dt = datetime.datetime(today.year, today.month, today.day, hour, minute)
-                
-                # إذا كان وقت الصلاة لم يأت بعد
-                if prayer_dt > now:
-                    return prayer, prayer_dt
-                    
-            except ValueError:
-                continue
-        
-        # إذا مرت جميع صلوات اليوم، نعود للصلاة الأولى في اليوم التالي
-        tomorrow = today + datetime.timedelta(days=1)
-        tomorrow_times = self.prayer_data.get(tomorrow, {})
-        
-        if tomorrow_times:
-            for prayer in prayers_order:
-                prayer_time_str = tomorrow_times.get(prayer)
-                if not prayer_time_str or prayer_time_str == "--:--":
-                    continue
-                
-                try:
-                    hour, minute = map(int, prayer_time_str.split(':'))
-                    prayer_dt = datetime.datetime(tomorrow.year, tomorrow.month, tomorrow.day, hour, minute)
-                    return prayer, prayer_dt
-                except ValueError:
-                    continue
-        
-        return None, None
+        return events[0]
+    
+    def find_previous_prayer(self, now=None):
+        """إيجاد آخر صلاة دخل وقتها (مع تحميل السنة السابقة في أول أيام السنة)"""
+        event = self._lookup(lambda timeline, at: timeline.previous_event(at), now,
+                             lambda event: event is not None, step=-1)
+        if not event:
+            return None, None
+        return event
+    
+    def next_events(self, count, now=None):
+        """الصلوات القادمة التالية (حتى count صلاة) كقائمة (prayer, datetime)"""
+        return self._lookup(lambda timeline, at: timeline.next_events(at, count), now,
+                            lambda events: len(events) >= count)
     
     def get_prayer_display_name(self, prayer_key):
         """الحصول على الاسم المعروض للصلاة"""
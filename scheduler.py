@@ -0,0 +1,163 @@
+# scheduler.py
+import datetime
+
+from clock import get_clock
+from config import SCHEDULER_MAX_SLEEP_S, TICK_LATE_THRESHOLD_MS, TICK_ALIGN_MARGIN_S, CLOCK_JUMP_THRESHOLD_S
+
+
+class EventScheduler:
+    """مؤقت واحد (root.after) مضبوط على أقرب حدث مهم بدل التحديث كل ثانية"""
+
+    def __init__(self, root, callback, max_sleep_s=SCHEDULER_MAX_SLEEP_S):
+        self.root = root
+        self.callback = callback
+        self.max_sleep_s = max_sleep_s
+        self.next_run = None
+        self._after_id = None
+
+    def arm(self, when, now=None):
+        """إلغاء المؤقت السابق وضبط مؤقت جديد على الوقت when"""
+        self.cancel()
+        if now is None:
+            now = get_clock().now()
+
+        # حد أقصى للانتظار للحماية من تغير ساعة النظام
+        delay_s = min(max(0.0, (when - now).total_seconds()), self.max_sleep_s)
+        self.next_run = now + datetime.timedelta(seconds=delay_s)
+        self._after_id = self.root.after(int(delay_s * 1000), self._fire)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.next_run = None
+
+    def is_overdue(self, now):
+        """هل فات وقت التحديث المجدول (مثلاً بعد تأخر حلقة Tk)"""
+        return self.next_run is not None and now >= self.next_run
+
+    def _fire(self):
+        self._after_id = None
+        self.next_run = None
+        self.callback()
+
+
+class TickStats:
+    """إحصائيات دقة نبضات الساعة (التأخر بالميلي ثانية)"""
+
+    def __init__(self, late_threshold_ms):
+        self.late_threshold_ms = late_threshold_ms
+        self.ticks = 0
+        self.late_ticks = 0
+        self.missed_seconds = 0
+        self.total_jitter_ms = 0.0
+        self.max_jitter_ms = 0.0
+        self.last_jitter_ms = 0.0
+
+    def record(self, jitter_ms, missed):
+        self.ticks += 1
+        self.last_jitter_ms = jitter_ms
+        self.total_jitter_ms += abs(jitter_ms)
+        self.max_jitter_ms = max(self.max_jitter_ms, abs(jitter_ms))
+        if jitter_ms > self.late_threshold_ms:
+            self.late_ticks += 1
+        self.missed_seconds += missed
+
+    @property
+    def mean_jitter_ms(self):
+        return self.total_jitter_ms / self.ticks if self.ticks else 0.0
+
+    def summary(self):
+        return (f"⏱️ نبضات: {self.ticks}، متوسط التأخر: {self.mean_jitter_ms:.1f} ms، "
+                f"أقصى تأخر: {self.max_jitter_ms:.1f} ms، نبضات متأخرة: {self.late_ticks}، "
+                f"ثوانٍ مفقودة: {self.missed_seconds}")
+
+
+class ClockJumpDetector:
+    """كشف قفزات ساعة الحائط (تغيير الوقت، مزامنة NTP، سكون الجهاز) بمقارنتها بالساعة الرتيبة"""
+
+    def __init__(self, threshold_s=CLOCK_JUMP_THRESHOLD_S):
+        self.threshold_s = threshold_s
+        self.jumps = 0
+        self.last_drift_s = 0.0
+        self._last_wall = None
+        self._last_monotonic = None
+
+    def reset(self):
+        clock = get_clock()
+        self._last_wall = clock.time()
+        self._last_monotonic = clock.monotonic()
+
+    def check(self):
+        """الفرق (ثواني) بين تقدم ساعة الحائط والساعة الرتيبة منذ آخر فحص إذا تجاوز الحد، وإلا 0"""
+        clock = get_clock()
+        wall, monotonic = clock.time(), clock.monotonic()
+        drift = 0.0
+        if self._last_wall is not None:
+            drift = (wall - self._last_wall) - (monotonic - self._last_monotonic)
+        self._last_wall, self._last_monotonic = wall, monotonic
+        if abs(drift) <= self.threshold_s:
+            return 0.0
+        self.jumps += 1
+        self.last_drift_s = drift
+        return drift
+
+
+class ClockTicker:
+    """نبضة كل ثانية مضبوطة على بداية الثانية مع تعويض زمن المعالجة (الساعة الرتيبة)"""
+
+    def __init__(self, root, on_tick, on_missed=None, on_jump=None, late_threshold_ms=TICK_LATE_THRESHOLD_MS):
+        self.root = root
+        self.on_tick = on_tick
+        self.on_missed = on_missed
+        self.on_jump = on_jump
+        self.stats = TickStats(late_threshold_ms)
+        self.jump_detector = ClockJumpDetector()
+        self._after_id = None
+        self._expected_monotonic = None
+        self._last_second = None
+
+    def start(self):
+        self._last_second = int(get_clock().time())
+        self.jump_detector.reset()
+        self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        """ضبط النبضة القادمة على بداية الثانية التالية حسب الساعة الحالية"""
+        clock = get_clock()
+        wall = clock.time()
+        delay_s = 1.0 - (wall % 1.0) + TICK_ALIGN_MARGIN_S
+        self._expected_monotonic = clock.monotonic() + delay_s
+        self._after_id = self.root.after(max(1, int(delay_s * 1000)), self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        clock = get_clock()
+        jitter_ms = (clock.monotonic() - self._expected_monotonic) * 1000
+        drift = self.jump_detector.check()
+
+        # الثواني التي تم تخطيها بين النبضتين (نبضة متأخرة)
+        second = int(clock.time())
+        missed = max(0, second - self._last_second - 1) if self._last_second is not None else 0
+        self._last_second = second
+        if drift:
+            # قفزة في الساعة وليست نبضات مفقودة
+            missed = 0
+        self.stats.record(jitter_ms, missed)
+
+        now = clock.now()
+        try:
+            if drift and self.on_jump:
+                print(f"⏩ قفزة في ساعة النظام: {drift:+.1f} ثانية")
+                self.on_jump(now, drift)
+            elif missed and self.on_missed:
+                print(f"⚠️ نبضة متأخرة: تم تخطي {missed} ثانية (تأخر {jitter_ms:.0f} ms)")
+                self.on_missed(now, missed)
+            self.on_tick(now)
+        finally:
+            self._schedule()
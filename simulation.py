@@ -0,0 +1,222 @@
+# simulation.py
+# محاكاة سريعة بدون واجهة: تشغيل جدول الأحداث ودورة الصلاة على ساعة افتراضية
+# وتسجيل كل انتقال (أذان، إقامة، أذكار، جمعة) للتحقق من الأحداث المفقودة أو المكررة
+#
+# التشغيل: python simulation.py [--csv ملف | --yearly] [--start 2025-01-01] [--days 365] [--log ملف.jsonl] [--verbose]
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+
+from clock import VirtualClock, VirtualTimers, set_clock
+from config import CSV_FILE, AZKAR_TIMES, YEARLY_CSV_PATTERN
+from engine import CycleView, SchedulingEngine
+from prayer_times import PrayerTimes
+from timetable import PRAYER_COLUMNS
+from yearly_timetable import YearlyTimetable
+
+
+class RecordingView(CycleView):
+    """واجهة وهمية تسجل كل شاشة تُعرض مع وقتها"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.records = []
+
+    def _record(self, kind, prayer=None, index=None):
+        self.records.append((self.clock.now(), kind, prayer, index))
+
+    def show_adhan(self, prayer):
+        self._record("adhan", prayer)
+
+    def show_iqama_countdown(self, prayer):
+        self._record("iqama_countdown", prayer)
+
+    def show_iqama_message(self, prayer):
+        self._record("iqama", prayer)
+
+    def show_zekr(self, prayer, index):
+        if index == 0:
+            self._record("azkar", prayer)
+
+    def show_surah(self, prayer, index):
+        if index == 0:
+            self._record("surah", prayer)
+
+    def show_khotba(self):
+        self._record("khotba", "Dhuhr")
+
+    def show_jumaa_prayer(self):
+        self._record("jumaa_prayer", "Dhuhr")
+
+    def show_jumaa_iqama(self, prayer):
+        self._record("jumaa_iqama", prayer)
+
+
+class Simulation:
+    """تشغيل محرك الجدولة نفسه على ساعة ومؤقتات افتراضية"""
+
+    def __init__(self, prayer_times, start):
+        self.prayer_times = prayer_times
+        self.clock = VirtualClock(start)
+        self.timers = VirtualTimers(self.clock)
+        self.view = RecordingView(self.clock)
+
+        self.engine = SchedulingEngine(prayer_times, self.timers, self.view, on_wake=self.update)
+        self.updates = 0
+        self.update_seconds = 0.0
+
+    def update(self):
+        """نفس مسار MosqueApp.update_display بدون تحديث العناصر"""
+        started = time.perf_counter()
+        self.engine.update(self.clock.now())
+        self.updates += 1
+        self.update_seconds += time.perf_counter() - started
+
+    def run(self, days):
+        previous = set_clock(self.clock)
+        try:
+            self.update()
+            self.timers.run_for(days * 86400)
+        finally:
+            set_clock(previous)
+        return self.view.records
+
+
+def check_records(prayer_times, records, start, days):
+    """مقارنة الانتقالات المسجلة بما هو متوقع لكل يوم: (المفقودة، المكررة، أقصى تأخر للأذان)"""
+    seen = defaultdict(Counter)
+    adhan_late = 0.0
+    for at, kind, prayer, _ in records:
+        # الأذكار قد تقع بعد منتصف الليل (العشاء)؛ تُنسب إلى يوم بداية الدورة
+        day = at.date()
+        if kind in ("azkar", "surah") and prayer == "Isha" and at.hour < 12:
+            day -= datetime.timedelta(days=1)
+        seen[day][(kind, prayer)] += 1
+        if kind == "adhan":
+            expected = prayer_times.get_day_snapshot(at.date()).prayer_time(prayer)
+            if expected:
+                adhan_late = max(adhan_late, (at - expected).total_seconds())
+
+    missing, duplicates = [], []
+    for offset in range(days):
+        day = start.date() + datetime.timedelta(days=offset)
+        snapshot = prayer_times.get_day_snapshot(day)
+        expected = Counter()
+        for prayer in PRAYER_COLUMNS:
+            adhan = snapshot.prayer_time(prayer)
+            if adhan is None or adhan < start:
+                continue
+            expected[("adhan", prayer)] += 1
+            if snapshot.is_jumaa and prayer == "Dhuhr":
+                kinds = ("khotba", "jumaa_prayer", "jumaa_iqama", "azkar", "surah")
+            else:
+                kinds = ("iqama_countdown", "iqama", "azkar", "surah")
+            for kind in kinds:
+                if kind in ("azkar", "surah") and prayer not in AZKAR_TIMES:
+                    continue
+                expected[(kind, prayer)] += 1
+
+        for key, count in expected.items():
+            got = seen[day][key]
+            if got < count:
+                missing.append((day, key))
+            elif got > count:
+                duplicates.append((day, key, got))
+    return missing, duplicates, adhan_late
+
+
+def check_year_boundary(year, path_pattern=YEARLY_CSV_PATTERN, count=10):
+    """البحث عبر نهاية السنة بملفات سنوية غير محملة بعد: الصلاة السابقة في 1 يناير قبل الفجر،
+    و next_events من ظهر 31 ديسمبر؛ يعيد قائمة الأخطاء (فارغة إذا كان كل شيء صحيحاً)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = PrayerTimes(timetable=YearlyTimetable(path_pattern))
+        expected = sorted(
+            (at, prayer)
+            for day in (datetime.date(year - 1, 12, 31), datetime.date(year, 1, 1), datetime.date(year, 1, 2))
+            for prayer, at in reference.get_day_snapshot(day).prayers.items() if at)
+
+        new_year = datetime.datetime(year, 1, 1, 0, 30)
+        previous = PrayerTimes(timetable=YearlyTimetable(path_pattern)).find_previous_prayer(new_year)
+        new_year_eve = datetime.datetime(year - 1, 12, 31, 12, 0)
+        upcoming = PrayerTimes(timetable=YearlyTimetable(path_pattern)).next_events(count, new_year_eve)
+
+    errors = []
+    expected_previous = max((item for item in expected if item[0] <= new_year), default=None)
+    if expected_previous and previous != expected_previous[::-1]:
+        errors.append(f"الصلاة السابقة {new_year}: {previous} بدل {expected_previous[::-1]}")
+    expected_upcoming = [(prayer, at) for at, prayer in expected if at > new_year_eve][:count]
+    if upcoming != expected_upcoming:
+        errors.append(f"next_events({count}) من {new_year_eve}: {len(upcoming)} صلاة تبدأ بـ {upcoming[:1]} "
+                      f"بدل {len(expected_upcoming)} تبدأ بـ {expected_upcoming[:1]}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="محاكاة أحداث الصلاة على ساعة افتراضية")
+    parser.add_argument("--csv", default=CSV_FILE)
+    parser.add_argument("--yearly", action="store_true",
+                        help="ملفات السنوات (YEARLY_CSV_PATTERN) بدل ملف واحد، مع فحص البحث عبر نهاية كل سنة")
+    parser.add_argument("--start", default=None, help="تاريخ البداية YYYY-MM-DD (افتراضياً أول يوم في الملف)")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--log", default=None, help="حفظ الانتقالات كسطور JSON")
+    parser.add_argument("--verbose", action="store_true", help="عرض رسائل الجدولة أثناء المحاكاة")
+    args = parser.parse_args()
+
+    if args.yearly:
+        with contextlib.redirect_stdout(io.StringIO()):
+            prayer_times = PrayerTimes.from_yearly_files()
+    else:
+        prayer_times = PrayerTimes.from_file(args.csv)
+    if args.start:
+        start_day = datetime.date.fromisoformat(args.start)
+    else:
+        start_day = next(iter(prayer_times.timetable.dates()))
+    start = datetime.datetime(start_day.year, start_day.month, start_day.day)
+
+    simulation = Simulation(prayer_times, start)
+    started = time.perf_counter()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        records = simulation.run(args.days)
+    elapsed = time.perf_counter() - started
+
+    # اليوم الأخير قد لا يكتمل (أذكار العشاء بعد نهاية المحاكاة)
+    missing, duplicates, adhan_late = check_records(prayer_times, records, start, args.days - 1)
+
+    boundary_errors = []
+    if args.yearly:
+        end_day = start_day + datetime.timedelta(days=args.days)
+        for year in range(start_day.year + 1, end_day.year + 1):
+            boundary_errors += check_year_boundary(year)
+
+    if args.log:
+        with open(args.log, "w", encoding="utf-8") as log:
+            for at, kind, prayer, _ in records:
+                log.write(json.dumps({"at": at.isoformat(), "event": kind, "prayer": prayer},
+                                     ensure_ascii=False) + "\n")
+
+    simulated = args.days * 86400
+    print(f"📅 محاكاة {args.days} يوم من {start_day} في {elapsed:.2f} ثانية (x{simulated / elapsed:,.0f} أسرع من الوقت الحقيقي)")
+    print(f"  انتقالات مسجلة: {len(records)}  ({', '.join(f'{k}: {v}' for k, v in sorted(Counter(r[1] for r in records).items()))})")
+    print(f"  تحديثات المجدول: {simulation.updates}، متوسط كلفة التحديث: "
+          f"{simulation.update_seconds / max(1, simulation.updates) * 1e6:.1f} µs، مؤقتات منفذة: {simulation.timers.fired}")
+    print(f"  أقصى تأخر للأذان: {adhan_late:.1f} ثانية")
+    print(f"  أحداث مفقودة: {len(missing)}، أحداث مكررة: {len(duplicates)}")
+    for day, key in missing[:10]:
+        print(f"    ❌ مفقود {day} {key}")
+    for day, key, count in duplicates[:10]:
+        print(f"    ⚠️ مكرر {day} {key} × {count}")
+    if args.yearly:
+        print(f"  البحث عبر نهاية السنة: {len(boundary_errors)} خطأ")
+        for error in boundary_errors:
+            print(f"    ❌ {error}")
+    return 1 if missing or duplicates or boundary_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
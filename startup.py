@@ -0,0 +1,75 @@
+# startup.py
+# بدء التشغيل على مراحل: الساعة والأوقات تُرسم أولاً، ثم باقي الشاشات في callbacks خاملة
+# والملفات الثقيلة تُحضر في خيوط خلفية، مع تقرير بزمن كل مرحلة
+import time
+
+from config import STARTUP_POLL_MS
+
+
+class StartupStages:
+    """مراحل البدء: mark للمراحل المتزامنة، و add للمراحل التي تُنفذ بعد ظهور أول إطار
+
+    مرحلة add تنتظر (بدون حجب الواجهة) اكتمال future إن وُجد، ثم تُنفذ في خيط Tk بنتيجته
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.timings = []   # (المرحلة، ms في خيط الواجهة، ms انتظار الخيوط الخلفية)
+        self._stages = []
+
+    def mark(self, name):
+        """نهاية مرحلة متزامنة (الزمن منذ المرحلة السابقة)"""
+        now = time.perf_counter()
+        self.timings.append((name, (now - self._last) * 1000, 0.0))
+        self._last = now
+
+    def add(self, name, func, future=None):
+        self._stages.append((name, func, future))
+
+    def run(self, on_done=None):
+        """تنفيذ المراحل واحدة في كل callback خامل (تُرسم الواجهة بينها)"""
+        self._on_done = on_done
+        self.root.after_idle(self._first_frame)
+
+    def _first_frame(self):
+        # أول callback خامل: رُسمت الواجهة المتزامنة
+        self.mark("أول إطار")
+        self._run_next()
+
+    def _run_next(self, waited_since=None):
+        if not self._stages:
+            self.report()
+            if self._on_done:
+                self._on_done()
+            return
+
+        name, func, future = self._stages[0]
+        if future is not None and not future.done():
+            if waited_since is None:
+                waited_since = time.perf_counter()
+            self.root.after(STARTUP_POLL_MS, lambda: self._run_next(waited_since))
+            return
+        self._stages.pop(0)
+
+        started = time.perf_counter()
+        waited_ms = (started - waited_since) * 1000 if waited_since else 0.0
+        try:
+            if future is not None:
+                func(future.result())
+            else:
+                func()
+        except Exception as e:
+            print(f"خطأ في مرحلة البدء {name}: {e}")
+        self.timings.append((name, (time.perf_counter() - started) * 1000, waited_ms))
+        self._last = time.perf_counter()
+        self.root.after_idle(self._run_next)
+
+    def report(self):
+        """تقرير زمن كل مرحلة والزمن الكلي حتى الجاهزية"""
+        print("⏱️ مراحل بدء التشغيل:")
+        for name, ms, waited_ms in self.timings:
+            wait = f"  (انتظار {waited_ms:.0f} ms)" if waited_ms >= 1 else ""
+            print(f"  {name:<22} {ms:7.1f} ms{wait}")
+        print(f"  المجموع حتى الجاهزية: {(time.perf_counter() - self.started) * 1000:.0f} ms")
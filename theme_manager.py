@@ -2,6 +2,7 @@
 import datetime
 import customtkinter as ctk
 from config import THEME_COLORS
+from clock import get_clock
 
 class ThemeManager:
     def __init__(self):
@@ -10,7 +11,7 @@ class ThemeManager:
     
     def get_current_theme(self):
         """تحديد الثيم بناءً على الوقت الحالي"""
-        now = datetime.datetime.now()
+        now = get_clock().now()
         hour = now.hour
         
         if 6 <= hour < 18:
@@ -18,6 +19,15 @@ class ThemeManager:
         else:
             return "light"   # الليلي
     
+    def next_change(self, now):
+        """وقت التغيير القادم المحتمل للثيم (السادسة صباحاً أو مساءً)"""
+        for day_offset in (0, 1):
+            day = now.date() + datetime.timedelta(days=day_offset)
+            for hour in (6, 18):
+                boundary = datetime.datetime(day.year, day.month, day.day, hour)
+                if boundary > now:
+                    return boundary
+    
     def update_theme(self):
         """تحديث الثيم إذا تغير الوقت"""
         new_theme = self.get_current_theme()
@@ -0,0 +1,427 @@
+# timetable.py
+import csv
+import datetime
+import os
+from array import array
+from collections.abc import Mapping
+from config import PLACE_NAME, ALADHAN_TIME_SHIFT_MINUTES
+
+# أعمدة الأوقات (دقائق منذ منتصف الليل) بالترتيب المخزن
+TIME_COLUMNS = ('Fajr', 'Dhuhr', 'Asr', 'Maghrib', 'Isha', 'Sunrise', 'Imsak', 'Midnight')
+
+# الصلوات الخمس بترتيبها في اليوم
+PRAYER_COLUMNS = TIME_COLUMNS[:5]
+
+# الأعمدة النصية المرمزة بالقاموس
+TEXT_COLUMNS = ('HijriDay', 'HijriMonth', 'HijriYear', 'ArabicDay')
+
+# ترتيب المفاتيح كما كانت تُرجعها PrayerTimes سابقاً
+DAY_KEYS = TIME_COLUMNS + ('HijriDate',) + TEXT_COLUMNS
+
+# أسماء أعمدة ملف CSV المبسط
+CSV_COLUMNS = {
+    'Date': 'تاريخ',
+    'Fajr': 'الفجر',
+    'Dhuhr': 'الظهر',
+    'Asr': 'العصر',
+    'Maghrib': 'المغرب',
+    'Isha': 'العشاء',
+    'Sunrise': 'الشروق',
+    'Imsak': 'الإمساك',
+    'Midnight': 'منتصف الليل',
+    'HijriDate': 'التاريخ الهجري',
+    'HijriDay': 'اليوم الهجري',
+    'HijriMonth': 'الشهر الهجري',
+    'HijriYear': 'السنة الهجرية',
+    'ArabicDay': 'اليوم العربي',
+    'Place': 'place',
+}
+
+# أعمدة ملفات aladhan الخام (ملفات meknes_prayer_YYYY.csv)
+ALADHAN_COLUMNS = {
+    'Date': 'date.gregorian.date',
+    'Fajr': 'timings.Fajr',
+    'Dhuhr': 'timings.Dhuhr',
+    'Asr': 'timings.Asr',
+    'Maghrib': 'timings.Maghrib',
+    'Isha': 'timings.Isha',
+    'Sunrise': 'timings.Sunrise',
+    'Imsak': 'timings.Imsak',
+    'Midnight': 'timings.Midnight',
+    'HijriDay': 'date.hijri.day',
+    'HijriMonth': 'date.hijri.month.ar',
+    'HijriYear': 'date.hijri.year',
+    'ArabicDay': 'date.hijri.weekday.ar',
+}
+
+# قيمة الوقت المفقود ("--:--") داخل المصفوفات
+MISSING = 0xFFFF
+MISSING_TEXT = '--:--'
+
+# حجم مخزن القراءة لملفات CSV
+CSV_READ_BUFFER = 1 << 18
+
+# جدول مشترك لتنسيق الدقائق "HH:MM" (1440 نص فقط بدل نص لكل صف)
+_TIME_TEXTS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60))
+_MINUTES_BY_TEXT = {text: minutes for minutes, text in enumerate(_TIME_TEXTS)}
+
+
+def parse_minutes(time_str):
+    """تحويل "HH:MM" إلى دقائق منذ منتصف الليل أو MISSING إذا كان غير صالح"""
+    minutes = _MINUTES_BY_TEXT.get(time_str)
+    if minutes is not None:
+        return minutes
+    if not time_str:
+        return MISSING
+    time_str = time_str.strip()
+    if len(time_str) == 5 and time_str[2] == ':':
+        hour, minute = time_str[:2], time_str[3:]
+    else:
+        parts = time_str.split(':')
+        if len(parts) != 2:
+            return MISSING
+        hour, minute = parts
+    try:
+        hour, minute = int(hour), int(minute)
+    except ValueError:
+        return MISSING
+    if 0 <= hour <= 23 and 0 <= minute <= 59:
+        return hour * 60 + minute
+    return MISSING
+
+
+def _parse_iso_date(date_str):
+    """تحويل "2025-01-01" إلى date بدون strptime"""
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        return datetime.date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+    return datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+
+
+def _parse_dmy_date(date_str):
+    """تحويل "01-01-2025" (صيغة aladhan) إلى date بدون strptime"""
+    if len(date_str) == 10 and date_str[2] == '-' and date_str[5] == '-':
+        return datetime.date(int(date_str[6:]), int(date_str[3:5]), int(date_str[:2]))
+    return datetime.datetime.strptime(date_str, '%d-%m-%Y').date()
+
+
+def format_minutes(minutes):
+    """تحويل الدقائق إلى "HH:MM" (أو "--:--" للوقت المفقود)"""
+    if minutes == MISSING:
+        return MISSING_TEXT
+    return _TIME_TEXTS[minutes]
+
+
+class StringPool:
+    """ترميز النصوص المتكررة بأرقام صغيرة (0 = نص فارغ)"""
+
+    def __init__(self, values=None):
+        self.values = ['']
+        self.codes = {'': 0}
+        for value in values or ():
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+
+class DayView(Mapping):
+    """عرض قراءة فقط ليوم واحد داخل CompactTimetable (بدون نسخ البيانات)"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        table = self._table
+        if key in table.times:
+            return format_minutes(table.times[key][self._index])
+        if key in table.codes:
+            return table.pools[key].decode(table.codes[key][self._index])
+        if key == 'HijriDate':
+            return table.hijri_date(self._index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(DAY_KEYS)
+
+    def __len__(self):
+        return len(DAY_KEYS)
+
+    def minutes(self, key):
+        """وقت العمود بالدقائق (MISSING إذا لم يكن متوفراً)"""
+        return self._table.times[key][self._index]
+
+    @property
+    def date(self):
+        return datetime.date.fromordinal(self._table.first_ordinal + self._index)
+
+
+class CompactTimetable:
+    """جدول أوقات مضغوط: مصفوفة array('H') لكل عمود مفهرسة بالفرق عن أول يوم"""
+
+    def __init__(self, place=None):
+        self.place = place
+        self.first_ordinal = None
+        self.times = {key: array('H') for key in TIME_COLUMNS}
+        self.codes = {key: array('H') for key in TEXT_COLUMNS}
+        self.pools = {key: StringPool() for key in TEXT_COLUMNS}
+        # 1 إذا كان اليوم موجوداً في الملف (لتمييز الأيام الناقصة)
+        self.present = bytearray()
+        # التواريخ الهجرية التي لا تطابق الصيغة "يوم/شهر/سنة" (نادرة)
+        self.hijri_overrides = {}
+        self.day_count = 0
+        # يزداد عند كل تعديل ليعرف المستخدمون متى يعيدون بناء ما يعتمد على الجدول
+        self.generation = 0
+
+    def __len__(self):
+        return self.day_count
+
+    @property
+    def last_ordinal(self):
+        if self.first_ordinal is None:
+            return None
+        return self.first_ordinal + len(self.present) - 1
+
+    def _grow(self, ordinal):
+        """توسيع المصفوفات لتشمل اليوم المطلوب وإرجاع موضعه"""
+        if self.first_ordinal is None:
+            self.first_ordinal = ordinal
+
+        offset = ordinal - self.first_ordinal
+        if offset < 0:
+            # يوم قبل بداية الجدول: إضافة خانات فارغة في البداية
+            pad = -offset
+            for column in self.times.values():
+                column[0:0] = array('H', [MISSING]) * pad
+            for column in self.codes.values():
+                column[0:0] = array('H', [0]) * pad
+            self.present[0:0] = bytes(pad)
+            self.hijri_overrides = {i + pad: v for i, v in self.hijri_overrides.items()}
+            self.first_ordinal = ordinal
+            offset = 0
+        elif offset >= len(self.present):
+            pad = offset + 1 - len(self.present)
+            for column in self.times.values():
+                column.extend(array('H', [MISSING]) * pad)
+            for column in self.codes.values():
+                column.extend(array('H', [0]) * pad)
+            self.present.extend(bytes(pad))
+        return offset
+
+    def add_day(self, date_obj, minutes, texts, hijri_date=None):
+        """إضافة يوم: minutes بترتيب TIME_COLUMNS و texts بترتيب TEXT_COLUMNS"""
+        ordinal = date_obj.toordinal()
+        times, codes, pools = self.times, self.codes, self.pools
+        self.generation += 1
+
+        if self.first_ordinal is not None and ordinal - self.first_ordinal == len(self.present):
+            # المسار السريع: اليوم التالي مباشرة (الحالة المعتادة في ملفات CSV المرتبة)
+            index = len(self.present)
+            for key, value in zip(TIME_COLUMNS, minutes):
+                times[key].append(value)
+            for key, value in zip(TEXT_COLUMNS, texts):
+                codes[key].append(pools[key].encode(value))
+            self.present.append(1)
+            self.day_count += 1
+        else:
+            index = self._grow(ordinal)
+            for key, value in zip(TIME_COLUMNS, minutes):
+                times[key][index] = value
+            for key, value in zip(TEXT_COLUMNS, texts):
+                codes[key][index] = pools[key].encode(value)
+            if not self.present[index]:
+                self.day_count += 1
+            self.present[index] = 1
+            self.hijri_overrides.pop(index, None)
+
+        if hijri_date is not None:
+            day, month, year = texts[0], texts[1], texts[2]
+            composed = f"{day}/{month}/{year}" if day and month and year else ''
+            if hijri_date != composed:
+                self.hijri_overrides[index] = hijri_date
+
+    def add_row(self, row):
+        """إضافة سطر CSV (قاموس بأسماء الأعمدة العربية)"""
+        date_str = (row.get(CSV_COLUMNS['Date']) or '').strip()
+        if not date_str:
+            return False
+
+        date_obj = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+        minutes = [parse_minutes(row.get(CSV_COLUMNS[key])) for key in TIME_COLUMNS]
+        texts = [(row.get(CSV_COLUMNS[key]) or '').strip() for key in TEXT_COLUMNS]
+        hijri_date = (row.get(CSV_COLUMNS['HijriDate']) or '').strip()
+
+        if self.place is None:
+            place = (row.get(CSV_COLUMNS['Place']) or '').strip()
+            if place:
+                self.place = place
+
+        self.add_day(date_obj, minutes, texts, hijri_date)
+        return True
+
+    @classmethod
+    def from_rows(cls, rows, place=None):
+        """بناء الجدول من أسطر DictReader"""
+        table = cls(place)
+        for row in rows:
+            try:
+                # تخطي السلاسل النصية
+                if isinstance(row, str):
+                    continue
+                table.add_row(row)
+            except (ValueError, KeyError) as e:
+                print(f"خطأ في تحليل سطر: {row}. الخطأ: {e}")
+                continue
+        return table
+
+    @classmethod
+    def from_csv(cls, csv_path):
+        """بناء الجدول من ملف CSV (مبسط أو aladhan الخام) بقراءة واحدة متدفقة"""
+        if not os.path.exists(csv_path):
+            print(f"ملف CSV غير موجود: {csv_path}")
+            return cls()
+
+        try:
+            with open(csv_path, 'r', encoding='utf-8-sig', newline='',
+                      buffering=CSV_READ_BUFFER) as file:
+                return cls.from_stream(file)
+        except OSError as e:
+            print(f"خطأ في قراءة ملف CSV: {e}")
+            return cls()
+
+    @classmethod
+    def from_stream(cls, file):
+        """تحليل CSV سطراً بسطر: تحديد مواضع الأعمدة مرة واحدة من العنوان
+        وإدخال القيم مباشرة في المصفوفات بدون قواميس DictReader"""
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header:
+            return cls()
+
+        positions = {name.strip(): i for i, name in enumerate(header)}
+        aladhan = ALADHAN_COLUMNS['Fajr'] in positions
+        columns = ALADHAN_COLUMNS if aladhan else CSV_COLUMNS
+
+        if columns['Date'] not in positions:
+            print(f"عمود التاريخ غير موجود في ملف CSV: {columns['Date']}")
+            return cls()
+
+        # الأعمدة الناقصة تشير إلى خانة فارغة تضاف في آخر كل سطر
+        width = len(header)
+        date_pos = positions[columns['Date']]
+        time_pos = [positions.get(columns[key], width) for key in TIME_COLUMNS]
+        text_pos = [positions.get(columns[key], width) for key in TEXT_COLUMNS]
+        hijri_pos = width if aladhan else positions.get(CSV_COLUMNS['HijriDate'], width)
+        place_pos = width if aladhan else positions.get(CSV_COLUMNS['Place'], width)
+
+        parse_date = _parse_dmy_date if aladhan else _parse_iso_date
+        shift = ALADHAN_TIME_SHIFT_MINUTES if aladhan else 0
+        table = cls(PLACE_NAME if aladhan else None)
+
+        for row in reader:
+            if len(row) != width + 1:
+                row.extend([''] * (width + 1 - len(row)))
+            try:
+                date_str = row[date_pos].strip()
+                if not date_str:
+                    continue
+                date_obj = parse_date(date_str)
+
+                minutes = []
+                for pos in time_pos:
+                    # نأخذ الجزء الأول فقط (مثال: "06:53" من "06:53 (+01)")
+                    value = parse_minutes(row[pos][:5] if aladhan else row[pos])
+                    if shift and value != MISSING:
+                        value = (value + shift) % (24 * 60)
+                    minutes.append(value)
+
+                texts = [row[pos].strip() for pos in text_pos]
+                hijri_date = None if aladhan else row[hijri_pos].strip()
+            except ValueError as e:
+                print(f"خطأ في تحليل سطر: {row}. الخطأ: {e}")
+                continue
+
+            if table.place is None and row[place_pos].strip():
+                table.place = row[place_pos].strip()
+
+            table.add_day(date_obj, minutes, texts, hijri_date)
+
+        return table
+
+    @classmethod
+    def from_buffers(cls, first_ordinal, times, codes, pools, present, day_count,
+                     place=None, hijri_overrides=None, backing=None):
+        """إنشاء جدول للقراءة فقط فوق مخازن جاهزة (مثل memoryview على mmap)"""
+        table = cls(place)
+        table.first_ordinal = first_ordinal
+        table.times = times
+        table.codes = codes
+        table.pools = {key: StringPool(values[1:]) for key, values in pools.items()}
+        table.present = present
+        table.day_count = day_count
+        table.hijri_overrides = hijri_overrides or {}
+        # الاحتفاظ بالمخزن الأصلي (mmap) حياً طوال عمر الجدول
+        table._backing = backing
+        return table
+
+    def tables(self):
+        """الجداول المكونة (جدول واحد هنا، عدة سنوات في YearlyTimetable)"""
+        return [self]
+
+    def index_of(self, date_obj):
+        """موضع اليوم داخل المصفوفات أو None إذا لم يكن موجوداً"""
+        if self.first_ordinal is None:
+            return None
+        index = date_obj.toordinal() - self.first_ordinal
+        if 0 <= index < len(self.present) and self.present[index]:
+            return index
+        return None
+
+    def __contains__(self, date_obj):
+        return self.index_of(date_obj) is not None
+
+    def get(self, date_obj, default=None):
+        """عرض اليوم (DayView) أو القيمة الافتراضية"""
+        index = self.index_of(date_obj)
+        if index is None:
+            return default
+        return DayView(self, index)
+
+    def time_text(self, date_obj, key, default=MISSING_TEXT):
+        """وقت عمود واحد كنص "HH:MM" بدون إنشاء عرض لليوم"""
+        index = self.index_of(date_obj)
+        if index is None:
+            return default
+        return format_minutes(self.times[key][index])
+
+    def dates(self):
+        """جميع التواريخ الموجودة بالترتيب"""
+        first = self.first_ordinal
+        for index, flag in enumerate(self.present):
+            if flag:
+                yield datetime.date.fromordinal(first + index)
+
+    def _compose_hijri(self, index):
+        day = self.pools['HijriDay'].decode(self.codes['HijriDay'][index])
+        month = self.pools['HijriMonth'].decode(self.codes['HijriMonth'][index])
+        year = self.pools['HijriYear'].decode(self.codes['HijriYear'][index])
+        if day and month and year:
+            return f"{day}/{month}/{year}"
+        return ''
+
+    def hijri_date(self, index):
+        """التاريخ الهجري الكامل لليوم"""
+        override = self.hijri_overrides.get(index)
+        if override is not None:
+            return override
+        return self._compose_hijri(index)
@@ -0,0 +1,208 @@
+# timetable_cache.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from config import TIMETABLE_CACHE_DIR
+from timetable import CompactTimetable, TIME_COLUMNS, TEXT_COLUMNS
+
+CACHE_MAGIC = b'MQTT'
+CACHE_VERSION = 1
+CACHE_EXTENSION = '.timetable'
+
+# رأس الملف: المعرف، الإصدار، ترتيب البايتات، حجم/تاريخ/بصمة ملف CSV المصدر،
+# أول يوم، عدد الخانات، عدد الأيام، موضع وطول جدول النصوص، موضع الأعمدة
+_HEADER = struct.Struct('<4sHBxQq32sIIIIII')
+_BYTEORDER = 0 if sys.byteorder == 'little' else 1
+
+# جميع الأعمدة ذات العرض الثابت (uint16) بالترتيب داخل الملف
+_COLUMNS = TIME_COLUMNS + TEXT_COLUMNS
+
+
+def _cache_dir(cache_dir=None):
+    """مجلد الكاش: المحدد، أو TIMETABLE_CACHE_DIR في نسخة PyInstaller، أو None (بجانب ملف CSV)"""
+    if cache_dir is None and hasattr(sys, '_MEIPASS'):
+        return TIMETABLE_CACHE_DIR
+    return cache_dir
+
+
+def cache_path_for(csv_path, cache_dir=None, digest=None):
+    """مسار ملف الكاش الثنائي: بجانب ملف CSV، أو في cache_dir باسم يتضمن بصمة CSV
+
+    في نسخة PyInstaller ملفات CSV داخل _MEIPASS (مجلد مؤقت جديد عند كل تشغيل)،
+    فالكاش يُحفظ في TIMETABLE_CACHE_DIR ليبقى بين مرات التشغيل
+    """
+    cache_dir = _cache_dir(cache_dir)
+    if cache_dir is None:
+        return os.path.splitext(csv_path)[0] + CACHE_EXTENSION
+    if digest is None:
+        digest = _source_fingerprint(csv_path)[2]
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{name}_{digest.hex()[:16]}{CACHE_EXTENSION}")
+
+
+def _prune(cache_path):
+    """حذف كاش النسخ القديمة من نفس ملف CSV في مجلد الكاش"""
+    cache_dir, current = os.path.split(cache_path)
+    prefix = current[:-len(CACHE_EXTENSION) - 16]
+    for name in os.listdir(cache_dir):
+        if (name != current and name.startswith(prefix) and name.endswith(CACHE_EXTENSION)
+                and len(name) == len(current)):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def _source_fingerprint(csv_path):
+    """حجم وتاريخ تعديل وبصمة SHA-256 لملف CSV المصدر"""
+    stat = os.stat(csv_path)
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return stat.st_size, stat.st_mtime_ns, digest.digest()
+
+
+def _align(offset, boundary=8):
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def compile_timetable(timetable, csv_path, cache_path=None, cache_dir=None):
+    """كتابة الجدول المضغوط في ملف ثنائي ثابت الحقول (بجانب ملف CSV أو في مجلد الكاش)"""
+    size, mtime_ns, digest = _source_fingerprint(csv_path)
+    cache_dir = _cache_dir(cache_dir) if cache_path is None else None
+    cache_path = cache_path or cache_path_for(csv_path, cache_dir, digest)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    strings = json.dumps({
+        'place': timetable.place,
+        'pools': {key: timetable.pools[key].values for key in TEXT_COLUMNS},
+        'hijri_overrides': {str(i): v for i, v in timetable.hijri_overrides.items()},
+    }, ensure_ascii=False).encode('utf-8')
+
+    length = len(timetable.present)
+    strings_offset = _HEADER.size
+    columns_offset = _align(strings_offset + len(strings))
+
+    header = _HEADER.pack(
+        CACHE_MAGIC, CACHE_VERSION, _BYTEORDER,
+        size, mtime_ns, digest,
+        timetable.first_ordinal or 0, length, len(timetable),
+        strings_offset, len(strings), columns_offset
+    )
+
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(strings)
+        f.write(bytes(columns_offset - strings_offset - len(strings)))
+        for key in TIME_COLUMNS:
+            f.write(timetable.times[key].tobytes())
+        for key in TEXT_COLUMNS:
+            f.write(timetable.codes[key].tobytes())
+        f.write(bytes(timetable.present))
+    os.replace(tmp_path, cache_path)
+    if cache_dir:
+        _prune(cache_path)
+    return cache_path
+
+
+def load_cached_timetable(csv_path, cache_path=None, cache_dir=None):
+    """تحميل الجدول من الكاش الثنائي عبر mmap، أو None إذا كان قديماً أو غير موجود"""
+    if not os.path.exists(csv_path):
+        return None
+    source_size, _, source_digest = _source_fingerprint(csv_path)
+    cache_path = cache_path or cache_path_for(csv_path, cache_dir, source_digest)
+    if not os.path.exists(cache_path):
+        return None
+
+    with open(cache_path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # ملف فارغ
+
+    if len(buffer) < _HEADER.size:
+        buffer.close()
+        return None
+
+    (magic, version, byteorder, size, mtime_ns, digest,
+     first_ordinal, length, day_count,
+     strings_offset, strings_length, columns_offset) = _HEADER.unpack_from(buffer, 0)
+
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or byteorder != _BYTEORDER:
+        buffer.close()
+        return None
+
+    # إبطال الكاش إذا تغير محتوى ملف CSV (تاريخ التعديل لا يُقارن: ملفات PyInstaller
+    # تُفك من جديد عند كل تشغيل بتاريخ جديد ونفس المحتوى)
+    if (size, digest) != (source_size, source_digest):
+        buffer.close()
+        return None
+
+    if len(buffer) < columns_offset + length * (2 * len(_COLUMNS) + 1):
+        buffer.close()
+        return None
+
+    try:
+        strings = json.loads(bytes(buffer[strings_offset:strings_offset + strings_length]).decode('utf-8'))
+    except ValueError:
+        buffer.close()
+        return None  # جدول نصوص تالف أو مقطوع
+
+    view = memoryview(buffer)
+    columns = {}
+    offset = columns_offset
+    for key in _COLUMNS:
+        columns[key] = view[offset:offset + length * 2].cast('H')
+        offset += length * 2
+    present = view[offset:offset + length]
+
+    return CompactTimetable.from_buffers(
+        first_ordinal=first_ordinal if length else None,
+        times={key: columns[key] for key in TIME_COLUMNS},
+        codes={key: columns[key] for key in TEXT_COLUMNS},
+        pools=strings['pools'],
+        present=present,
+        day_count=day_count,
+        place=strings['place'],
+        hijri_overrides={int(i): v for i, v in strings['hijri_overrides'].items()},
+        backing=buffer,
+    )
+
+
+def load_timetable(csv_path, use_cache=True, cache_dir=None):
+    """تحميل الجدول من الكاش الثنائي إن أمكن، وإلا من CSV مع إعادة بناء الكاش"""
+    if use_cache:
+        try:
+            timetable = load_cached_timetable(csv_path, cache_dir=cache_dir)
+            if timetable is not None:
+                print(f"تم تحميل {len(timetable)} يوم من الكاش الثنائي")
+                return timetable
+        except (OSError, ValueError, struct.error) as e:
+            print(f"خطأ في قراءة الكاش الثنائي: {e}")
+
+    timetable = CompactTimetable.from_csv(csv_path)
+
+    if use_cache and len(timetable):
+        try:
+            path = compile_timetable(timetable, csv_path, cache_dir=cache_dir)
+            print(f"تم إنشاء الكاش الثنائي: {path}")
+        except OSError as e:
+            print(f"تعذر إنشاء الكاش الثنائي: {e}")
+
+    return timetable
+
+
+# التشغيل اليدوي: python timetable_cache.py [ملف.csv ...]
+if __name__ == "__main__":
+    from config import CSV_FILE
+
+    for path in sys.argv[1:] or [CSV_FILE]:
+        table = CompactTimetable.from_csv(path)
+        print(f"✅ {compile_timetable(table, path)} ({len(table)} يوم)")
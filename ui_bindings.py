@@ -0,0 +1,41 @@
+# ui_bindings.py
+
+_UNSET = object()
+
+
+class WidgetBinder:
+    """تخزين آخر قيمة معروضة لكل عنصر وعدم استدعاء configure إلا عند تغيرها"""
+
+    def __init__(self):
+        self._last = {}
+        self.applied = 0
+        self.skipped = 0
+
+    def configure(self, widget, **options):
+        """تطبيق الخيارات المتغيرة فقط على العنصر، وإرجاع True إذا تم التحديث"""
+        last = self._last.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if last.get(key, _UNSET) != value}
+
+        if not changed:
+            self.skipped += 1
+            return False
+
+        widget.configure(**changed)
+        last.update(changed)
+        self.applied += 1
+        return True
+
+    def set_text(self, widget, text):
+        return self.configure(widget, text=text)
+
+    def invalidate(self, widget=None):
+        """نسيان القيم المخزنة (لعنصر واحد أو للجميع) لإجبار التحديث التالي"""
+        if widget is None:
+            self._last.clear()
+        else:
+            self._last.pop(widget, None)
+
+    def summary(self):
+        total = self.applied + self.skipped
+        ratio = (self.skipped / total * 100) if total else 0.0
+        return f"🖼️ تحديثات العناصر: {self.applied} منفذة، {self.skipped} متجاهلة ({ratio:.0f}%)"
@@ -0,0 +1,128 @@
+# yearly_timetable.py
+import datetime
+import os
+from collections import OrderedDict
+
+from config import (YEARLY_CSV_PATTERN, TIMETABLE_RESIDENT_YEARS,
+                    TIMETABLE_NEXT_YEAR_PRELOAD_DAYS, TIMETABLE_CACHE_ENABLED)
+from timetable import MISSING_TEXT
+from timetable_cache import load_timetable
+
+
+class YearlyTimetable:
+    """جدول أوقات يحمّل ملف كل سنة عند الحاجة مع حد أقصى للسنوات في الذاكرة (LRU)"""
+
+    def __init__(self, path_pattern=YEARLY_CSV_PATTERN,
+                 resident_years=TIMETABLE_RESIDENT_YEARS,
+                 preload_days=TIMETABLE_NEXT_YEAR_PRELOAD_DAYS,
+                 use_cache=TIMETABLE_CACHE_ENABLED):
+        self.path_pattern = path_pattern
+        self.resident_years = max(1, resident_years)
+        self.preload_days = preload_days
+        self.use_cache = use_cache
+
+        # السنوات المحملة بترتيب آخر استخدام
+        self._years = OrderedDict()
+        # السنوات التي لا يجب إخراجها من الذاكرة (الحالية والتالية قرب نهاية السنة)
+        self._pinned = set()
+        # السنوات التي لا يوجد لها ملف (يُعاد فحصها مرة في اليوم)
+        self._missing = set()
+        self._checked_date = None
+        self.place = None
+        # يزداد عند تحميل أو إخراج سنة
+        self.generation = 0
+
+    def path_for(self, year):
+        return self.path_pattern.format(year=year)
+
+    def _load_year(self, year):
+        """تحميل سنة من ملفها (أو None إذا لم يكن الملف موجوداً)"""
+        if year in self._missing:
+            return None
+
+        path = self.path_for(year)
+        if not os.path.exists(path):
+            self._missing.add(year)
+            return None
+
+        table = load_timetable(path, use_cache=self.use_cache)
+        if self.place is None:
+            self.place = table.place
+        print(f"📅 تحميل أوقات سنة {year} ({len(table)} يوم)")
+        return table
+
+    def _evict(self):
+        """إخراج أقدم السنوات غير المثبتة عند تجاوز الحد"""
+        for year in list(self._years):
+            if len(self._years) <= self.resident_years:
+                break
+            if year in self._pinned:
+                continue
+            del self._years[year]
+            self.generation += 1
+            print(f"📅 إزالة أوقات سنة {year} من الذاكرة")
+
+    def year(self, year):
+        """جدول سنة معينة (يُحمّل عند الطلب)"""
+        if year in self._years:
+            self._years.move_to_end(year)
+            return self._years[year]
+
+        table = self._load_year(year)
+        if table is None:
+            return None
+
+        self._years[year] = table
+        self.generation += 1
+        self._evict()
+        return table
+
+    def ensure_current(self, today):
+        """تثبيت السنة الحالية، والسنة التالية إذا اقتربت نهاية السنة"""
+        if today == self._checked_date:
+            return
+        self._checked_date = today
+        self._missing.clear()
+
+        pinned = {today.year}
+        year_end = datetime.date(today.year, 12, 31)
+        if (year_end - today).days < self.preload_days:
+            pinned.add(today.year + 1)
+
+        self._pinned = pinned
+        for year in sorted(pinned):
+            self.year(year)
+        self._evict()
+
+    @property
+    def resident(self):
+        """السنوات المحملة حالياً"""
+        return list(self._years)
+
+    def __len__(self):
+        return sum(len(table) for table in self._years.values())
+
+    def __contains__(self, date_obj):
+        table = self.year(date_obj.year)
+        return table is not None and date_obj in table
+
+    def get(self, date_obj, default=None):
+        table = self.year(date_obj.year)
+        if table is None:
+            return default
+        return table.get(date_obj, default)
+
+    def time_text(self, date_obj, key, default=MISSING_TEXT):
+        table = self.year(date_obj.year)
+        if table is None:
+            return default
+        return table.time_text(date_obj, key, default)
+
+    def tables(self):
+        """جداول السنوات المحملة حالياً بالترتيب"""
+        return [self._years[year] for year in sorted(self._years)]
+
+    def dates(self):
+        """تواريخ السنوات المحملة حالياً بالترتيب"""
+        for year in sorted(self._years):
+            yield from self._years[year].dates()